@@ -78,6 +78,29 @@ namespace CR.OpenClaw
         public string serverVersion;
         public int port;
         public string uptime;
+        public DispatcherMetrics dispatcher;
+    }
+
+    /// <summary>
+    /// Main thread queue state. Times are over the last completed one-second window.
+    /// </summary>
+    [Serializable]
+    public class DispatcherMetrics
+    {
+        public float frameBudgetMs;
+        public int commandQueueDepth;
+        public int readQueueDepth;
+        public int executed;
+        public int overBudgetFrames;
+        public int timeouts;
+        public int skippedAfterTimeout;
+        public float actionsPerSecond;
+        public float avgWaitMs;
+        public float maxWaitMs;
+        public float avgExecMs;
+        public float maxExecMs;
+        public float avgFrameMs;
+        public float maxFrameMs;
     }
 
     [Serializable, AgentRes]
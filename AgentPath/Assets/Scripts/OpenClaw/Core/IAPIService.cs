@@ -28,5 +28,11 @@ namespace CR.OpenClaw
         /// Register a POST endpoint
         /// </summary>
         void RegisterPost(string path, System.Func<HttpListenerRequest, string> handler);
+
+        /// <summary>
+        /// Register a binary encoding for a GET endpoint, served when the client
+        /// negotiates BinaryProtocol (the JSON handler still serves everyone else)
+        /// </summary>
+        void RegisterBinaryGet(string path, System.Func<HttpListenerRequest, byte[]> handler);
     }
 }
@@ -20,6 +20,11 @@ namespace CR.OpenClaw
         [SerializeField] private bool m_AutoStart = true;
         [SerializeField] private bool m_LogRequests = true;
 
+        [Tooltip("How long a request waits for the main thread before answering \"Request timeout\" (ms)")]
+        [SerializeField] private int m_MainThreadTimeoutMs = 200;
+        [Tooltip("Thread pool floor; every request holds a pool thread while it waits for the main thread")]
+        [SerializeField] private int m_MinWorkerThreads = 32;
+
         #endregion
 
         #region Private Fields
@@ -28,10 +33,13 @@ namespace CR.OpenClaw
         private Thread m_ListenerThread;
         private ServerState m_State = ServerState.Stopped;
         private DateTime m_StartTime;
+        private int m_MainThreadTimeouts;
+        private int m_SkippedAfterTimeout;
 
         // Route dictionaries for extensible routing
         private Dictionary<string, Func<HttpListenerRequest, string>> m_GetRoutes;
         private Dictionary<string, Func<HttpListenerRequest, string>> m_PostRoutes;
+        private Dictionary<string, Func<HttpListenerRequest, byte[]>> m_BinaryGetRoutes;
 
         // Service registry
         private List<IAPIService> m_RegisteredServices;
@@ -97,6 +105,14 @@ namespace CR.OpenClaw
                 // Ensure dispatcher exists
                 //UnityMainThreadDispatcher.Instance;
 
+                // The pool only adds threads slowly past its minimum, so a burst of
+                // requests blocked on the main thread would queue up here first
+                ThreadPool.GetMinThreads(out int workerThreads, out int ioThreads);
+                if (workerThreads < m_MinWorkerThreads)
+                {
+                    ThreadPool.SetMinThreads(m_MinWorkerThreads, ioThreads);
+                }
+
                 // Create and configure HTTP listener
                 m_HttpListener = new HttpListener();
                 m_HttpListener.Prefixes.Add($"http://localhost:{m_Port}/");
@@ -168,6 +184,7 @@ namespace CR.OpenClaw
         {
             m_GetRoutes = new Dictionary<string, Func<HttpListenerRequest, string>>();
             m_PostRoutes = new Dictionary<string, Func<HttpListenerRequest, string>>();
+            m_BinaryGetRoutes = new Dictionary<string, Func<HttpListenerRequest, byte[]>>();
             m_RegisteredServices = new List<IAPIService>();
 
             // Register core system endpoints
@@ -250,6 +267,24 @@ namespace CR.OpenClaw
             }
         }
 
+        /// <summary>
+        /// Register a binary encoding for a GET endpoint (called by services)
+        /// </summary>
+        public void RegisterBinaryGet(string path, Func<HttpListenerRequest, byte[]> handler)
+        {
+            if (m_BinaryGetRoutes.ContainsKey(path))
+            {
+                Debug.LogWarning($"[OpenClawAPI] Binary GET endpoint already registered: {path}");
+                return;
+            }
+
+            m_BinaryGetRoutes[path] = handler;
+            if (m_LogRequests)
+            {
+                Debug.Log($"[OpenClawAPI] Registered binary GET {path}");
+            }
+        }
+
         #endregion
 
         #region HTTP Listener Thread
@@ -294,12 +329,17 @@ namespace CR.OpenClaw
                     Debug.Log($"[OpenClawAPI] {request.HttpMethod} {request.Url.PathAndQuery}");
                 }
 
-                // Route the request
-                string responseString = RouteRequest(request);
+                // Route the request (binary if negotiated and available, JSON otherwise)
+                byte[] buffer = RouteBinaryRequest(request);
+                string contentType = BinaryProtocol.ContentType;
+                if (buffer == null)
+                {
+                    buffer = Encoding.UTF8.GetBytes(RouteRequest(request));
+                    contentType = "application/json";
+                }
 
                 // Send response
-                byte[] buffer = Encoding.UTF8.GetBytes(responseString);
-                response.ContentType = "application/json";
+                response.ContentType = contentType;
                 response.ContentLength64 = buffer.Length;
                 response.StatusCode = 200;
                 response.OutputStream.Write(buffer, 0, buffer.Length);
@@ -362,6 +402,20 @@ namespace CR.OpenClaw
             return ResponseBuilder.CreateErrorResponse("ROUTE_NOT_FOUND", $"No handler found for {method} {path}");
         }
 
+        private byte[] RouteBinaryRequest(HttpListenerRequest request)
+        {
+            if (request.HttpMethod != "GET" || !BinaryProtocol.WantsBinary(request))
+            {
+                return null;
+            }
+
+            if (m_BinaryGetRoutes.TryGetValue(request.Url.AbsolutePath, out var handler))
+            {
+                return handler(request);
+            }
+            return null;
+        }
+
         #endregion
 
         #region System Endpoint Handlers
@@ -374,12 +428,28 @@ namespace CR.OpenClaw
                 status = "healthy",
                 serverVersion = "1.0.0",
                 port = m_Port,
-                uptime = (DateTime.UtcNow - m_StartTime).ToString(@"hh\:mm\:ss")
+                uptime = (DateTime.UtcNow - m_StartTime).ToString(@"hh\:mm\:ss"),
+                dispatcher = GetDispatcherMetrics()
             };
 
             return ResponseBuilder.CreateSuccessResponse(health);
         }
 
+        private DispatcherMetrics GetDispatcherMetrics()
+        {
+            // Plain reference check: this runs on a request thread
+            var dispatcher = UnityMainThreadDispatcher.Instance;
+            if (ReferenceEquals(dispatcher, null))
+            {
+                return null;
+            }
+
+            DispatcherMetrics metrics = dispatcher.GetMetrics();
+            metrics.timeouts = Volatile.Read(ref m_MainThreadTimeouts);
+            metrics.skippedAfterTimeout = Volatile.Read(ref m_SkippedAfterTimeout);
+            return metrics;
+        }
+
         private string HandleGameStatus(HttpListenerRequest request)
         {
             // Must execute on main thread because it uses Unity APIs
@@ -434,15 +504,39 @@ namespace CR.OpenClaw
         }
 
         /// <summary>
-        /// Execute a function on Unity main thread (thread-safe)
+        /// Execute a function on Unity main thread (thread-safe).
+        /// Player commands should pass DispatchPriority.Command so they run ahead of queued reads.
+        /// </summary>
+        public string ExecuteOnMainThread(Func<string> function, DispatchPriority priority = DispatchPriority.Read)
+        {
+            return RunOnMainThread(function, priority,
+                error => ResponseBuilder.CreateStandardError(StandardError.InternalError, error));
+        }
+
+        /// <summary>
+        /// Execute a BinaryProtocol encoder on Unity main thread (thread-safe)
         /// </summary>
-        public string ExecuteOnMainThread(Func<string> function)
+        public byte[] ExecuteOnMainThreadBinary(Func<byte[]> function, DispatchPriority priority = DispatchPriority.Read)
+        {
+            return RunOnMainThread(function, priority,
+                error => BinaryProtocol.CreateStandardError(StandardError.InternalError, error));
+        }
+
+        private T RunOnMainThread<T>(Func<T> function, DispatchPriority priority, Func<string, T> onError)
         {
-            string result = null;
+            T result = default(T);
             ManualResetEvent completed = new ManualResetEvent(false);
+            int state = 0; // 0 queued, 1 started, 2 abandoned by the waiting request
 
             UnityMainThreadDispatcher.Instance.Enqueue(() =>
             {
+                if (Interlocked.CompareExchange(ref state, 1, 0) != 0)
+                {
+                    // Nobody is waiting for this any more; don't spend frame time on it
+                    Interlocked.Increment(ref m_SkippedAfterTimeout);
+                    return;
+                }
+
                 try
                 {
                     result = function();
@@ -450,19 +544,27 @@ namespace CR.OpenClaw
                 catch (Exception ex)
                 {
                     Debug.LogError($"[OpenClawAPI] Error executing on main thread: {ex.Message}");
-                    result = ResponseBuilder.CreateStandardError(StandardError.InternalError, ex.Message);
+                    result = onError(ex.Message);
                 }
                 finally
                 {
                     completed.Set();
                 }
-            });
+            }, priority);
 
             // Wait for completion with timeout
-            if (!completed.WaitOne(200))
+            if (!completed.WaitOne(m_MainThreadTimeoutMs))
             {
-                Debug.LogWarning("[OpenClawAPI] Main thread execution timeout");
-                return ResponseBuilder.CreateStandardError(StandardError.InternalError, "Request timeout");
+                if (Interlocked.CompareExchange(ref state, 2, 0) == 0)
+                {
+                    Interlocked.Increment(ref m_MainThreadTimeouts);
+                    Debug.LogWarning($"[OpenClawAPI] Main thread execution timeout (queue depth {UnityMainThreadDispatcher.QueueDepth})");
+                    return onError("Request timeout");
+                }
+
+                // Already running on the main thread: its result is moments away, and
+                // reporting a timeout for a command that did execute would invite a retry
+                completed.WaitOne();
             }
 
             return result;
@@ -5,21 +5,80 @@ using UnityEngine;
 
 namespace CR.OpenClaw
 {
+    /// <summary>
+    /// Order in which queued work is drained; lower values run first.
+    /// Everything is queued as a Read unless the caller asks for Command.
+    /// </summary>
+    public enum DispatchPriority
+    {
+        Command = 0,
+        Read = 1
+    }
+
     /// <summary>
     /// Unity Main Thread Dispatcher
-    /// Allows safe execution of Unity API calls from background threads
+    /// Allows safe execution of Unity API calls from background threads.
+    /// Queued work is drained in Update and again in LateUpdate (so requests arriving
+    /// mid-frame don't wait a whole frame), commands before reads, until the per-frame
+    /// time budget is used up. Whatever is left waits for the next frame.
     /// </summary>
     public class UnityMainThreadDispatcher : MetaGameSingleton<UnityMainThreadDispatcher>
     {
+        [Header("Frame Budget")]
+        [Tooltip("Main thread time per frame for queued work, in milliseconds. At least one action runs every frame.")]
+        [SerializeField] private float m_FrameBudgetMs = 4f;
+
+        private struct QueuedAction
+        {
+            public Action action;
+            public long enqueuedTicks;
+        }
+
         //private static UnityMainThreadDispatcher m_Instance;
-        private static readonly ConcurrentQueue<Action> m_ActionQueue = new ConcurrentQueue<Action>();
+        private static readonly ConcurrentQueue<QueuedAction>[] m_Queues =
+        {
+            new ConcurrentQueue<QueuedAction>(), // DispatchPriority.Command
+            new ConcurrentQueue<QueuedAction>()  // DispatchPriority.Read
+        };
+
+        private static readonly System.Diagnostics.Stopwatch m_Clock = System.Diagnostics.Stopwatch.StartNew();
+        private static readonly double m_TicksPerMs = System.Diagnostics.Stopwatch.Frequency / 1000.0;
+
+        // Main thread only: time spent on queued work this frame, and the current metrics window
+        private long m_FrameUsedTicks;
+        private bool m_FrameOverBudget;
+        private long m_WindowStartTicks;
+        private int m_WindowActions;
+        private int m_WindowFrames;
+        private long m_WindowWaitTicks;
+        private long m_WindowMaxWaitTicks;
+        private long m_WindowExecTicks;
+        private long m_WindowMaxExecTicks;
+        private long m_WindowMaxFrameTicks;
+
+        // Published once per window for the health endpoint (read from request threads)
+        private readonly object m_MetricsLock = new object();
+        private DispatcherMetrics m_LastWindow = new DispatcherMetrics();
+        private int m_TotalExecuted;
+        private int m_OverBudgetFrames;
+
+        public float FrameBudgetMs
+        {
+            get => m_FrameBudgetMs;
+            set => m_FrameBudgetMs = Mathf.Max(0f, value);
+        }
+
+        /// <summary>
+        /// Number of actions waiting for the main thread
+        /// </summary>
+        public static int QueueDepth => m_Queues[0].Count + m_Queues[1].Count;
 
         #region Public API
 
         /// <summary>
         /// Enqueue an action to be executed on the main thread
         /// </summary>
-        public void Enqueue(Action action)
+        public void Enqueue(Action action, DispatchPriority priority = DispatchPriority.Read)
         {
             if (action == null)
             {
@@ -27,13 +86,17 @@ namespace CR.OpenClaw
                 return;
             }
 
-            m_ActionQueue.Enqueue(action);
+            m_Queues[(int)priority].Enqueue(new QueuedAction
+            {
+                action = action,
+                enqueuedTicks = m_Clock.ElapsedTicks
+            });
         }
 
         /// <summary>
         /// Enqueue an action with parameter to be executed on the main thread
         /// </summary>
-        public void Enqueue<T>(Action<T> action, T parameter)
+        public void Enqueue<T>(Action<T> action, T parameter, DispatchPriority priority = DispatchPriority.Read)
         {
             if (action == null)
             {
@@ -41,13 +104,13 @@ namespace CR.OpenClaw
                 return;
             }
 
-            m_ActionQueue.Enqueue(() => action(parameter));
+            Enqueue(() => action(parameter), priority);
         }
 
         /// <summary>
         /// Enqueue a function and get result via callback
         /// </summary>
-        public void Enqueue<TResult>(Func<TResult> function, Action<TResult> callback)
+        public void Enqueue<TResult>(Func<TResult> function, Action<TResult> callback, DispatchPriority priority = DispatchPriority.Read)
         {
             if (function == null || callback == null)
             {
@@ -55,17 +118,17 @@ namespace CR.OpenClaw
                 return;
             }
 
-            m_ActionQueue.Enqueue(() =>
+            Enqueue(() =>
             {
                 TResult result = function();
                 callback(result);
-            });
+            }, priority);
         }
 
         /// <summary>
         /// Execute action immediately if on main thread, otherwise enqueue it
         /// </summary>
-        public void ExecuteOnMainThread(Action action)
+        public void ExecuteOnMainThread(Action action, DispatchPriority priority = DispatchPriority.Read)
         {
             if (action == null) return;
 
@@ -75,7 +138,7 @@ namespace CR.OpenClaw
             }
             else
             {
-                Enqueue(action);
+                Enqueue(action, priority);
             }
         }
 
@@ -93,18 +156,145 @@ namespace CR.OpenClaw
 
         private void Update()
         {
-            // Execute all queued actions on the main thread
-            while (m_ActionQueue.TryDequeue(out Action action))
+            long now = m_Clock.ElapsedTicks;
+            if (now - m_WindowStartTicks >= (long)(1000 * m_TicksPerMs))
+            {
+                PublishWindow(now);
+            }
+
+            m_FrameUsedTicks = 0;
+            m_FrameOverBudget = false;
+            m_WindowFrames++;
+            Drain(true);
+        }
+
+        private void LateUpdate()
+        {
+            Drain(false);
+
+            if (m_FrameUsedTicks > m_WindowMaxFrameTicks)
             {
+                m_WindowMaxFrameTicks = m_FrameUsedTicks;
+            }
+            if (m_FrameOverBudget)
+            {
+                lock (m_MetricsLock)
+                {
+                    m_OverBudgetFrames++;
+                }
+            }
+        }
+
+        /// <summary>
+        /// Run queued actions, highest priority first, until this frame's budget is used up
+        /// </summary>
+        private void Drain(bool runAtLeastOne)
+        {
+            long budgetTicks = (long)(m_FrameBudgetMs * m_TicksPerMs);
+            int executed = 0;
+
+            while (true)
+            {
+                long begin = m_Clock.ElapsedTicks;
+                if (m_FrameUsedTicks >= budgetTicks && !(runAtLeastOne && executed == 0))
+                {
+                    m_FrameOverBudget |= QueueDepth > 0;
+                    break;
+                }
+                if (!TryDequeue(out QueuedAction item))
+                {
+                    break;
+                }
+
                 try
                 {
-                    action?.Invoke();
+                    item.action?.Invoke();
                 }
                 catch (Exception ex)
                 {
                     Debug.LogError($"[Dispatcher] Error executing action: {ex.Message}");
                     Debug.LogException(ex);
                 }
+
+                long end = m_Clock.ElapsedTicks;
+                long wait = begin - item.enqueuedTicks;
+                long exec = end - begin;
+                m_FrameUsedTicks += exec;
+                m_WindowActions++;
+                m_WindowWaitTicks += wait;
+                m_WindowExecTicks += exec;
+                if (wait > m_WindowMaxWaitTicks) m_WindowMaxWaitTicks = wait;
+                if (exec > m_WindowMaxExecTicks) m_WindowMaxExecTicks = exec;
+                executed++;
+            }
+        }
+
+        private static bool TryDequeue(out QueuedAction item)
+        {
+            foreach (var queue in m_Queues)
+            {
+                if (queue.TryDequeue(out item))
+                {
+                    return true;
+                }
+            }
+            item = default(QueuedAction);
+            return false;
+        }
+
+        private void PublishWindow(long now)
+        {
+            double seconds = (now - m_WindowStartTicks) / (m_TicksPerMs * 1000.0);
+            var window = new DispatcherMetrics
+            {
+                actionsPerSecond = seconds > 0 ? (float)(m_WindowActions / seconds) : 0f,
+                avgWaitMs = m_WindowActions > 0 ? (float)(m_WindowWaitTicks / m_TicksPerMs / m_WindowActions) : 0f,
+                maxWaitMs = (float)(m_WindowMaxWaitTicks / m_TicksPerMs),
+                avgExecMs = m_WindowActions > 0 ? (float)(m_WindowExecTicks / m_TicksPerMs / m_WindowActions) : 0f,
+                maxExecMs = (float)(m_WindowMaxExecTicks / m_TicksPerMs),
+                avgFrameMs = m_WindowFrames > 0 ? (float)(m_WindowExecTicks / m_TicksPerMs / m_WindowFrames) : 0f,
+                maxFrameMs = (float)(m_WindowMaxFrameTicks / m_TicksPerMs)
+            };
+
+            lock (m_MetricsLock)
+            {
+                m_LastWindow = window;
+                m_TotalExecuted += m_WindowActions;
+            }
+
+            m_WindowStartTicks = now;
+            m_WindowActions = 0;
+            m_WindowFrames = 0;
+            m_WindowWaitTicks = 0;
+            m_WindowMaxWaitTicks = 0;
+            m_WindowExecTicks = 0;
+            m_WindowMaxExecTicks = 0;
+            m_WindowMaxFrameTicks = 0;
+        }
+
+        /// <summary>
+        /// Queue depth plus wait/execution times over the last second (thread-safe)
+        /// </summary>
+        public DispatcherMetrics GetMetrics()
+        {
+            lock (m_MetricsLock)
+            {
+                var w = m_LastWindow;
+                return new DispatcherMetrics
+                {
+                    frameBudgetMs = m_FrameBudgetMs,
+                    commandQueueDepth = m_Queues[(int)DispatchPriority.Command].Count,
+                    readQueueDepth = m_Queues[(int)DispatchPriority.Read].Count,
+                    executed = m_TotalExecuted,
+                    overBudgetFrames = m_OverBudgetFrames,
+                    actionsPerSecond = w.actionsPerSecond,
+                    avgWaitMs = w.avgWaitMs,
+                    maxWaitMs = w.maxWaitMs,
+                    avgExecMs = w.avgExecMs,
+                    maxExecMs = w.maxExecMs,
+                    avgFrameMs = w.avgFrameMs,
+                    maxFrameMs = w.maxFrameMs
+                };
             }
         }
 
@@ -115,8 +305,11 @@ namespace CR.OpenClaw
                 Instance = null;
             }
 
-            // Clear queue
-            while (m_ActionQueue.TryDequeue(out _)) { }
+            // Clear queues
+            foreach (var queue in m_Queues)
+            {
+                while (queue.TryDequeue(out _)) { }
+            }
         }
 
         #endregion
@@ -126,43 +319,44 @@ namespace CR.OpenClaw
         /// <summary>
         /// Find GameObject by name on main thread
         /// </summary>
-        public void FindGameObject(string name, Action<GameObject> callback)
+        public void FindGameObject(string name, Action<GameObject> callback, DispatchPriority priority = DispatchPriority.Read)
         {
             Enqueue(() =>
             {
                 GameObject obj = GameObject.Find(name);
                 callback?.Invoke(obj);
-            });
+            }, priority);
         }
 
         /// <summary>
         /// Find component by type on main thread
         /// </summary>
-        public void FindComponent<T>(Action<T> callback) where T : Component
+        public void FindComponent<T>(Action<T> callback, DispatchPriority priority = DispatchPriority.Read) where T : Component
         {
             Enqueue(() =>
             {
                 T component = FindObjectOfType<T>();
                 callback?.Invoke(component);
-            });
+            }, priority);
         }
 
         /// <summary>
         /// Instantiate prefab on main thread
         /// </summary>
-        public void InstantiatePrefab(GameObject prefab, Vector3 position, Quaternion rotation, Action<GameObject> callback = null)
+        public void InstantiatePrefab(GameObject prefab, Vector3 position, Quaternion rotation, Action<GameObject> callback = null,
+            DispatchPriority priority = DispatchPriority.Read)
         {
             Enqueue(() =>
             {
                 GameObject instance = Instantiate(prefab, position, rotation);
                 callback?.Invoke(instance);
-            });
+            }, priority);
         }
 
         /// <summary>
         /// Destroy GameObject on main thread
         /// </summary>
-        public void DestroyGameObject(GameObject obj, float delay = 0f)
+        public void DestroyGameObject(GameObject obj, float delay = 0f, DispatchPriority priority = DispatchPriority.Read)
         {
             Enqueue(() =>
             {
@@ -170,7 +364,7 @@ namespace CR.OpenClaw
                 {
                     Destroy(obj, delay);
                 }
-            });
+            }, priority);
         }
 
         #endregion
@@ -184,25 +378,28 @@ namespace CR.OpenClaw
         /// <summary>
         /// Execute action on main thread
         /// </summary>
-        public static void RunOnMainThread(this MonoBehaviour monoBehaviour, Action action)
+        public static void RunOnMainThread(this MonoBehaviour monoBehaviour, Action action,
+            DispatchPriority priority = DispatchPriority.Read)
         {
-            UnityMainThreadDispatcher.Instance.Enqueue(action);
+            UnityMainThreadDispatcher.Instance.Enqueue(action, priority);
         }
 
         /// <summary>
         /// Execute action with parameter on main thread
         /// </summary>
-        public static void RunOnMainThread<T>(this MonoBehaviour monoBehaviour, Action<T> action, T parameter)
+        public static void RunOnMainThread<T>(this MonoBehaviour monoBehaviour, Action<T> action, T parameter,
+            DispatchPriority priority = DispatchPriority.Read)
         {
-            UnityMainThreadDispatcher.Instance.Enqueue(action, parameter);
+            UnityMainThreadDispatcher.Instance.Enqueue(action, parameter, priority);
         }
 
         /// <summary>
         /// Execute function and get result on main thread
         /// </summary>
-        public static void RunOnMainThread<TResult>(this MonoBehaviour monoBehaviour, Func<TResult> function, Action<TResult> callback)
+        public static void RunOnMainThread<TResult>(this MonoBehaviour monoBehaviour, Func<TResult> function, Action<TResult> callback,
+            DispatchPriority priority = DispatchPriority.Read)
         {
-            UnityMainThreadDispatcher.Instance.Enqueue(function, callback);
+            UnityMainThreadDispatcher.Instance.Enqueue(function, callback, priority);
         }
     }
 }
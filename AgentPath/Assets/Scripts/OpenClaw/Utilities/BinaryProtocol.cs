@@ -0,0 +1,263 @@
+using System;
+using System.Globalization;
+using System.IO;
+using System.Net;
+using System.Text;
+
+namespace CR.OpenClaw
+{
+    /// <summary>
+    /// Compact binary encoding for the high-volume GET routes (waypoints, player position, task).
+    /// Requested with "Accept: application/x-openclaw-binary" or "?format=binary"; JSON stays the default
+    /// and the schemas in Agent_Protocols remain the reference for field meaning.
+    ///
+    /// Layout (little-endian):
+    ///   header   magic "OCBN", uint16 version, uint16 kind, uint32 reserved, uint32 payload length
+    ///   strings  uint32 byte length (0xFFFFFFFF = null) + UTF-8 bytes, zero-padded to 4 bytes
+    ///   Error          code, message, details (strings)
+    ///   vec3     float64 x, y, z
+    ///   Waypoints      int32 count, int32 edgeCount, int32 ids[count], (pad to 8 bytes), vec3 positions[count],
+    ///                  float32 distances[count], int32 offsets[count + 1], int32 connectedIds[edgeCount]
+    ///   NearestWaypoint float32 distance, then a Waypoints block with count 1
+    ///   PlayerPosition vec3 position, vec3 faceDir
+    ///   GameTask       vec3 targetPosition, float32 distanceToTarget, int32 isCompleted,
+    ///                  int32 keysObtained, int32 keyCount, int32 doorCount, (pad to 8 bytes),
+    ///                  vec3 keysPositions[keyCount], vec3 doorsPositions[doorCount],
+    ///                  taskDescription, currentLevel (strings)
+    /// Padding is measured from the start of the frame. With it every numeric array starts on a boundary
+    /// of its item size, so clients can view them in place.
+    ///
+    /// Coordinates are the float64 values a JSON client parses (each float32 is widened through its
+    /// shortest round-trip text, as Newtonsoft writes it), so a waypoint graph decoded from either
+    /// encoding gives identical geometry. Distances stay float32.
+    /// </summary>
+    public static class BinaryProtocol
+    {
+        public const string ContentType = "application/x-openclaw-binary";
+        public const ushort Version = 2;
+
+        private static readonly byte[] Magic = { (byte)'O', (byte)'C', (byte)'B', (byte)'N' };
+        private const int HeaderSize = 16;
+
+        public enum Kind : ushort
+        {
+            Error = 0,
+            Waypoints = 1,
+            NearestWaypoint = 2,
+            PlayerPosition = 3,
+            GameTask = 4
+        }
+
+        /// <summary>
+        /// True if the client asked for the binary encoding
+        /// </summary>
+        public static bool WantsBinary(HttpListenerRequest request)
+        {
+            string format = request.QueryString["format"];
+            if (!string.IsNullOrEmpty(format))
+            {
+                return string.Equals(format, "binary", StringComparison.OrdinalIgnoreCase);
+            }
+
+            string[] accept = request.AcceptTypes;
+            if (accept == null)
+            {
+                return false;
+            }
+
+            foreach (string type in accept)
+            {
+                if (type != null && type.StartsWith(ContentType, StringComparison.OrdinalIgnoreCase))
+                {
+                    return true;
+                }
+            }
+            return false;
+        }
+
+        #region Encoders
+
+        public static byte[] CreateError(string code, string message, string details = null)
+        {
+            return Encode(Kind.Error, writer =>
+            {
+                WriteString(writer, code);
+                WriteString(writer, message);
+                WriteString(writer, details);
+            });
+        }
+
+        public static byte[] CreateStandardError(StandardError errorType, string additionalDetails = null)
+        {
+            ResponseBuilder.GetStandardError(errorType, out string code, out string message);
+            return CreateError(code, message, additionalDetails);
+        }
+
+        public static byte[] Waypoints(WaypointsResponse response)
+        {
+            return Encode(Kind.Waypoints, writer => WriteWaypoints(writer, response.waypoints));
+        }
+
+        public static byte[] NearestWaypoint(NearestWaypointResponse response)
+        {
+            return Encode(Kind.NearestWaypoint, writer =>
+            {
+                writer.Write(response.distance);
+                WriteWaypoints(writer, new[] { response.waypoint });
+            });
+        }
+
+        public static byte[] PlayerPosition(PlayerPositionResponse response)
+        {
+            return Encode(Kind.PlayerPosition, writer =>
+            {
+                WriteVector(writer, response.position);
+                WriteVector(writer, response.faceDir);
+            });
+        }
+
+        public static byte[] GameTask(GameTaskResponse response)
+        {
+            return Encode(Kind.GameTask, writer =>
+            {
+                WriteVector(writer, response.targetPosition);
+                writer.Write(response.distanceToTarget);
+                writer.Write(response.isCompleted ? 1 : 0);
+                writer.Write(response.keysObtained);
+
+                Vector3Data[] keys = response.keysPositions ?? new Vector3Data[0];
+                Vector3Data[] doors = response.doorsPositions ?? new Vector3Data[0];
+                writer.Write(keys.Length);
+                writer.Write(doors.Length);
+                AlignTo8(writer);
+                foreach (var key in keys)
+                {
+                    WriteVector(writer, key);
+                }
+                foreach (var door in doors)
+                {
+                    WriteVector(writer, door);
+                }
+
+                WriteString(writer, response.taskDescription);
+                WriteString(writer, response.currentLevel);
+            });
+        }
+
+        #endregion
+
+        #region Helpers
+
+        private static byte[] Encode(Kind kind, Action<BinaryWriter> writePayload)
+        {
+            using (var stream = new MemoryStream())
+            using (var writer = new BinaryWriter(stream))
+            {
+                // BinaryWriter is always little-endian
+                writer.Write(Magic);
+                writer.Write(Version);
+                writer.Write((ushort)kind);
+                writer.Write(0u);
+                writer.Write(0u);
+
+                writePayload(writer);
+                writer.Flush();
+
+                uint payloadLength = (uint)(stream.Length - HeaderSize);
+                stream.Position = HeaderSize - 4;
+                writer.Write(payloadLength);
+                writer.Flush();
+                return stream.ToArray();
+            }
+        }
+
+        private static void WriteWaypoints(BinaryWriter writer, WaypointData[] waypoints)
+        {
+            int edgeCount = 0;
+            foreach (var waypoint in waypoints)
+            {
+                edgeCount += waypoint.connectedIds != null ? waypoint.connectedIds.Length : 0;
+            }
+
+            writer.Write(waypoints.Length);
+            writer.Write(edgeCount);
+            foreach (var waypoint in waypoints)
+            {
+                writer.Write(waypoint.id);
+            }
+            AlignTo8(writer);
+            foreach (var waypoint in waypoints)
+            {
+                WriteVector(writer, waypoint.position);
+            }
+            foreach (var waypoint in waypoints)
+            {
+                writer.Write(waypoint.distance);
+            }
+
+            int offset = 0;
+            writer.Write(offset);
+            foreach (var waypoint in waypoints)
+            {
+                offset += waypoint.connectedIds != null ? waypoint.connectedIds.Length : 0;
+                writer.Write(offset);
+            }
+            foreach (var waypoint in waypoints)
+            {
+                if (waypoint.connectedIds == null) continue;
+                foreach (int connectedId in waypoint.connectedIds)
+                {
+                    writer.Write(connectedId);
+                }
+            }
+        }
+
+        /// <summary>
+        /// Pad with an int32 zero so the float64 array that follows is 8-byte aligned
+        /// </summary>
+        private static void AlignTo8(BinaryWriter writer)
+        {
+            if (writer.BaseStream.Position % 8 != 0)
+            {
+                writer.Write(0);
+            }
+        }
+
+        private static void WriteVector(BinaryWriter writer, Vector3Data v)
+        {
+            writer.Write(v != null ? AsJsonDouble(v.x) : 0.0);
+            writer.Write(v != null ? AsJsonDouble(v.y) : 0.0);
+            writer.Write(v != null ? AsJsonDouble(v.z) : 0.0);
+        }
+
+        /// <summary>
+        /// The double a JSON client reads for this float: the shortest text that round-trips it, parsed back
+        /// </summary>
+        private static double AsJsonDouble(float value)
+        {
+            return double.Parse(value.ToString("R", CultureInfo.InvariantCulture), CultureInfo.InvariantCulture);
+        }
+
+        private static void WriteString(BinaryWriter writer, string value)
+        {
+            if (value == null)
+            {
+                writer.Write(uint.MaxValue);
+                return;
+            }
+
+            byte[] bytes = Encoding.UTF8.GetBytes(value);
+            writer.Write((uint)bytes.Length);
+            writer.Write(bytes);
+
+            // Pad so whatever follows stays 4-byte aligned
+            int padding = (4 - bytes.Length % 4) % 4;
+            for (int i = 0; i < padding; i++)
+            {
+                writer.Write((byte)0);
+            }
+        }
+
+        #endregion
+    }
+}
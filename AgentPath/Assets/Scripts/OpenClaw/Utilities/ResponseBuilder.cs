@@ -31,32 +31,41 @@ namespace CR.OpenClaw
         /// Create a standard error response for common scenarios
         /// </summary>
         public static string CreateStandardError(StandardError errorType, string additionalDetails = null)
+        {
+            GetStandardError(errorType, out string code, out string message);
+            return CreateErrorResponse(code, message, additionalDetails);
+        }
+
+        /// <summary>
+        /// Error code and message for a standard error (shared with BinaryProtocol)
+        /// </summary>
+        public static void GetStandardError(StandardError errorType, out string code, out string message)
         {
             switch (errorType)
             {
                 case StandardError.PlayerNotFound:
-                    return CreateErrorResponse("PLAYER_NOT_FOUND", "Player controller not found in scene", additionalDetails);
+                    code = "PLAYER_NOT_FOUND"; message = "Player controller not found in scene"; break;
 
                 case StandardError.WaypointSystemNotFound:
-                    return CreateErrorResponse("WAYPOINT_SYSTEM_NOT_FOUND", "Waypoint container not found in scene", additionalDetails);
+                    code = "WAYPOINT_SYSTEM_NOT_FOUND"; message = "Waypoint container not found in scene"; break;
 
                 case StandardError.InvalidRequest:
-                    return CreateErrorResponse("INVALID_REQUEST", "Request body is invalid or malformed", additionalDetails);
+                    code = "INVALID_REQUEST"; message = "Request body is invalid or malformed"; break;
 
                 case StandardError.MissingParameter:
-                    return CreateErrorResponse("MISSING_PARAMETER", "Required parameter is missing", additionalDetails);
+                    code = "MISSING_PARAMETER"; message = "Required parameter is missing"; break;
 
                 case StandardError.CommandFailed:
-                    return CreateErrorResponse("COMMAND_FAILED", "Command execution failed", additionalDetails);
+                    code = "COMMAND_FAILED"; message = "Command execution failed"; break;
 
                 case StandardError.InternalError:
-                    return CreateErrorResponse("INTERNAL_ERROR", "An internal server error occurred", additionalDetails);
+                    code = "INTERNAL_ERROR"; message = "An internal server error occurred"; break;
 
                 case StandardError.NotInPlayMode:
-                    return CreateErrorResponse("NOT_IN_PLAY_MODE", "Unity is not in play mode", additionalDetails);
+                    code = "NOT_IN_PLAY_MODE"; message = "Unity is not in play mode"; break;
 
                 default:
-                    return CreateErrorResponse("UNKNOWN_ERROR", "An unknown error occurred", additionalDetails);
+                    code = "UNKNOWN_ERROR"; message = "An unknown error occurred"; break;
             }
         }
 
@@ -0,0 +1,299 @@
+using System;
+using System.Collections.Concurrent;
+using System.Collections.Generic;
+using UnityEngine;
+
+namespace CR.OpenClaw
+{
+    /// <summary>
+    /// Immutable copy of the level's waypoint graph for path queries off the main thread.
+    /// Captured once per level on the main thread (positions flattened to the XY plane,
+    /// connections as CSR adjacency over node indices); after that every method is thread-safe.
+    /// Paths are cached per door state, so repeated queries are a dictionary lookup.
+    /// </summary>
+    public sealed class WaypointGraphSnapshot
+    {
+        private const int MaxCachedPaths = 1024;
+
+        public readonly int SourceId;
+        public readonly int Count;
+
+        private readonly int[] m_Ids;
+        private readonly float[] m_X;
+        private readonly float[] m_Y;
+        private readonly int[] m_Offsets;
+        private readonly int[] m_Neighbors;
+        private readonly Dictionary<int, int> m_IndexById;
+
+        private readonly ConcurrentDictionary<string, PathResult> m_PathCache = new ConcurrentDictionary<string, PathResult>();
+
+        /// <summary>
+        /// A path as node indices (empty if unreachable) and its length
+        /// </summary>
+        public sealed class PathResult
+        {
+            public int[] nodes;
+            public float cost;
+            public bool Found => nodes.Length > 0;
+        }
+
+        private WaypointGraphSnapshot(int sourceId, List<WaypointNode> nodes)
+        {
+            SourceId = sourceId;
+
+            var live = new List<WaypointNode>(nodes.Count);
+            foreach (var node in nodes)
+            {
+                if (node != null)
+                {
+                    live.Add(node);
+                }
+            }
+
+            Count = live.Count;
+            m_Ids = new int[Count];
+            m_X = new float[Count];
+            m_Y = new float[Count];
+            m_Offsets = new int[Count + 1];
+            m_IndexById = new Dictionary<int, int>(Count);
+
+            for (int i = 0; i < Count; i++)
+            {
+                Vector3 position = live[i].transform.position.Flatten();
+                m_Ids[i] = live[i].m_ID;
+                m_X[i] = position.x;
+                m_Y[i] = position.y;
+                m_IndexById[live[i].m_ID] = i;
+            }
+
+            var neighbors = new List<int>();
+            for (int i = 0; i < Count; i++)
+            {
+                foreach (var connected in live[i].connections)
+                {
+                    if (connected != null && m_IndexById.TryGetValue(connected.m_ID, out int j))
+                    {
+                        neighbors.Add(j);
+                    }
+                }
+                m_Offsets[i + 1] = neighbors.Count;
+            }
+            m_Neighbors = neighbors.ToArray();
+        }
+
+        /// <summary>
+        /// Copy the container's graph (main thread only)
+        /// </summary>
+        public static WaypointGraphSnapshot Capture(WaypointContainer container)
+        {
+            return new WaypointGraphSnapshot(container.GetInstanceID(), container.m_WaypointNodeList);
+        }
+
+        #region Queries
+
+        public int IdAt(int index) => m_Ids[index];
+
+        public Vector3 PositionAt(int index) => new Vector3(m_X[index], m_Y[index], 0f);
+
+        public bool TryGetIndex(int id, out int index) => m_IndexById.TryGetValue(id, out index);
+
+        /// <summary>
+        /// Index of the waypoint closest to position, skipping blocked ones (-1 if none)
+        /// </summary>
+        public int Nearest(Vector3 position, bool[] blocked = null)
+        {
+            int best = -1;
+            float bestSqr = float.MaxValue;
+            for (int i = 0; i < Count; i++)
+            {
+                if (blocked != null && blocked[i]) continue;
+
+                float dx = m_X[i] - position.x;
+                float dy = m_Y[i] - position.y;
+                float sqr = dx * dx + dy * dy;
+                if (sqr < bestSqr)
+                {
+                    best = i;
+                    bestSqr = sqr;
+                }
+            }
+            return best;
+        }
+
+        /// <summary>
+        /// Waypoints occupied by the given door positions, as a mask plus the sorted indices
+        /// </summary>
+        public bool[] BlockedMask(Vector3[] doorPositions, out int[] blockedIndices)
+        {
+            var mask = new bool[Count];
+            var indices = new SortedSet<int>();
+            foreach (var door in doorPositions)
+            {
+                int index = Nearest(door);
+                if (index >= 0 && indices.Add(index))
+                {
+                    mask[index] = true;
+                }
+            }
+            blockedIndices = new int[indices.Count];
+            indices.CopyTo(blockedIndices);
+            return mask;
+        }
+
+        /// <summary>
+        /// A* from start to goal. Blocked waypoints can't be passed through but may be the
+        /// start or goal, so a route can end at a door. Results are cached per door state.
+        /// </summary>
+        public PathResult FindPath(int start, int goal, bool[] blocked, int[] blockedIndices, out bool cached)
+        {
+            string key = $"{string.Join(",", blockedIndices)}|{start}|{goal}";
+            if (m_PathCache.TryGetValue(key, out PathResult result))
+            {
+                cached = true;
+                return result;
+            }
+
+            cached = false;
+            result = Search(start, goal, blocked);
+            if (m_PathCache.Count >= MaxCachedPaths)
+            {
+                m_PathCache.Clear();
+            }
+            m_PathCache[key] = result;
+            return result;
+        }
+
+        #endregion
+
+        #region A*
+
+        private PathResult Search(int start, int goal, bool[] blocked)
+        {
+            if (start == goal)
+            {
+                return new PathResult { nodes = new[] { start }, cost = 0f };
+            }
+
+            var gScore = new float[Count];
+            var cameFrom = new int[Count];
+            var closed = new bool[Count];
+            for (int i = 0; i < Count; i++)
+            {
+                gScore[i] = float.PositiveInfinity;
+                cameFrom[i] = -1;
+            }
+
+            var open = new MinHeap(64);
+            gScore[start] = 0f;
+            open.Push(Distance(start, goal), start);
+
+            while (open.Count > 0)
+            {
+                int current = open.Pop();
+                if (closed[current]) continue; // stale heap entry
+                if (current == goal)
+                {
+                    return new PathResult { nodes = Reconstruct(cameFrom, goal), cost = gScore[goal] };
+                }
+                closed[current] = true;
+
+                for (int e = m_Offsets[current]; e < m_Offsets[current + 1]; e++)
+                {
+                    int neighbor = m_Neighbors[e];
+                    if (closed[neighbor] || (blocked[neighbor] && neighbor != goal)) continue;
+
+                    float tentative = gScore[current] + Distance(current, neighbor);
+                    if (tentative < gScore[neighbor])
+                    {
+                        gScore[neighbor] = tentative;
+                        cameFrom[neighbor] = current;
+                        open.Push(tentative + Distance(neighbor, goal), neighbor);
+                    }
+                }
+            }
+
+            return new PathResult { nodes = new int[0], cost = float.PositiveInfinity };
+        }
+
+        private float Distance(int a, int b)
+        {
+            float dx = m_X[a] - m_X[b];
+            float dy = m_Y[a] - m_Y[b];
+            return Mathf.Sqrt(dx * dx + dy * dy);
+        }
+
+        private static int[] Reconstruct(int[] cameFrom, int goal)
+        {
+            var path = new List<int>();
+            for (int node = goal; node != -1; node = cameFrom[node])
+            {
+                path.Add(node);
+            }
+            path.Reverse();
+            return path.ToArray();
+        }
+
+        /// <summary>
+        /// Binary min-heap of (priority, node); duplicates are skipped on pop instead of decreased
+        /// </summary>
+        private sealed class MinHeap
+        {
+            private float[] m_Priorities;
+            private int[] m_Nodes;
+
+            public int Count { get; private set; }
+
+            public MinHeap(int capacity)
+            {
+                m_Priorities = new float[capacity];
+                m_Nodes = new int[capacity];
+            }
+
+            public void Push(float priority, int node)
+            {
+                if (Count == m_Nodes.Length)
+                {
+                    Array.Resize(ref m_Priorities, Count * 2);
+                    Array.Resize(ref m_Nodes, Count * 2);
+                }
+
+                int i = Count++;
+                while (i > 0)
+                {
+                    int parent = (i - 1) / 2;
+                    if (m_Priorities[parent] <= priority) break;
+                    m_Priorities[i] = m_Priorities[parent];
+                    m_Nodes[i] = m_Nodes[parent];
+                    i = parent;
+                }
+                m_Priorities[i] = priority;
+                m_Nodes[i] = node;
+            }
+
+            public int Pop()
+            {
+                int top = m_Nodes[0];
+                Count--;
+                float priority = m_Priorities[Count];
+                int node = m_Nodes[Count];
+
+                int i = 0;
+                while (true)
+                {
+                    int child = 2 * i + 1;
+                    if (child >= Count) break;
+                    if (child + 1 < Count && m_Priorities[child + 1] < m_Priorities[child]) child++;
+                    if (m_Priorities[child] >= priority) break;
+                    m_Priorities[i] = m_Priorities[child];
+                    m_Nodes[i] = m_Nodes[child];
+                    i = child;
+                }
+                m_Priorities[i] = priority;
+                m_Nodes[i] = node;
+                return top;
+            }
+        }
+
+        #endregion
+    }
+}
@@ -0,0 +1,68 @@
+import argparse
+import json
+import socket
+import sys
+
+# Thin client for agent_daemon.py. Sends one command, prints the reply.
+# Kept free of the agent's imports so it starts instantly.
+#   python agent_ctl.py play              play the level that is up now
+#   python agent_ctl.py play 1 3 --wait   load level 1-3, block until it ends
+#   python agent_ctl.py strategy astar
+#   python agent_ctl.py metrics
+
+DEFAULT_SOCKET = "/tmp/agentpath-agent.sock"
+STRATEGIES = ("auto", "astar", "hierarchical")
+
+
+def send(request, path=DEFAULT_SOCKET, timeout=None):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall((json.dumps(request) + "\n").encode())
+        data = b""
+        while not data.endswith(b"\n"):
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            data += chunk
+    return json.loads(data) if data else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Control a running agent daemon.")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    play = sub.add_parser("play", help="play a level (the current one if none given)")
+    play.add_argument("chapter", type=int, nargs="?")
+    play.add_argument("level", type=int, nargs="?")
+    play.add_argument("--wait", action="store_true", help="block until the level ends")
+    play.add_argument("--restart", action="store_true", help="restart the level first")
+
+    strategy = sub.add_parser("strategy", help="switch planner for the next play")
+    strategy.add_argument("name", choices=STRATEGIES)
+
+    for name in ("stop", "metrics", "status", "shutdown"):
+        sub.add_parser(name)
+
+    args = parser.parse_args()
+    request = {"cmd": args.cmd}
+    if args.cmd == "play":
+        if (args.chapter is None) != (args.level is None):
+            parser.error("give both chapter and level, or neither")
+        request.update(chapter=args.chapter, level=args.level, wait=args.wait, restart=args.restart)
+    elif args.cmd == "strategy":
+        request["name"] = args.name
+
+    try:
+        reply = send(request, args.socket, timeout=None if request.get("wait") else 10.0)
+    except OSError as e:
+        print(f"Could not reach agent daemon at {args.socket}: {e}")
+        sys.exit(1)
+    print(json.dumps(reply, indent=2))
+    if not (reply and reply.get("success")):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
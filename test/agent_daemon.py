@@ -0,0 +1,329 @@
+import argparse
+import json
+import os
+import socket
+import socketserver
+import stat
+import threading
+import time
+
+import final_agent
+from final_agent import invoke, Pathfinder, run_agent
+from edge_costs import EdgeCostMap
+from campaign_runner import get_status, load_level
+from agent_ctl import DEFAULT_SOCKET, STRATEGIES
+
+# Long-lived agent process. Keeps the HTTP session, waypoint graphs,
+# planners and edge costs warm between runs and takes commands over a Unix
+# domain socket (see agent_ctl.py), so a "play" goes straight to the first
+# move instead of paying interpreter start-up and graph loading every time.
+#
+# Protocol: one JSON object per line, one JSON reply per line.
+#   {"cmd": "play", "chapter": 1, "level": 2, "wait": false, "restart": false}
+#   {"cmd": "stop"}
+#   {"cmd": "strategy", "name": "auto" | "astar" | "hierarchical"}
+#   {"cmd": "metrics"} / {"cmd": "status"} / {"cmd": "shutdown"}
+#   {"cmd": "watch", "interval": 0.25}
+# watch keeps the connection open and writes a state snapshot line every
+# interval (see snapshot()) until the client hangs up; monitors read this
+# instead of polling the game server themselves.
+
+# While no level is being played, watchers still get the game state from
+# one shared poll at this interval
+IDLE_POLL_INTERVAL = 1.0
+MIN_WATCH_INTERVAL = 0.05
+
+def _ms(seconds):
+    return round(seconds * 1000.0, 1) if seconds is not None else None
+
+
+class AgentDaemon:
+    def __init__(self, level_timeout=300.0, load_timeout=30.0):
+        self.level_timeout = level_timeout
+        self.load_timeout = load_timeout
+        self.strategy = "auto"
+        self.started = time.time()
+
+        self.lock = threading.Lock()
+        self.levels = {}   # level name -> (Pathfinder, EdgeCostMap)
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.current = None
+        self.results = []
+        self.live = {}     # filled in by run_agent while a level is played
+        self.idle_game = None
+        self.idle_polled = 0.0
+
+    # --- Warm state ---------------------------------------------------------
+
+    def warm(self):
+        # Open the keep-alive connection and load the level that is up now
+        if invoke("/api/health") is None:
+            print("Server not reachable yet, will connect on first command.")
+            return
+        status = get_status()
+        if status and status.get("sceneName") == "Gameplay":
+            if self._level(status.get("currentLevel")) is not None:
+                print(f"Warmed {status.get('currentLevel')}")
+
+    def _level(self, name):
+        with self.lock:
+            entry = self.levels.get(name)
+            if entry is not None:
+                self.cache_hits += 1
+                return entry
+        pf = Pathfinder()
+        if not pf.load_waypoints():
+            return None
+        entry = (pf, EdgeCostMap.load(name))
+        with self.lock:
+            self.levels[name] = entry
+            self.cache_misses += 1
+        return entry
+
+    # --- Commands -----------------------------------------------------------
+
+    def handle(self, request):
+        cmd = request.get("cmd")
+        if cmd == "play":
+            return self.play(request.get("chapter"), request.get("level"),
+                             request.get("restart", False), request.get("wait", False))
+        if cmd == "stop":
+            return self.stop()
+        if cmd == "strategy":
+            return self.set_strategy(request.get("name"))
+        if cmd == "metrics":
+            return {"success": True, "data": self.metrics()}
+        if cmd == "status":
+            return {"success": True, "data": self.status()}
+        return {"success": False, "error": f"unknown command: {cmd}"}
+
+    def play(self, chapter=None, level=None, restart=False, wait=False):
+        received = time.time()
+        if (chapter is None) != (level is None):
+            return {"success": False, "error": "chapter and level go together"}
+        with self.lock:
+            if self.thread is not None and self.thread.is_alive():
+                return {"success": False, "error": "already playing"}
+            self.stop_event.clear()
+            self.live = {}
+            self.current = {"chapter": chapter, "level": level, "strategy": self.strategy,
+                            "received": received}
+            self.thread = threading.Thread(target=self._play, args=(self.current, restart, self.live), daemon=True)
+            self.thread.start()
+            thread = self.thread
+        if wait:
+            thread.join()
+            return {"success": True, "data": self.results[-1]}
+        return {"success": True, "data": {"started": True, "strategy": self.strategy}}
+
+    def _play(self, current, restart, live):
+        entry = {"chapter": current["chapter"], "level": current["level"],
+                 "strategy": current["strategy"], "levelName": None, "completed": False,
+                 "reason": None, "time_to_exit": None, "stuck_events": 0,
+                 "first_move_ms": None, "command_to_move_ms": None}
+        try:
+            if current["chapter"] is not None:
+                status, error = load_level(current["chapter"], current["level"], self.load_timeout)
+                if status is None:
+                    entry["reason"] = f"load_failed: {error}"
+                    return
+            else:
+                status = get_status()
+            entry["levelName"] = status.get("currentLevel") if status else None
+
+            cached = self._level(entry["levelName"])
+            if cached is None:
+                entry["reason"] = "waypoints_unavailable"
+                return
+            pf, edge_costs = cached
+
+            ready = time.time()
+            outcome = run_agent(pf=pf, edge_costs=edge_costs, restart=restart,
+                                timeout=self.level_timeout, strategy=current["strategy"],
+                                stop_event=self.stop_event, level_name=entry["levelName"], live=live)
+            entry["completed"] = outcome["completed"]
+            entry["reason"] = outcome["reason"]
+            entry["time_to_exit"] = outcome["time_to_exit"]
+            entry["stuck_events"] = outcome.get("stuck_events", 0)
+            first_move = outcome.get("time_to_first_move")
+            if first_move is not None:
+                entry["first_move_ms"] = _ms(first_move)
+                entry["command_to_move_ms"] = _ms(ready - current["received"] + first_move)
+        except Exception as e:
+            entry["reason"] = f"error: {e}"
+        finally:
+            with self.lock:
+                self.results.append(entry)
+                self.current = None
+            print(f"Play finished: {json.dumps(entry)}")
+
+    def stop(self):
+        with self.lock:
+            playing = self.thread is not None and self.thread.is_alive()
+            self.stop_event.set()
+            thread = self.thread
+        if playing:
+            thread.join(timeout=5.0)
+        return {"success": True, "data": {"stopped": playing}}
+
+    def set_strategy(self, name):
+        if name not in STRATEGIES:
+            return {"success": False, "error": f"strategy must be one of {', '.join(STRATEGIES)}"}
+        self.strategy = name
+        # A running play keeps its planner; the next one uses the new strategy
+        return {"success": True, "data": {"strategy": name}}
+
+    # --- Reporting ----------------------------------------------------------
+
+    def status(self):
+        with self.lock:
+            current = dict(self.current) if self.current else None
+        if current:
+            current["running_for"] = time.time() - current.pop("received")
+        return {"playing": current is not None, "current": current, "strategy": self.strategy,
+                "baseUrl": final_agent.BASE_URL}
+
+    def metrics(self):
+        with self.lock:
+            results = list(self.results)
+            levels = list(self.levels)
+        first_moves = [r["first_move_ms"] for r in results if r["first_move_ms"] is not None]
+        return {
+            "uptime": time.time() - self.started,
+            "strategy": self.strategy,
+            "plays": len(results),
+            "completed": sum(1 for r in results if r["completed"]),
+            "cachedLevels": levels,
+            "cacheHits": self.cache_hits,
+            "cacheMisses": self.cache_misses,
+            "firstMoveMs": {
+                "last": first_moves[-1] if first_moves else None,
+                "min": min(first_moves) if first_moves else None,
+                "mean": round(sum(first_moves) / len(first_moves), 1) if first_moves else None,
+            },
+            "last": results[-1] if results else None,
+            "http": final_agent.CLIENT.report(),
+        }
+
+    def snapshot(self):
+        # One line of the watch feed: daemon status, what the playing agent
+        # last saw, and the agent's per-route HTTP stats
+        status = self.status()
+        with self.lock:
+            live = dict(self.live)
+        return {"time": time.time(), "status": status, "agent": live if status["playing"] else None,
+                "game": None if status["playing"] else self._idle_game(),
+                "last": self.results[-1] if self.results else None,
+                "http": final_agent.CLIENT.report()}
+
+    def _idle_game(self):
+        # Shared by every watcher, so N monitors still cost one poll a second
+        with self.lock:
+            if time.time() - self.idle_polled < IDLE_POLL_INTERVAL:
+                return self.idle_game
+            self.idle_polled = time.time()
+        game = {}
+        for name, endpoint in (("status", "/api/status"), ("task", "/api/game/task"),
+                               ("position", "/api/player/position")):
+            resp = invoke(endpoint)
+            game[name] = resp["data"] if resp and resp.get("success") else None
+        with self.lock:
+            self.idle_game = game
+        return game
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError:
+                reply = {"success": False, "error": "invalid JSON"}
+            else:
+                if request.get("cmd") == "watch":
+                    self._watch(max(MIN_WATCH_INTERVAL, float(request.get("interval", 0.25))))
+                    return
+                if request.get("cmd") == "shutdown":
+                    self._reply({"success": True, "data": {"shutdown": True}})
+                    self.server.daemon.stop()
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+                    return
+                reply = self.server.daemon.handle(request)
+            if not self._reply(reply):
+                return
+
+    def _watch(self, interval):
+        while self._reply(self.server.daemon.snapshot()):
+            time.sleep(interval)
+
+    def _reply(self, reply):
+        try:
+            self.wfile.write((json.dumps(reply) + "\n").encode())
+            self.wfile.flush()
+            return True
+        except OSError:
+            return False
+
+
+def _claim_socket(path):
+    # A socket file nobody answers on is left over from a crashed run and
+    # can go; one that accepts a connection belongs to a live daemon
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except FileNotFoundError:
+        return
+    except ConnectionRefusedError:
+        if not stat.S_ISSOCK(os.stat(path).st_mode):
+            raise RuntimeError(f"{path} exists and is not a socket")
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise RuntimeError(f"another agent daemon is already listening on {path}")
+
+
+class DaemonServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path, daemon):
+        self.daemon = daemon
+        _claim_socket(path)
+        super().__init__(path, _Handler)
+        os.chmod(path, 0o600)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the agent as a warm background daemon.")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET)
+    parser.add_argument("--base-url", default=final_agent.BASE_URL)
+    parser.add_argument("--level-timeout", type=float, default=300.0)
+    parser.add_argument("--load-timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    final_agent.BASE_URL = args.base_url
+    daemon = AgentDaemon(args.level_timeout, args.load_timeout)
+    try:
+        server = DaemonServer(args.socket, daemon)
+    except RuntimeError as e:
+        parser.exit(1, f"{e}\n")
+    daemon.warm()
+    print(f"Agent daemon listening on {args.socket}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        daemon.stop()
+    finally:
+        server.server_close()
+        if os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    main()
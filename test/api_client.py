@@ -0,0 +1,290 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout, as_completed
+
+import requests
+
+import binary_protocol
+
+# Request layer for the agent. Every route keeps a window of recent
+# latencies; deadlines come from its p99 instead of a fixed second, and an
+# idempotent GET that is still out past the route's p95 gets a second
+# (hedged) copy, first answer wins. Results say whether the server answered
+# with an error (and which), the transport failed, or the call was never
+# sent because the circuit breaker is open. The breaker opens after a run
+# of failures that mean "no scene to talk to" (transport errors,
+# PLAYER_NOT_FOUND...) and then lets one cheap /api/status probe through at
+# a backed-off interval until the Gameplay scene is back. A busy main thread
+# is not one of them: the scene is there, so the caller backs off briefly
+# and the route's deadline adapts to the slower answers.
+
+OK = "ok"
+SERVER_ERROR = "server_error"
+TRANSPORT_ERROR = "transport_error"
+CIRCUIT_OPEN = "circuit_open"
+
+DEFAULT_TIMEOUT = 1.0
+MIN_TIMEOUT = 0.3    # the server itself gives up on the main thread after 200 ms
+MAX_TIMEOUT = 2.0
+TIMEOUT_FACTOR = 3.0
+MIN_HEDGE_DELAY = 0.01
+MIN_SAMPLES = 20
+
+# Error codes that mean the level isn't there (loading, menu) rather than a bad call
+SCENE_ERRORS = {"PLAYER_NOT_FOUND", "WAYPOINT_SYSTEM_NOT_FOUND", "NOT_IN_PLAY_MODE"}
+
+
+class Result:
+    __slots__ = ("status", "data", "code", "details", "latency", "hedged")
+
+    def __init__(self, status, data=None, code=None, details=None, latency=0.0):
+        self.status = status
+        self.data = data          # the decoded envelope, or None
+        self.code = code          # server error code or transport error name
+        self.details = details
+        self.latency = latency
+        self.hedged = False
+
+    @property
+    def ok(self):
+        return self.status == OK
+
+    @property
+    def busy(self):
+        # Unity's main thread didn't get to the request within its 200 ms
+        return self.code == "INTERNAL_ERROR" and self.details == "Request timeout"
+
+    @property
+    def scene_missing(self):
+        return self.code in SCENE_ERRORS or (
+            self.code == "COMMAND_FAILED" and self.details == "Task or Player missing")
+
+
+class RouteStats:
+    def __init__(self, window=200):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.errors = {}
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def add(self, result):
+        # Every call counts; only answers (success or a server error) are
+        # latency samples. A transport failure's time is the deadline itself
+        # and would ratchet the p99-based deadline up to MAX_TIMEOUT.
+        self.count += 1
+        if result.status != TRANSPORT_ERROR:
+            self.samples.append(result.latency)
+        if not result.ok:
+            self.errors[result.code] = self.errors.get(result.code, 0) + 1
+
+    def percentile(self, p):
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(p / 100.0 * len(ordered)))]
+
+    def deadline(self):
+        if len(self.samples) < MIN_SAMPLES:
+            return DEFAULT_TIMEOUT
+        return min(MAX_TIMEOUT, max(MIN_TIMEOUT, TIMEOUT_FACTOR * self.percentile(99)))
+
+    def hedge_delay(self):
+        if len(self.samples) < MIN_SAMPLES:
+            return None
+        return max(MIN_HEDGE_DELAY, self.percentile(95))
+
+
+class ApiClient:
+    def __init__(self, failure_threshold=3, probe_interval=0.25, max_probe_interval=2.0,
+                 hedge=True, binary_routes=()):
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self.max_probe_interval = max_probe_interval
+        self.hedge = hedge
+        self.binary_routes = set(binary_routes)
+
+        self.routes = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="api-client")
+
+        # Circuit breaker
+        self.failures = 0
+        self.open_since = None
+        self.next_probe = 0.0
+        self.backoff = probe_interval
+        self.opened = 0
+        self.short_circuits = 0
+
+    @property
+    def is_open(self):
+        return self.open_since is not None
+
+    def _session(self):
+        # requests.Session isn't thread-safe; one keep-alive session per thread
+        session = getattr(self.local, "session", None)
+        if session is None:
+            session = self.local.session = requests.Session()
+        return session
+
+    def _stats(self, route):
+        with self.lock:
+            stats = self.routes.get(route)
+            if stats is None:
+                stats = self.routes[route] = RouteStats()
+            return stats
+
+    # --- Requests -----------------------------------------------------------
+
+    def request(self, base_url, endpoint, method="GET", body=None):
+        path = endpoint.split("?", 1)[0]
+        route = f"{method} {path}"
+
+        if self.is_open and time.time() < self.next_probe:
+            self.short_circuits += 1
+            return Result(CIRCUIT_OPEN, code="CIRCUIT_OPEN")
+
+        stats = self._stats(route)
+        url = f"{base_url}{endpoint}"
+        binary = path in self.binary_routes
+        if method == "GET" and self.hedge:
+            result = self._hedged(url, route, stats, binary)
+        else:
+            result = self._send(method, url, route, stats, body, stats.deadline(), binary)
+        self._update_breaker(result)
+        return result
+
+    def _hedged(self, url, route, stats, binary):
+        deadline = stats.deadline()
+        delay = stats.hedge_delay()
+        primary = self.pool.submit(self._send, "GET", url, route, stats, None, deadline, binary)
+        if delay is None or delay >= deadline:
+            return primary.result()
+        try:
+            return primary.result(timeout=delay)
+        except FutureTimeout:
+            pass
+
+        hedge = self.pool.submit(self._send, "GET", url, route, stats, None, deadline, binary)
+        with self.lock:
+            stats.hedges += 1
+        result = None
+        for future in as_completed((primary, hedge)):
+            result = future.result()
+            if result.status != TRANSPORT_ERROR:
+                if future is hedge:
+                    result.hedged = True
+                    with self.lock:
+                        stats.hedge_wins += 1
+                break
+        return result
+
+    def _send(self, method, url, route, stats, body, timeout, binary):
+        headers = {"Accept": f"{binary_protocol.ACCEPT}, application/json"} if binary else None
+        start = time.perf_counter()
+        try:
+            if method == "POST":
+                resp = self._session().post(url, json=body, timeout=timeout)
+            else:
+                resp = self._session().get(url, headers=headers, timeout=timeout)
+            if binary_protocol.is_binary(resp):
+                data = binary_protocol.decode(resp.content)
+            else:
+                data = resp.json()
+        except requests.Timeout:
+            result = Result(TRANSPORT_ERROR, code="TIMEOUT")
+        except requests.ConnectionError:
+            result = Result(TRANSPORT_ERROR, code="CONNECTION_ERROR")
+        except (requests.RequestException, ValueError) as e:
+            result = Result(TRANSPORT_ERROR, code=type(e).__name__)
+        else:
+            if data.get("success"):
+                result = Result(OK, data)
+            else:
+                error = data.get("error") or {}
+                result = Result(SERVER_ERROR, data, error.get("code"), error.get("details"))
+
+        result.latency = time.perf_counter() - start
+        with self.lock:
+            stats.add(result)
+        return result
+
+    # --- Circuit breaker ----------------------------------------------------
+
+    def _update_breaker(self, result):
+        if result.busy:
+            # Neither a failure nor proof the scene is back; an open breaker
+            # keeps its current probe interval
+            if self.is_open:
+                self.next_probe = time.time() + self.backoff
+            return
+        if result.status != TRANSPORT_ERROR and not result.scene_missing:
+            self._close()
+            return
+
+        self.failures += 1
+        now = time.time()
+        if self.is_open:
+            # Failed probe: wait longer before the next one
+            self.backoff = min(self.max_probe_interval, self.backoff * 2.0)
+            self.next_probe = now + self.backoff
+        elif self.failures >= self.failure_threshold:
+            print(f"Circuit open after {self.failures} failures ({result.code}), waiting for the scene")
+            self.open_since = now
+            self.opened += 1
+            self.backoff = self.probe_interval
+            self.next_probe = now + self.backoff
+
+    def _close(self):
+        if self.is_open:
+            print(f"Server back after {time.time() - self.open_since:.1f}s")
+        self.open_since = None
+        self.failures = 0
+        self.backoff = self.probe_interval
+
+    def wait_until_ready(self, base_url, max_wait=2.0):
+        # Cheap waiting mode: one /api/status probe per backoff interval until
+        # the Gameplay scene and player are up. Returns the status data, or
+        # None if still not ready after max_wait (so callers can check for
+        # stop/timeout between waits).
+        deadline = time.time() + max_wait
+        stats = self._stats("GET /api/status")
+        while True:
+            now = time.time()
+            if now >= self.next_probe:
+                result = self._send("GET", f"{base_url}/api/status", "GET /api/status", stats, None,
+                                    stats.deadline(), False)
+                if result.ok:
+                    status = result.data["data"]
+                    if status.get("sceneName") == "Gameplay" and status.get("playerExists"):
+                        self._close()
+                        return status
+                if not self.is_open:
+                    self.open_since = now
+                    self.opened += 1
+                self.backoff = min(self.max_probe_interval, self.backoff * 2.0)
+                self.next_probe = time.time() + self.backoff
+            if now >= deadline:
+                return None
+            time.sleep(max(0.0, min(self.next_probe, deadline) - time.time()))
+
+    # --- Reporting ----------------------------------------------------------
+
+    def report(self):
+        with self.lock:
+            routes = {}
+            for route, stats in sorted(self.routes.items()):
+                routes[route] = {
+                    "count": stats.count,
+                    "p50_ms": round(stats.percentile(50) * 1000.0, 2) if stats.samples else None,
+                    "p95_ms": round(stats.percentile(95) * 1000.0, 2) if stats.samples else None,
+                    "p99_ms": round(stats.percentile(99) * 1000.0, 2) if stats.samples else None,
+                    "deadline_ms": round(stats.deadline() * 1000.0, 1),
+                    "hedges": stats.hedges,
+                    "hedge_wins": stats.hedge_wins,
+                    "errors": dict(stats.errors),
+                }
+        return {"routes": routes, "breaker_open": self.is_open, "breaker_opened": self.opened,
+                "short_circuits": self.short_circuits}
@@ -0,0 +1,170 @@
+import struct
+import sys
+from array import array
+
+# Decoder for the server's optional binary encoding (BinaryProtocol.cs),
+# negotiated with "Accept: application/x-openclaw-binary" or ?format=binary.
+# The layout is documented in BinaryProtocol.cs; the JSON schemas in
+# Agent_Protocols stay the reference for what each field means.
+#
+# decode() returns the same envelope as the JSON routes. Waypoint lists come
+# back as WaypointArrays: typed memoryviews straight over the response
+# bytes, so nothing is copied until a caller asks for a record. Positions
+# are float64 on the wire, the same doubles the JSON routes parse to, so a
+# store built from either encoding is identical; distances are float32.
+
+ACCEPT = "application/x-openclaw-binary"
+MAGIC = b"OCBN"
+VERSION = 2
+
+KIND_ERROR = 0
+KIND_WAYPOINTS = 1
+KIND_NEAREST_WAYPOINT = 2
+KIND_PLAYER_POSITION = 3
+KIND_GAME_TASK = 4
+
+_HEADER = struct.Struct('<4sHHII')
+_COUNTS = struct.Struct('<ii')
+_VEC = struct.Struct('<3d')
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def _view(mv, offset, count, fmt):
+    # Typed view of count items; a byte-swapped copy on big-endian hosts
+    end = offset + struct.calcsize(fmt) * count
+    if end > len(mv):
+        raise ValueError("binary payload truncated")
+    if _LITTLE_ENDIAN:
+        return mv[offset:end].cast(fmt), end
+    values = array(fmt, mv[offset:end].tobytes())
+    values.byteswap()
+    return values, end
+
+
+def _vec(mv, offset):
+    x, y, z = _VEC.unpack_from(mv, offset)
+    return {'x': x, 'y': y, 'z': z}, offset + _VEC.size
+
+
+def _string(mv, offset):
+    (length,) = struct.unpack_from('<I', mv, offset)
+    offset += 4
+    if length == 0xFFFFFFFF:
+        return None, offset
+    value = bytes(mv[offset:offset + length]).decode('utf-8')
+    return value, offset + length + (4 - length % 4) % 4
+
+
+class WaypointArrays:
+    # Column views of a waypoint list: ids, flat x/y/z positions, distances
+    # and CSR adjacency (connected[offsets[i]:offsets[i + 1]])
+    def __init__(self, mv, offset):
+        self.count, self.edge_count = _COUNTS.unpack_from(mv, offset)
+        offset += _COUNTS.size
+        self.ids, offset = _view(mv, offset, self.count, 'i')
+        offset += offset % 8    # positions start 8-byte aligned
+        self.positions, offset = _view(mv, offset, self.count * 3, 'd')
+        self.distances, offset = _view(mv, offset, self.count, 'f')
+        self.offsets, offset = _view(mv, offset, self.count + 1, 'i')
+        self.connected, offset = _view(mv, offset, self.edge_count, 'i')
+        self.end = offset
+
+    def __len__(self):
+        return self.count
+
+    def position(self, i):
+        return {'x': self.positions[3 * i], 'y': self.positions[3 * i + 1], 'z': self.positions[3 * i + 2]}
+
+    def connected_ids(self, i):
+        return self.connected[self.offsets[i]:self.offsets[i + 1]].tolist()
+
+    def record(self, i):
+        # One waypoint shaped like WaypointData in the JSON response
+        return {'id': self.ids[i], 'position': self.position(i),
+                'connectedIds': self.connected_ids(i), 'distance': self.distances[i]}
+
+    def records(self):
+        return [self.record(i) for i in range(self.count)]
+
+    def to_compact(self):
+        # waypoint_stream.CompactWaypoints for Pathfinder.use_compact()
+        from waypoint_stream import CompactWaypoints
+        compact = CompactWaypoints()
+        compact.ids = array('i', self.ids)
+        compact.xs = array('d', self.positions[0::3])
+        compact.ys = array('d', self.positions[1::3])
+        compact.zs = array('d', self.positions[2::3])
+        compact.offsets = array('i', self.offsets)
+        compact.neighbors = array('i', self.connected)
+        compact.index = {wid: i for i, wid in enumerate(compact.ids)}
+        return compact
+
+
+def _decode_task(mv, offset):
+    target, offset = _vec(mv, offset)
+    distance, completed, keys_obtained, key_count, door_count = struct.unpack_from('<fiiii', mv, offset)
+    offset += 20
+    offset += offset % 8    # key/door vectors start 8-byte aligned
+    keys, doors = [], []
+    for _ in range(key_count):
+        key, offset = _vec(mv, offset)
+        keys.append(key)
+    for _ in range(door_count):
+        door, offset = _vec(mv, offset)
+        doors.append(door)
+    description, offset = _string(mv, offset)
+    level, offset = _string(mv, offset)
+    return {
+        "taskDescription": description,
+        "targetPosition": target,
+        "distanceToTarget": distance,
+        "isCompleted": bool(completed),
+        "keysPositions": keys,
+        "doorsPositions": doors,
+        "keysObtained": keys_obtained,
+        "currentLevel": level,
+    }
+
+
+def decode(buf):
+    # {"success", "data", "error"} like the JSON envelope; raises ValueError
+    # on anything that isn't a well-formed frame of a known version
+    mv = memoryview(buf)
+    if len(mv) < _HEADER.size:
+        raise ValueError("binary payload truncated")
+    magic, version, kind, _, length = _HEADER.unpack_from(mv, 0)
+    if magic != MAGIC:
+        raise ValueError("not a binary protocol frame")
+    if version != VERSION:
+        raise ValueError(f"unsupported binary protocol version {version}")
+    if len(mv) < _HEADER.size + length:
+        raise ValueError("binary payload truncated")
+    offset = _HEADER.size
+
+    if kind == KIND_ERROR:
+        code, offset = _string(mv, offset)
+        message, offset = _string(mv, offset)
+        details, offset = _string(mv, offset)
+        return {"success": False, "data": None,
+                "error": {"code": code, "message": message, "details": details}}
+
+    if kind == KIND_WAYPOINTS:
+        waypoints = WaypointArrays(mv, offset)
+        data = {"waypoints": waypoints, "totalCount": waypoints.count}
+    elif kind == KIND_NEAREST_WAYPOINT:
+        (distance,) = struct.unpack_from('<f', mv, offset)
+        waypoints = WaypointArrays(mv, offset + 4)
+        data = {"waypoint": waypoints.record(0) if waypoints.count else None, "distance": distance}
+    elif kind == KIND_PLAYER_POSITION:
+        position, offset = _vec(mv, offset)
+        face_dir, offset = _vec(mv, offset)
+        data = {"position": position, "faceDir": face_dir}
+    elif kind == KIND_GAME_TASK:
+        data = _decode_task(mv, offset)
+    else:
+        raise ValueError(f"unknown binary frame kind {kind}")
+    return {"success": True, "data": data, "error": None}
+
+
+def is_binary(resp):
+    return resp.headers.get("Content-Type", "").startswith(ACCEPT)
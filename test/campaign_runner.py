@@ -0,0 +1,205 @@
+import argparse
+import json
+import re
+import time
+
+import final_agent
+from final_agent import invoke, Pathfinder, run_agent
+from edge_costs import EdgeCostMap
+
+# Plays every unlocked level of chapters 1 and 2 in a row. Levels are loaded
+# through /api/player/level, readiness is detected from /api/status instead of
+# fixed sleeps. The load gap after each level is used to read the next one's
+# saved edge costs, and its waypoints are fetched as soon as it is up, so the
+# agent starts with both in hand. Reports levels per hour, per-level wall
+# time and failure reasons.
+
+READY_POLL_INTERVAL = 0.2
+
+
+def parse_level_name(name):
+    # Level objects are named like "Level_1_3" (possibly with a suffix)
+    match = re.search(r'_(\d+)_(\d+)', name or "")
+    if not match:
+        return None
+    return int(match.group(1)), int(match.group(2))
+
+
+def predict_level_name(template, chapter, level):
+    # Guess the next level's object name from the current one so its saved
+    # edge costs can be loaded before the level is up. Numbers keep the
+    # template's zero padding ("level_01_0001" -> "level_01_0002").
+    match = re.search(r'_(\d+)_(\d+)', template or "")
+    if not match:
+        return None
+    name = f"_{chapter:0{len(match.group(1))}d}_{level:0{len(match.group(2))}d}"
+    return template[:match.start()] + name + template[match.end():]
+
+
+def get_status():
+    resp = invoke("/api/status")
+    if resp and resp.get("success"):
+        return resp["data"]
+    return None
+
+
+def wait_for_level(chapter, level, timeout):
+    # Ready once the Gameplay scene is active, the player exists and the
+    # loaded level is the one we asked for
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status = get_status()
+        if status and status.get("sceneName") == "Gameplay" and status.get("playerExists"):
+            if parse_level_name(status.get("currentLevel")) == (chapter, level):
+                task = invoke("/api/game/task")
+                if task and task.get("success") and not task["data"].get("isCompleted"):
+                    return status
+        time.sleep(READY_POLL_INTERVAL)
+    return None
+
+
+def load_level(chapter, level, timeout):
+    resp = invoke("/api/player/level", "POST", {"chapter": chapter, "level": level})
+    if not (resp and resp.get("success")):
+        error = (resp or {}).get("error") or {}
+        return None, error.get("message", "load request failed")
+    status = wait_for_level(chapter, level, timeout)
+    if status is None:
+        return None, "scene not ready"
+    return status, None
+
+
+def run_campaign(chapters=(1, 2), start_level=1, max_levels=None, level_timeout=300.0,
+                 load_timeout=30.0, auto_advance_wait=6.0):
+    results = []
+    campaign_start = time.time()
+    warm = None  # (chapter, level, EdgeCostMap) read during the load gap
+    level_name_template = None
+
+    for chapter in chapters:
+        level = start_level
+        while max_levels is None or len(results) < max_levels:
+            status = get_status()
+            if status is None:
+                print("Server not reachable, stopping campaign.")
+                return summarize(results, campaign_start)
+
+            progress = status.get(f"chapter{chapter}Progress", 0)
+            if level > progress:
+                break
+
+            level_start = time.time()
+            ready = None
+            load_error = None
+
+            # The game loads the next level by itself a few seconds after a
+            # completion; take that if it arrives, otherwise ask for it
+            if results and results[-1]["completed"] and results[-1]["chapter"] == chapter:
+                ready = wait_for_level(chapter, level, auto_advance_wait)
+            if ready is None:
+                print(f"Loading level {chapter}-{level}...")
+                ready, load_error = load_level(chapter, level, load_timeout)
+
+            entry = {"chapter": chapter, "level": level, "completed": False, "reason": None,
+                     "wall_time": None, "play_time": None, "load_time": None}
+            if ready is None:
+                entry["reason"] = f"load_failed: {load_error}"
+                entry["wall_time"] = time.time() - level_start
+                results.append(entry)
+                print(f"Level {chapter}-{level} failed to load ({load_error})")
+                level += 1
+                continue
+
+            level_name = ready.get("currentLevel")
+            level_name_template = level_name or level_name_template
+
+            # The level is up: fetch its map now. run_agent retries if this
+            # fails and reloads edge costs if the predicted name was wrong.
+            pf = Pathfinder()
+            pf.load_waypoints()
+            edge_costs = None
+            if warm and warm[0] == chapter and warm[1] == level:
+                edge_costs = warm[2]
+            warm = None
+            entry["load_time"] = time.time() - level_start
+
+            outcome = run_agent(pf=pf, edge_costs=edge_costs, restart=False, timeout=level_timeout,
+                                level_name=level_name)
+            entry["completed"] = outcome["completed"]
+            entry["reason"] = outcome["reason"]
+            entry["play_time"] = outcome["time_to_exit"]
+            entry["stuck_events"] = outcome.get("stuck_events", 0)
+
+            if outcome["completed"]:
+                # Load gap: read the next level's edge costs while the game
+                # switches over; its waypoints only exist once it is loaded
+                warm = (chapter, level + 1,
+                        EdgeCostMap.load(predict_level_name(level_name_template, chapter, level + 1)))
+            entry["wall_time"] = time.time() - level_start
+            results.append(entry)
+
+            done = "completed" if entry["completed"] else f"failed ({entry['reason']})"
+            print(f"Level {chapter}-{level} {done} in {entry['wall_time']:.1f}s")
+
+            if outcome["reason"] == "interrupted":
+                return summarize(results, campaign_start)
+            level += 1
+
+    return summarize(results, campaign_start)
+
+
+def summarize(results, campaign_start):
+    elapsed = time.time() - campaign_start
+    completed = [r for r in results if r["completed"]]
+    failures = {}
+    for r in results:
+        if not r["completed"]:
+            failures[r["reason"]] = failures.get(r["reason"], 0) + 1
+    return {
+        "levels_attempted": len(results),
+        "levels_completed": len(completed),
+        "elapsed": elapsed,
+        "levels_per_hour": len(completed) / elapsed * 3600.0 if elapsed > 0 else 0.0,
+        "failures": failures,
+        "levels": results,
+    }
+
+
+def print_report(report):
+    print("=" * 60)
+    print(f" CAMPAIGN: {report['levels_completed']}/{report['levels_attempted']} levels "
+          f"in {report['elapsed']:.1f}s ({report['levels_per_hour']:.1f} levels/hour)")
+    print("-" * 60)
+    for r in report["levels"]:
+        status = "OK  " if r["completed"] else "FAIL"
+        wall = f"{r['wall_time']:.1f}s" if r["wall_time"] is not None else "-"
+        load = f"{r['load_time']:.1f}s" if r["load_time"] is not None else "-"
+        reason = "" if r["completed"] else f"  {r['reason']}"
+        print(f" [{status}] {r['chapter']}-{r['level']:<3} wall {wall:>7} | load {load:>6}{reason}")
+    if report["failures"]:
+        print("-" * 60)
+        for reason, count in report["failures"].items():
+            print(f" {count} x {reason}")
+    print("=" * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play all unlocked levels back to back.")
+    parser.add_argument("--base-url", default=final_agent.BASE_URL)
+    parser.add_argument("--chapters", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--start-level", type=int, default=1)
+    parser.add_argument("--max-levels", type=int, default=None)
+    parser.add_argument("--level-timeout", type=float, default=300.0)
+    parser.add_argument("--report", help="write the report as JSON to this file")
+    args = parser.parse_args()
+
+    final_agent.BASE_URL = args.base_url
+    report = run_campaign(args.chapters, args.start_level, args.max_levels, args.level_timeout)
+    print_report(report)
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
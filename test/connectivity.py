@@ -0,0 +1,172 @@
+from collections import deque
+
+# Connected-component labels over the waypoint graph with door waypoints
+# taken out, so "can I get from here to there at all" is a dict lookup
+# instead of an A* that floods the whole component before returning None.
+#
+# Edges count in either direction. Doors change the labels incrementally:
+# blocking a waypoint only relabels the component it was in (split),
+# unblocking one merges its neighbours' components into the largest of
+# them. When two waypoints are in different components, doors_between()
+# finds the doors to open to join them, walking a small graph of
+# components linked by doors.
+
+
+class ConnectivityIndex:
+    def __init__(self, graph, blocked=()):
+        # graph: {id: [connected ids]} (dict or the compact graph view)
+        self.adjacency = {wid: set() for wid in graph}
+        for wid in graph:
+            for other in graph[wid]:
+                if other in self.adjacency and other != wid:
+                    self.adjacency[wid].add(other)
+                    self.adjacency[other].add(wid)
+
+        self.blocked = set(b for b in blocked if b in self.adjacency)
+        self.labels = {}
+        self.members = {}
+        self._next_label = 0
+        for wid in self.adjacency:
+            if wid not in self.labels and wid not in self.blocked:
+                self._flood(wid, self._new_label())
+
+    def _new_label(self):
+        self._next_label += 1
+        return self._next_label
+
+    def _flood(self, start, label, allowed=None):
+        members = self.members.setdefault(label, set())
+        self.labels[start] = label
+        members.add(start)
+        frontier = deque([start])
+        while frontier:
+            wid = frontier.popleft()
+            for other in self.adjacency[wid]:
+                if other in self.blocked or self.labels.get(other) == label:
+                    continue
+                if allowed is not None and other not in allowed:
+                    continue
+                self.labels[other] = label
+                members.add(other)
+                frontier.append(other)
+        return members
+
+    # --- Door updates -------------------------------------------------------
+
+    def block(self, wid):
+        if wid in self.blocked or wid not in self.adjacency:
+            return
+        self.blocked.add(wid)
+        label = self.labels.pop(wid, None)
+        if label is None:
+            return
+        old = self.members.pop(label)
+        old.discard(wid)
+        # Re-flood only the component the door sat in. Every piece touches
+        # the door, so starting from its neighbours finds them all.
+        for start in self.adjacency[wid]:
+            if self.labels.get(start) == label:
+                self._flood(start, self._new_label(), allowed=old)
+
+    def unblock(self, wid):
+        if wid not in self.blocked:
+            return
+        self.blocked.discard(wid)
+        neighbour_labels = {self.labels[o] for o in self.adjacency[wid] if o not in self.blocked}
+        if not neighbour_labels:
+            label = self._new_label()
+            self.labels[wid] = label
+            self.members[label] = {wid}
+            return
+        # Small-to-large: relabel everything into the biggest neighbour component
+        keep = max(neighbour_labels, key=lambda l: len(self.members[l]))
+        members = self.members[keep]
+        for label in neighbour_labels - {keep}:
+            for other in self.members.pop(label):
+                self.labels[other] = keep
+                members.add(other)
+        self.labels[wid] = keep
+        members.add(wid)
+
+    def set_blocked(self, blocked):
+        # Apply a new door set; returns True if anything changed
+        blocked = set(b for b in blocked if b in self.adjacency)
+        opened = self.blocked - blocked
+        closed = blocked - self.blocked
+        for wid in opened:
+            self.unblock(wid)
+        for wid in closed:
+            self.block(wid)
+        return bool(opened or closed)
+
+    # --- Queries ------------------------------------------------------------
+
+    def _endpoint_labels(self, wid):
+        # A blocked endpoint (standing at or aiming for a door) belongs to
+        # every component around it
+        if wid in self.blocked:
+            return {self.labels[o] for o in self.adjacency.get(wid, ()) if o not in self.blocked}
+        label = self.labels.get(wid)
+        return {label} if label is not None else set()
+
+    def reachable(self, a, b):
+        if a == b:
+            return True
+        return not self._endpoint_labels(a).isdisjoint(self._endpoint_labels(b))
+
+    def doors_between(self, a, b):
+        # Fewest doors to open to get from a to b, nearest to a first.
+        # [] if already reachable, None if no set of doors would do it.
+        sources = self._endpoint_labels(a)
+        targets = self._endpoint_labels(b)
+        if not sources or not targets:
+            return None
+        if not sources.isdisjoint(targets):
+            return []
+
+        # Components linked through each door. Doors that touch each other
+        # (a double door) only open the way together, so they form one link.
+        links = {}
+        seen = set()
+        for door in self.blocked:
+            if door in seen:
+                continue
+            group = []
+            around = set()
+            frontier = deque([door])
+            seen.add(door)
+            while frontier:
+                wid = frontier.popleft()
+                group.append(wid)
+                for other in self.adjacency[wid]:
+                    if other not in self.blocked:
+                        around.add(self.labels[other])
+                    elif other not in seen:
+                        seen.add(other)
+                        frontier.append(other)
+            for label in around:
+                links.setdefault(label, []).append((group, around))
+
+        came_from = {label: None for label in sources}
+        frontier = deque(sources)
+        while frontier:
+            label = frontier.popleft()
+            if label in targets:
+                groups = []
+                while came_from[label] is not None:
+                    label, group = came_from[label]
+                    groups.append(group)
+                return [door for group in reversed(groups) for door in group]
+            for group, around in links.get(label, ()):
+                for other in around:
+                    if other not in came_from:
+                        came_from[other] = (label, group)
+                        frontier.append(other)
+        return None
+
+    def component_size(self, wid):
+        label = self.labels.get(wid)
+        return len(self.members[label]) if label is not None else 0
+
+    def __len__(self):
+        return len(self.members)
@@ -0,0 +1,102 @@
+import json
+import os
+import re
+import time
+
+# Learned edge penalties. When the player fails to make progress along an
+# edge the edge gets an extra cost on top of its length; the planners add it
+# to their edge weights so replans route around the bad spot. Penalties decay
+# with a half-life and are saved per level, so the next attempt avoids the
+# same edges from the first tick.
+
+EDGE_COST_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".edge_costs")
+
+
+def _level_filename(level):
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', level or "unknown") + ".json"
+
+
+class EdgeCostMap:
+    def __init__(self, level=None, half_life=900.0, penalty=5.0, directory=EDGE_COST_DIR):
+        self.level = level
+        self.half_life = half_life
+        self.default_penalty = penalty
+        self.directory = directory
+        self.penalties = {}   # (a, b) -> (value, timestamp), a < b
+        self.attempts = []
+
+    @staticmethod
+    def _key(a, b):
+        return (a, b) if a <= b else (b, a)
+
+    def _decayed(self, value, stamp, now):
+        if self.half_life <= 0:
+            return value
+        return value * 0.5 ** (max(0.0, now - stamp) / self.half_life)
+
+    def penalty(self, a, b, now=None):
+        entry = self.penalties.get(self._key(a, b))
+        if entry is None:
+            return 0.0
+        return self._decayed(entry[0], entry[1], time.time() if now is None else now)
+
+    def penalize(self, a, b, amount=None, now=None):
+        now = time.time() if now is None else now
+        value = self.penalty(a, b, now) + (self.default_penalty if amount is None else amount)
+        self.penalties[self._key(a, b)] = (value, now)
+        return value
+
+    def __len__(self):
+        return len(self.penalties)
+
+    # --- Persistence --------------------------------------------------------
+
+    @property
+    def path(self):
+        return os.path.join(self.directory, _level_filename(self.level))
+
+    @classmethod
+    def load(cls, level, **kwargs):
+        costs = cls(level, **kwargs)
+        try:
+            with open(costs.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return costs
+
+        now = time.time()
+        for a, b, value, stamp in data.get("penalties", []):
+            # Drop penalties that have decayed to nothing
+            if costs._decayed(value, stamp, now) >= 0.01:
+                costs.penalties[costs._key(a, b)] = (value, stamp)
+        costs.attempts = data.get("attempts", [])
+        return costs
+
+    def save(self):
+        data = {
+            "level": self.level,
+            "penalties": [[a, b, value, stamp] for (a, b), (value, stamp) in self.penalties.items()],
+            "attempts": self.attempts,
+        }
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"Could not save edge costs: {e}")
+
+    def record_attempt(self, time_to_exit, stuck_events):
+        self.attempts.append({
+            "finished": time.time(),
+            "time_to_exit": time_to_exit,
+            "stuck_events": stuck_events,
+            "penalized_edges": len(self.penalties),
+        })
+
+    def last_time_to_exit(self):
+        for attempt in reversed(self.attempts):
+            if attempt.get("time_to_exit") is not None:
+                return attempt["time_to_exit"]
+        return None
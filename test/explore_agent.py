@@ -0,0 +1,339 @@
+import argparse
+import heapq
+import math
+import time
+
+import final_agent
+from final_agent import call, invoke, wait_after_failure, get_dist, INTERACT_RADIUS, INTERACT_COOLDOWN
+from steering import PurePursuit
+
+# Plays a level without downloading the map. The waypoint graph is built as
+# we go from /api/waypoints/nearby (what is around the player) and
+# /api/waypoints/nearest (the waypoints under the key, door and exit), the
+# way an agent that can only "feel" its surroundings would.
+#
+# Every known waypoint lists its connected ids, so a known waypoint with a
+# connection we haven't seen yet is a frontier. While the target isn't
+# connected to us in the known graph we walk to the frontier with the best
+#   travel cost + straight-line distance to the target - GAIN_WEIGHT * gain
+# where gain is how many unseen waypoints a nearby call there should reveal.
+# Once the target is connected we plan over the known subgraph like
+# final_agent does over the whole one.
+#   python explore_agent.py
+#   python explore_agent.py --compare    (then the full-map A* agent, same level)
+
+# /api/waypoints/nearby answers with the waypoints within this radius
+SENSE_RADIUS = 1.5
+# Sense again after moving this far, so consecutive calls overlap a little
+SENSE_SPACING = 1.0
+# Travel cost (in metres) one expected new waypoint is worth
+GAIN_WEIGHT = 0.5
+
+
+class LocalMap:
+    def __init__(self):
+        self.waypoints = {}   # id -> waypoint record as the server sent it
+        self.graph = {}       # id -> connected ids, seen or not
+
+    def __len__(self):
+        return len(self.waypoints)
+
+    def add(self, wp):
+        # True if the waypoint is new
+        wid = wp['id']
+        if wid in self.waypoints:
+            return False
+        self.waypoints[wid] = wp
+        self.graph[wid] = list(wp.get('connectedIds') or [])
+        return True
+
+    def position(self, wid):
+        return self.waypoints[wid]['position']
+
+    def nearest(self, pos, excluded=()):
+        best, best_d = None, float('inf')
+        for wid, wp in self.waypoints.items():
+            if wid in excluded:
+                continue
+            d = get_dist(wp['position'], pos)
+            if d < best_d:
+                best, best_d = wid, d
+        return best
+
+    def unseen(self, wid):
+        return [o for o in self.graph[wid] if o not in self.waypoints]
+
+    def frontiers(self):
+        return [wid for wid in self.waypoints if self.unseen(wid)]
+
+    def expected_gain(self, wid, frontiers):
+        # Unseen ids hanging off the frontiers a nearby call at wid would cover
+        pos = self.position(wid)
+        ids = set()
+        for other in frontiers:
+            if get_dist(self.position(other), pos) <= SENSE_RADIUS:
+                ids.update(self.unseen(other))
+        return len(ids)
+
+    def a_star(self, start_id, end_id, blocked_ids=()):
+        # Over known waypoints only; blocked ones can still be the goal
+        end_pos = self.position(end_id)
+        g = {start_id: 0.0}
+        came_from = {}
+        open_set = [(get_dist(self.position(start_id), end_pos), start_id)]
+        closed = set()
+        while open_set:
+            _, current = heapq.heappop(open_set)
+            if current in closed:
+                continue
+            if current == end_id:
+                return self.reconstruct(came_from, current)
+            closed.add(current)
+            for n in self.graph[current]:
+                if n not in self.waypoints or n in closed or (n in blocked_ids and n != end_id):
+                    continue
+                d = g[current] + get_dist(self.position(current), self.position(n))
+                if d < g.get(n, float('inf')):
+                    g[n] = d
+                    came_from[n] = current
+                    heapq.heappush(open_set, (d + get_dist(self.position(n), end_pos), n))
+        return None
+
+    def best_frontier(self, start_id, target_pos, blocked_ids=()):
+        # One Dijkstra from the player gives the travel cost to every frontier
+        g = {start_id: 0.0}
+        came_from = {}
+        open_set = [(0.0, start_id)]
+        while open_set:
+            d, current = heapq.heappop(open_set)
+            if d > g[current]:
+                continue
+            for n in self.graph[current]:
+                if n not in self.waypoints or n in blocked_ids:
+                    continue
+                nd = d + get_dist(self.position(current), self.position(n))
+                if nd < g.get(n, float('inf')):
+                    g[n] = nd
+                    came_from[n] = current
+                    heapq.heappush(open_set, (nd, n))
+
+        frontiers = [wid for wid in self.frontiers() if wid in g]
+        best, best_score = None, float('inf')
+        for wid in frontiers:
+            score = (g[wid] + get_dist(self.position(wid), target_pos)
+                     - GAIN_WEIGHT * self.expected_gain(wid, frontiers))
+            if score < best_score:
+                best, best_score = wid, score
+        if best is None:
+            return None
+        return self.reconstruct(came_from, best)
+
+    def reconstruct(self, came_from, current):
+        total_path = [current]
+        while current in came_from:
+            current = came_from[current]
+            total_path.append(current)
+        return total_path[::-1]
+
+
+def run_explorer(restart=True, timeout=None):
+    # Same loop shape and result dict as final_agent.run_agent, plus the
+    # map-building counters
+    local = LocalMap()
+    resolved = {}      # (x, y) of a key/door/exit -> waypoint id under it
+    stats = {"nearby": 0, "nearest": 0, "discovered": 0, "plans": 0, "frontier_plans": 0}
+
+    def sense():
+        resp = invoke("/api/waypoints/nearby")
+        stats["nearby"] += 1
+        if not resp or not resp.get("success"):
+            return 0
+        added = sum(local.add(wp) for wp in resp["data"]["waypoints"])
+        stats["discovered"] += added
+        return added
+
+    def resolve(pos):
+        key = (round(pos['x'], 2), round(pos['y'], 2))
+        if key not in resolved:
+            resp = invoke(f"/api/waypoints/nearest?x={pos['x']}&y={pos['y']}")
+            stats["nearest"] += 1
+            if not resp or not resp.get("success"):
+                return None
+            wp = resp["data"]["waypoint"]
+            if local.add(wp):
+                stats["discovered"] += 1
+            resolved[key] = wp['id']
+        return resolved[key]
+
+    def move(x, y):
+        invoke("/api/player/move", "POST", {"x": x, "y": y})
+
+    print("Explorer started (no map download).")
+    if restart:
+        print("Restarting level...")
+        invoke("/api/player/restart", "POST")
+        time.sleep(2.0)
+    start_time = time.time()
+    stuck_events = 0
+
+    current_path = []
+    path_target = None
+    follower = PurePursuit()
+    interacted_at = None
+    exploring = False
+    sensed_at = None
+    last_pos = None
+    stuck_frames = 0
+    result = {"completed": False, "reason": "interrupted", "time_to_exit": None}
+
+    while True:
+        try:
+            if timeout is not None and time.time() - start_time > timeout:
+                print("Level timed out.")
+                result["reason"] = "timeout"
+                break
+
+            task = call("/api/game/task")
+            if not task.ok:
+                wait_after_failure(task)
+                continue
+            t_data = task.data["data"]
+            if t_data.get("isCompleted"):
+                time_to_exit = time.time() - start_time
+                map_requests = stats["nearby"] + stats["nearest"]
+                per_node = map_requests / stats["discovered"] if stats["discovered"] else float('nan')
+                print("Level Complete!")
+                print(f"Time to exit: {time_to_exit:.1f}s | Stuck events: {stuck_events}")
+                print(f"Discovered {stats['discovered']} waypoints with {stats['nearby']} nearby + "
+                      f"{stats['nearest']} nearest calls ({per_node:.2f} requests per new waypoint), "
+                      f"{stats['plans']} plans ({stats['frontier_plans']} to frontiers)")
+                result = {"completed": True, "reason": None, "time_to_exit": time_to_exit}
+                break
+
+            keys = t_data.get("keysPositions", [])
+            doors = t_data.get("doorsPositions", [])
+            exit_pos = t_data.get("targetPosition")
+
+            if keys:
+                target_pos, target_type = keys[0], "key"
+            elif doors:
+                target_pos, target_type = doors[0], "door"
+            else:
+                target_pos, target_type = exit_pos, "exit"
+            if current_path and target_pos != path_target:
+                current_path = []
+
+            pos_resp = call("/api/player/position")
+            if not pos_resp.ok:
+                wait_after_failure(pos_resp)
+                continue
+            p_pos = pos_resp.data["data"]["position"]
+
+            if last_pos:
+                stuck_frames = stuck_frames + 1 if get_dist(p_pos, last_pos) < 0.01 else 0
+            last_pos = p_pos
+
+            # Feel around every SENSE_SPACING metres; new waypoints may open a
+            # better route, so an exploration leg is replanned when they do
+            if sensed_at is None or get_dist(p_pos, sensed_at) >= SENSE_SPACING:
+                sensed_at = p_pos
+                if sense() and exploring:
+                    current_path = []
+
+            door_wps = {w for w in (resolve(d) for d in doors) if w is not None}
+            target_wp = resolve(target_pos)
+
+            dist_to_target = get_dist(p_pos, target_pos)
+            now = time.time()
+            if target_type in ["key", "door"] and dist_to_target < INTERACT_RADIUS:
+                if interacted_at is None or now - interacted_at > INTERACT_COOLDOWN:
+                    print(f"Interacting with {target_type}...")
+                    invoke("/api/player/interact", "POST", {})
+                    interacted_at = now
+
+            if stuck_frames > 10:
+                print("Stuck detected! Replanning...")
+                stuck_events += 1
+                stuck_frames = 0
+                current_path = []
+                sensed_at = None
+                move(-1, 0)
+                time.sleep(0.2)
+                continue
+
+            if not current_path or not follower.active:
+                start_wp = local.nearest(p_pos, excluded=door_wps)
+                path_ids = None
+                exploring = False
+                if start_wp is not None and target_wp is not None:
+                    path_ids = local.a_star(start_wp, target_wp, blocked_ids=door_wps)
+                    stats["plans"] += 1
+                    if path_ids is None:
+                        path_ids = local.best_frontier(start_wp, target_pos, blocked_ids=door_wps)
+                        exploring = path_ids is not None
+                        stats["frontier_plans"] += exploring
+                        if exploring:
+                            print(f"Exploring toward frontier {path_ids[-1]} ({len(local)} waypoints known)")
+                    else:
+                        print(f"Path to {target_type} over known map: {len(path_ids)} waypoints")
+
+                if not path_ids:
+                    # Nothing left to explore from here: head straight for it
+                    dx = target_pos['x'] - p_pos['x']
+                    dy = target_pos['y'] - p_pos['y']
+                    mag = math.sqrt(dx * dx + dy * dy)
+                    if mag > 0:
+                        move(dx / mag, dy / mag)
+                    time.sleep(0.5)
+                    continue
+
+                current_path = [local.position(wid) for wid in path_ids]
+                path_target = target_pos
+                # A leg to a frontier ends there; one to the target runs on into it
+                follower.set_path(current_path, p_pos, goal=None if exploring else target_pos)
+
+            direction = follower.steer(p_pos)
+            if direction is None:
+                # Arrived at the frontier: look around before replanning
+                sensed_at = None
+                continue
+            move(*direction)
+
+            time.sleep(0.1)
+
+        except KeyboardInterrupt:
+            break
+        except Exception as e:
+            print(f"Error: {e}")
+            time.sleep(1)
+
+    result["stuck_events"] = stuck_events
+    result.update(stats)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play the current level by exploring instead of downloading the map.")
+    parser.add_argument("--base-url", default=final_agent.BASE_URL)
+    parser.add_argument("--timeout", type=float, default=None, help="give up after this many seconds")
+    parser.add_argument("--compare", action="store_true",
+                        help="then replay the level with the full-map A* agent and compare")
+    args = parser.parse_args()
+    final_agent.BASE_URL = args.base_url
+
+    explored = run_explorer(timeout=args.timeout)
+    if not args.compare:
+        return
+
+    print("\nFull-map A* agent on the same level:")
+    full = final_agent.run_agent(timeout=args.timeout, strategy="astar")
+    map_requests = explored["nearby"] + explored["nearest"]
+    print(f"\n{'':<10} {'time to exit':>12} {'map requests':>13} {'waypoints':>10}")
+    for name, r, requests_used, nodes in (("explorer", explored, map_requests, explored["discovered"]),
+                                          ("full map", full, 1, None)):
+        t = f"{r['time_to_exit']:.1f}s" if r["completed"] else r["reason"]
+        print(f"{name:<10} {t:>12} {requests_used:>13} {nodes if nodes is not None else 'all':>10}")
+
+
+if __name__ == "__main__":
+    main()
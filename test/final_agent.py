@@ -3,52 +3,95 @@ import time
 import math
 import heapq
 import sys
+from collections import deque
+
+from geometry import get_dist
+from motion_estimator import MotionEstimator
+from waypoint_store import WaypointStore
+from hierarchical_planner import HierarchicalPlanner
+from connectivity import ConnectivityIndex
+from edge_costs import EdgeCostMap
+from waypoint_stream import stream_waypoints
+from api_client import ApiClient
+from steering import PurePursuit
 
 BASE_URL = "http://localhost:8091"
 
+# Levels with at least this many waypoints are planned hierarchically
+HIERARCHICAL_MIN_WAYPOINTS = 1500
+
+# Seconds without real movement before the agent counts as stuck (near a
+# key/door, and anywhere). Wall-clock time, not polls: the motion estimator
+# skips most position polls, so counting them would stretch the threshold.
+STUCK_NEAR_TARGET_SECONDS = 0.5
+STUCK_SECONDS = 1.0
+
+# Interaction radius the agent steers into, and how long to wait before
+# pressing interact again if the first press didn't take
+INTERACT_RADIUS = 0.8
+INTERACT_COOLDOWN = 0.5
+
+# An edge counts as failed when following it takes this many times longer
+# than the learned speed says it should (plus a second of slack)
+EDGE_TIMEOUT_FACTOR = 3.0
+
+# One keep-alive session for every call instead of a new connection each time
+SESSION = requests.Session()
+
+# Routes asked for in the binary encoding (see binary_protocol.py). They decode
+# to the same dicts as JSON, and servers without it just answer in JSON.
+USE_BINARY = True
+BINARY_ROUTES = ("/api/player/position", "/api/game/task", "/api/waypoints/nearest")
+
+# Per-route adaptive deadlines, hedged reads and a circuit breaker for the
+# per-tick calls (see api_client.py); SESSION is still used for the bulk
+# waypoint download
+CLIENT = ApiClient(binary_routes=BINARY_ROUTES if USE_BINARY else ())
+
+def call(endpoint, method="GET", body=None):
+    # api_client.Result: tells server errors, transport failures and an
+    # open circuit apart
+    return CLIENT.request(BASE_URL, endpoint, method, body)
+
 def invoke(endpoint, method="GET", body=None):
-    try:
-        url = f"{BASE_URL}{endpoint}"
-        if method == "POST":
-            resp = requests.post(url, json=body, timeout=1.0)
-        else:
-            resp = requests.get(url, timeout=1.0)
-        if resp.status_code == 200:
-            return resp.json()
-    except:
-        pass
-    return None
-
-def get_dist(p1, p2):
-    return math.sqrt((p1['x'] - p2['x'])**2 + (p1['y'] - p2['y'])**2)
+    return call(endpoint, method, body).data
+
+def wait_after_failure(result):
+    # Busy main thread: retry almost at once. Scene gone (loading, menu):
+    # sit in the breaker's cheap waiting mode instead of polling every route.
+    if CLIENT.is_open:
+        CLIENT.wait_until_ready(BASE_URL, max_wait=1.0)
+    elif result.busy:
+        time.sleep(0.05)
+    else:
+        time.sleep(0.2)
 
 class Pathfinder:
     def __init__(self):
         self.waypoints = {}
         self.graph = {}
+        self.store = None
+        self.planner = None  # HierarchicalPlanner, kept with the graph so it can be reused
+        self.connectivity = None  # ConnectivityIndex, likewise
         
     def load_waypoints(self):
-        resp = invoke("/api/waypoints/all")
-        if resp and resp.get("success"):
-            wps = resp["data"]["waypoints"]
-            for wp in wps:
-                self.waypoints[wp['id']] = wp
-                self.graph[wp['id']] = wp['connectedIds']
-            print(f"Loaded {len(self.waypoints)} waypoints.")
-            return True
-        return False
+        # Decoded incrementally into compact arrays; see waypoint_stream.py
+        compact, _ = stream_waypoints(SESSION, BASE_URL, binary=USE_BINARY)
+        if compact is None:
+            return False
+        self.use_compact(compact)
+        print(f"Loaded {len(self.waypoints)} waypoints.")
+        return True
+
+    def use_compact(self, compact):
+        self.waypoints = compact.records
+        self.graph = compact.graph
+        self.store = WaypointStore.from_compact(compact)
         
     def get_closest_waypoint(self, pos):
-        closest = None
-        min_dist = float('inf')
-        for wid, wp in self.waypoints.items():
-            d = get_dist(pos, wp['position'])
-            if d < min_dist:
-                min_dist = d
-                closest = wid
-        return closest
-
-    def a_star(self, start_id, end_id, blocked_ids=[]):
+        return self.store.nearest(pos)[0]
+
+    def a_star(self, start_id, end_id, blocked_ids=[], edge_costs=None):
         open_set = []
         heapq.heappush(open_set, (0, start_id))
         came_from = {}
@@ -57,9 +100,11 @@ class Pathfinder:
         g_score[start_id] = 0
         
         f_score = {node: float('inf') for node in self.graph}
-        start_pos = self.waypoints[start_id]['position']
         end_pos = self.waypoints[end_id]['position']
-        f_score[start_id] = get_dist(start_pos, end_pos)
+        # Heuristic for every node in one batched pass
+        h = self.store.distance_list(end_pos)
+        h_index = self.store.index
+        f_score[start_id] = h[h_index[start_id]]
         
         processed = set()
 
@@ -75,13 +120,15 @@ class Pathfinder:
                 if neighbor in blocked_ids:
                     continue
                     
-                d = get_dist(self.waypoints[current]['position'], self.waypoints[neighbor]['position'])
+                d = self.store.edge_length(current, neighbor)
+                if edge_costs is not None:
+                    d += edge_costs.penalty(current, neighbor)
                 tentative_g = g_score[current] + d
                 
                 if tentative_g < g_score[neighbor]:
                     came_from[neighbor] = current
                     g_score[neighbor] = tentative_g
-                    f_score[neighbor] = tentative_g + get_dist(self.waypoints[neighbor]['position'], end_pos)
+                    f_score[neighbor] = tentative_g + h[h_index[neighbor]]
                     
                     if neighbor not in [i[1] for i in open_set]:
                         heapq.heappush(open_set, (f_score[neighbor], neighbor))
@@ -95,63 +142,168 @@ class Pathfinder:
             total_path.append(current)
         return total_path[::-1]
 
-def run_agent():
-    pf = Pathfinder()
-    if not pf.load_waypoints():
+def run_agent(pf=None, edge_costs=None, restart=True, timeout=None, strategy="auto", stop_event=None,
+              level_name=None, live=None):
+    # Plays the current level until it is complete. pf / edge_costs may be
+    # passed in pre-warmed (see campaign_runner.py, agent_daemon.py); pass
+    # level_name too when the caller already knows which level is up.
+    # strategy picks the planner: "auto", "astar" or "hierarchical".
+    # live, if given, is a dict kept up to date with what the agent sees
+    # (task, position, tick rate, planner time) for monitors to read.
+    # Returns a result dict with "completed", "reason" and "time_to_exit".
+    called_at = time.time()
+    first_move = None
+    if pf is None:
+        pf = Pathfinder()
+    if not pf.waypoints and not pf.load_waypoints():
         print("Failed to load waypoints.")
-        return
+        return {"completed": False, "reason": "waypoints_unavailable", "time_to_exit": None}
 
     print("Agent Started with A*.")
+
+    # Edge penalties learned on earlier attempts at this level
+    if level_name is None:
+        status = invoke("/api/status")
+        level_name = status["data"].get("currentLevel") if status and status.get("success") else None
+    if edge_costs is None or edge_costs.level != level_name:
+        edge_costs = EdgeCostMap.load(level_name)
+    if len(edge_costs):
+        print(f"Loaded {len(edge_costs)} penalized edges for {level_name}")
     
-    # Restart to ensure fresh state
-    print("Restarting level...")
-    invoke("/api/player/restart", "POST")
-    time.sleep(2.0)
+    if restart:
+        # Restart to ensure fresh state
+        print("Restarting level...")
+        invoke("/api/player/restart", "POST")
+        time.sleep(2.0)
+    start_time = time.time()
+    stuck_events = 0
+    ticks = 0
+    tick_times = deque(maxlen=20)
+    plans = 0
+    plan_ms_last = None
+    plan_ms_total = 0.0
     
     current_path = []
+    current_ids = []
     path_index = 0
+    path_target = None
+    edge_index = None
+    edge_started = None
+
+    # Region-based planner for big levels, built once the doors are known.
+    # Its paths are refined one region at a time as we advance.
+    if strategy == "auto":
+        use_hierarchical = len(pf.waypoints) >= HIERARCHICAL_MIN_WAYPOINTS
+    else:
+        use_hierarchical = strategy == "hierarchical"
+    planner = pf.planner if use_hierarchical else None
+    if planner is not None:
+        planner.edge_costs = edge_costs
+    hpath = None
     
     # Identify waypoints that are "doors" or blocked initially if needed
     # But we treat door as a target first.
     
     last_pos = None
-    stuck_frames = 0
+    last_observed = None
+    still_since = None
+
+    # Waypoint of a door standing between us and the target, found by the
+    # connectivity check
+    detour_door = None
+
+    # Follows the path with a lookahead point instead of node to node
+    follower = PurePursuit()
+    interacted_at = None
+
+    # Predicts the player position between polls so we only ask the server
+    # when the estimate gets too uncertain or we may be arriving somewhere
+    estimator = MotionEstimator()
+
+    def move(x, y):
+        nonlocal first_move
+        invoke("/api/player/move", "POST", {"x": x, "y": y})
+        estimator.command(x, y, time.time())
+        if first_move is None:
+            first_move = time.time() - called_at
+
+    def penalize_current_edge(p_pos):
+        # Blame the edge we were following when progress stopped
+        if not current_path or path_index >= len(current_ids):
+            return
+        to_wp = current_ids[path_index]
+        from_wp = current_ids[path_index - 1] if path_index > 0 else pf.get_closest_waypoint(p_pos)
+        if from_wp == to_wp:
+            return
+        value = edge_costs.penalize(from_wp, to_wp)
+        print(f"Penalized edge {from_wp}->{to_wp} (now +{value:.1f})")
+        if planner is not None:
+            planner.invalidate_edge(from_wp, to_wp)
+        edge_costs.save()
+    
+    result = {"completed": False, "reason": "interrupted", "time_to_exit": None}
     
     while True:
         try:
+            if timeout is not None and time.time() - start_time > timeout:
+                print("Level timed out.")
+                result["reason"] = "timeout"
+                break
+            if stop_event is not None and stop_event.is_set():
+                print("Agent stopped.")
+                invoke("/api/player/move", "POST", {"x": 0, "y": 0})
+                result["reason"] = "stopped"
+                break
+
             # 1. State
-            task = invoke("/api/game/task")
-            pos_resp = invoke("/api/player/position")
+            ticks += 1
+            tick_times.append(time.time())
+            task = call("/api/game/task")
             
-            if not (task and pos_resp and task.get("success")):
-                time.sleep(0.5)
+            if not task.ok:
+                wait_after_failure(task)
                 continue
                 
-            t_data = task["data"]
+            t_data = task.data["data"]
             if t_data.get("isCompleted"):
                 print("Level Complete!")
+                stats = estimator.report()
+                print(f"Position polls: {stats['polls']} (skipped {stats['skipped']}) | "
+                      f"Prediction error mean {stats['mean_error']:.3f} max {stats['max_error']:.3f}")
+                time_to_exit = time.time() - start_time
+                previous = edge_costs.last_time_to_exit()
+                edge_costs.record_attempt(time_to_exit, stuck_events)
+                edge_costs.save()
+                if previous is not None:
+                    print(f"Time to exit: {time_to_exit:.1f}s (previous attempt {previous:.1f}s) | "
+                          f"Ticks: {ticks} | Stuck events: {stuck_events}")
+                else:
+                    print(f"Time to exit: {time_to_exit:.1f}s | Ticks: {ticks} | Stuck events: {stuck_events}")
+                http = CLIENT.report()
+                for route, r in http["routes"].items():
+                    print(f"  {route}: {r['count']} calls, p50 {r['p50_ms']}ms p99 {r['p99_ms']}ms, "
+                          f"deadline {r['deadline_ms']}ms, hedges {r['hedges']} ({r['hedge_wins']} won)"
+                          + (f", errors {r['errors']}" if r['errors'] else ""))
+                result = {"completed": True, "reason": None, "time_to_exit": time_to_exit}
                 break
                 
-            p_pos = pos_resp["data"]["position"]
             keys = t_data.get("keysPositions", [])
             doors = t_data.get("doorsPositions", [])
             exit_pos = t_data.get("targetPosition")
             key_count = t_data.get("keysObtained", 0)
-
-            # Stuck detection
-            if last_pos:
-                moved_dist = get_dist(p_pos, last_pos)
-                if moved_dist < 0.01:
-                    stuck_frames += 1
-                else:
-                    stuck_frames = 0
-            last_pos = p_pos
+            door_wp_list = pf.store.nearest_many(doors)
 
             # 2. Strategy
             target_pos = None
             target_type = None
             
-            if keys:
+            if detour_door is not None and detour_door not in door_wp_list:
+                detour_door = None
+
+            if detour_door is not None:
+                target_pos = doors[door_wp_list.index(detour_door)]
+                target_type = "door"
+            elif keys:
                 target_pos = keys[0]
                 target_type = "key"
             elif doors:
@@ -160,40 +312,119 @@ def run_agent():
             else:
                 target_pos = exit_pos
                 target_type = "exit"
+
+            # New target (key picked up, door opened): the old path is moot
+            if current_path and target_pos != path_target:
+                current_path = []
+
+            # Waypoints occupied by doors are impassable
+            new_door_wps = set(door_wp_list)
+            if pf.connectivity is None:
+                pf.connectivity = ConnectivityIndex(pf.graph, new_door_wps)
+                print(f"Connectivity: {len(pf.connectivity)} components")
+            elif pf.connectivity.set_blocked(new_door_wps):
+                print(f"Doors changed, now {len(pf.connectivity)} components")
+            if use_hierarchical:
+                if planner is None:
+                    planner = HierarchicalPlanner(pf, chokepoints=new_door_wps, blocked=new_door_wps,
+                                                  edge_costs=edge_costs)
+                    pf.planner = planner
+                    print(f"Hierarchical planner: {len(planner.regions)} regions")
+                elif new_door_wps != planner.blocked:
+                    rebuilt = planner.set_blocked(new_door_wps)
+                    print(f"Doors changed, rebuilt regions {sorted(rebuilt)}")
+
+            # Position: poll only when the prediction can't be trusted. Path
+            # nodes aren't checkpoints: the follower projects onto the path
+            # and a predicted position is good enough for that.
+            now = time.time()
+            checkpoints = [(target_pos, 2.0 if target_type in ["key", "door"] else 0.8)]
+
+            observed = estimator.needs_update(now, checkpoints)
+            if observed:
+                pos_resp = call("/api/player/position")
+                if not pos_resp.ok:
+                    wait_after_failure(pos_resp)
+                    continue
+                p_pos = pos_resp.data["data"]["position"]
+                estimator.observe(p_pos, time.time())
+            else:
+                p_pos = estimator.predict(now)
+                estimator.skip()
+
+            # Stuck detection (real observations only): how long since the
+            # player last moved
+            if observed:
+                if last_pos and get_dist(p_pos, last_pos) < 0.01:
+                    if still_since is None:
+                        still_since = last_observed
+                else:
+                    still_since = None
+                last_pos = p_pos
+                last_observed = now
+            still_for = now - still_since if still_since is not None else 0.0
+            no_progress = False
             
             # Distance check
             dist_to_target = get_dist(p_pos, target_pos)
-            # print(f"Goal: {target_type} | Dist: {dist_to_target:.2f} | Keys: {key_count} | Stuck: {stuck_frames}")
+
+            if live is not None:
+                live.update(level=level_name, task=t_data, position=p_pos, target=target_type,
+                            distance=dist_to_target, ticks=ticks, stuck_events=stuck_events,
+                            tick_rate=(len(tick_times) - 1) / (tick_times[-1] - tick_times[0])
+                            if len(tick_times) > 1 else None,
+                            plans=plans, plan_ms_last=plan_ms_last, plan_ms_total=round(plan_ms_total, 2),
+                            elapsed=now - start_time)
+            # print(f"Goal: {target_type} | Dist: {dist_to_target:.2f} | Keys: {key_count} | Still: {still_for:.1f}s")
 
             # INTERACTION
             if target_type in ["key", "door"]:
-                if dist_to_target < 0.8:
-                    print(f"Interacting with {target_type}...")
-                    invoke("/api/player/interact", "POST", {})
-                    invoke("/api/player/move", "POST", {"x": 0, "y": 0})
-                    time.sleep(1.0)
-                    current_path = []
-                    # Force a small move away/random to unstuck if needed?
-                    continue 
-                elif dist_to_target < 2.0 and stuck_frames > 5:
+                if dist_to_target < INTERACT_RADIUS:
+                    # Press interact on the way in and keep moving; the next
+                    # task poll shows whether it took
+                    if interacted_at is None or now - interacted_at > INTERACT_COOLDOWN:
+                        print(f"Interacting with {target_type}...")
+                        invoke("/api/player/interact", "POST", {})
+                        interacted_at = now
+                elif dist_to_target < 2.0 and still_for > STUCK_NEAR_TARGET_SECONDS:
                      # We are close but stuck, try direct move aggressively or random wiggle
                      print("Stuck near target, wiggling...")
-                     invoke("/api/player/move", "POST", {"x": 0.5, "y": 0.5}) # Wiggle
+                     stuck_events += 1
+                     penalize_current_edge(p_pos)
+                     move(0.5, 0.5) # Wiggle
                      time.sleep(0.2)
                      current_path = [] # force replan
+                     edge_index = None
+                     still_since = last_pos = None
                      continue
 
+            # No progress along the current edge for much longer than it
+            # should take counts as stuck too
+            if current_path and path_index < len(current_ids):
+                if edge_index != path_index:
+                    edge_index = path_index
+                    edge_started = now
+                elif estimator.speed:
+                    from_pos = current_path[path_index - 1] if path_index > 0 else p_pos
+                    expected = get_dist(from_pos, current_path[path_index]) / estimator.speed
+                    if now - edge_started > EDGE_TIMEOUT_FACTOR * expected + 1.0:
+                        print("No progress along edge!")
+                        no_progress = True
+
             # MOVEMENT
             # If we are stuck, force replan
-            if stuck_frames > 10:
+            if no_progress or still_for > STUCK_SECONDS:
                 print("Stuck detected! Replanning...")
+                stuck_events += 1
+                penalize_current_edge(p_pos)
                 current_path = []
-                stuck_frames = 0
+                edge_index = None
+                still_since = last_pos = None
                 # Try a random move to break loose
-                invoke("/api/player/move", "POST", {"x": -1, "y": 0})
+                move(-1, 0)
                 time.sleep(0.2)
             
-            if not current_path or path_index >= len(current_path):
+            if not current_path or not follower.active:
                 print(f"Planning path to {target_type}...")
                 start_wp = pf.get_closest_waypoint(p_pos)
                 
@@ -206,17 +437,9 @@ def run_agent():
                     # Find a neighbor of the door waypoint that is reachable
                     # We assume we are not AT the door yet.
                     door_wp = pf.waypoints[real_target_wp]
-                    best_neighbor = None
-                    min_dist_to_player = float('inf')
-                    
-                    for nid in door_wp['connectedIds']:
-                        # Pick neighbor closest to player? Or just any?
-                        # Closest to player makes sense to avoid walking through the door.
-                        n_pos = pf.waypoints[nid]['position']
-                        d = get_dist(p_pos, n_pos)
-                        if d < min_dist_to_player:
-                            min_dist_to_player = d
-                            best_neighbor = nid
+                    # Pick neighbor closest to player? Or just any?
+                    # Closest to player makes sense to avoid walking through the door.
+                    best_neighbor, _ = pf.store.nearest_among(p_pos, door_wp['connectedIds'])
                     
                     if best_neighbor is not None:
                         print(f"Adjusting door target from {real_target_wp} to neighbor {best_neighbor}")
@@ -226,60 +449,73 @@ def run_agent():
                 else:
                     end_wp = real_target_wp
                 
-                print(f"A* from {start_wp} to {end_wp}")
-                path_ids = pf.a_star(start_wp, end_wp)
+                # Unreachable targets are rejected before any search
+                if not pf.connectivity.reachable(start_wp, end_wp):
+                    doors_needed = pf.connectivity.doors_between(start_wp, end_wp)
+                    if doors_needed and key_count > 0:
+                        detour_door = doors_needed[0]
+                        print(f"{target_type} at {end_wp} is behind door {detour_door}, opening it first")
+                        current_path = []
+                        continue
+                    print(f"{target_type} at {end_wp} is unreachable from {start_wp}"
+                          + (f" (doors in the way: {doors_needed})" if doors_needed else ""))
+                    path_ids = None
+                else:
+                    print(f"A* from {start_wp} to {end_wp}")
+                    plan_started = time.perf_counter()
+                    if planner is not None:
+                        planner.refresh_costs()
+                        hpath = planner.plan(start_wp, end_wp)
+                        # Refine the first leg so there is something to follow
+                        if hpath is not None and not hpath.complete and hpath.refine_next() is None:
+                            hpath = None
+                        path_ids = hpath.ids if hpath else None
+                    else:
+                        path_ids = pf.a_star(start_wp, end_wp, blocked_ids=new_door_wps, edge_costs=edge_costs)
+                    plans += 1
+                    plan_ms_last = round((time.perf_counter() - plan_started) * 1000.0, 2)
+                    plan_ms_total += plan_ms_last
                 
                 if path_ids:
                     print(f"Path found: {path_ids}")
+                    current_ids = list(path_ids)
                     current_path = [pf.waypoints[wid]['position'] for wid in path_ids]
-                    path_index = 0
-                    if len(current_path) > 1:
-                        # Find closest point in path to resume from
-                        closest_idx = 0
-                        min_d = float('inf')
-                        for i, node in enumerate(current_path):
-                            d = get_dist(p_pos, node)
-                            if d < min_d:
-                                min_d = d
-                                closest_idx = i
-                        
-                        path_index = closest_idx
-                        # If extremely close to closest_idx, move to next
-                        if min_d < 0.5:
-                            path_index += 1
+                    path_target = target_pos
+                    # The path runs on into the target itself, so the key/door
+                    # radius is entered at speed instead of stopping at the last node.
+                    # A partly refined path gets the target once its last leg is in
+                    goal = target_pos if hpath is None or hpath.complete else None
+                    follower.set_path(current_path, p_pos, goal=goal, ids=current_ids, store=pf.store)
+                    path_index = follower.index
+                    edge_index = None
                 else:
                     print("No path found via A*! Using direct approach.")
                     dx = target_pos['x'] - p_pos['x']
                     dy = target_pos['y'] - p_pos['y']
                     mag = math.sqrt(dx*dx + dy*dy)
                     if mag > 0:
-                        invoke("/api/player/move", "POST", {"x": dx/mag, "y": dy/mag})
+                        move(dx/mag, dy/mag)
                     time.sleep(0.5)
                     continue
 
+            # Refine the next region of a hierarchical path before we run out
+            if hpath is not None and not hpath.complete and path_index >= len(current_path) - 1:
+                plan_started = time.perf_counter()
+                leg = hpath.refine_next()
+                plan_ms_total += (time.perf_counter() - plan_started) * 1000.0
+                if leg is None:
+                    current_path = []
+                    continue
+                current_ids.extend(leg)
+                current_path.extend(pf.waypoints[wid]['position'] for wid in leg)
+                if hpath.complete:
+                    follower.goal = target_pos
+
             # Execute Path
-            if path_index < len(current_path):
-                next_node = current_path[path_index]
-                d = get_dist(p_pos, next_node)
-                
-                if d < 0.8: 
-                    path_index += 1
-                    if path_index >= len(current_path):
-                         # Final approach
-                        dx = target_pos['x'] - p_pos['x']
-                        dy = target_pos['y'] - p_pos['y']
-                        mag = math.sqrt(dx*dx + dy*dy)
-                        if mag > 0:
-                            invoke("/api/player/move", "POST", {"x": dx/mag, "y": dy/mag})
-                        continue
-                    next_node = current_path[path_index]
-                
-                dx = next_node['x'] - p_pos['x']
-                dy = next_node['y'] - p_pos['y']
-                mag = math.sqrt(dx*dx + dy*dy)
-                
-                if mag > 0:
-                    invoke("/api/player/move", "POST", {"x": dx/mag, "y": dy/mag})
+            direction = follower.steer(p_pos, estimator.speed)
+            path_index = follower.index
+            if direction is not None:
+                move(*direction)
             
             time.sleep(0.1)
 
@@ -289,5 +525,10 @@ def run_agent():
             print(f"Error: {e}")
             time.sleep(1)
 
+    result["stuck_events"] = stuck_events
+    result["ticks"] = ticks
+    result["time_to_first_move"] = first_move
+    return result
+
 if __name__ == "__main__":
     run_agent()
@@ -0,0 +1,10 @@
+import math
+
+# Planar distance shared by the agent modules. Positions are {'x', 'y', 'z'}
+# dicts; z is ignored. Squares are written dx * dx, see waypoint_store.py.
+
+
+def get_dist(p1, p2):
+    dx = p1['x'] - p2['x']
+    dy = p1['y'] - p2['y']
+    return math.sqrt(dx * dx + dy * dy)
@@ -0,0 +1,297 @@
+import heapq
+import math
+
+# Hierarchical path planning for big waypoint graphs.
+#
+# The graph is split into regions: connected pieces of a coarse spatial grid
+# (a stand-in for rooms, since the API doesn't expose them) plus one region
+# per chokepoint waypoint (the waypoints doors sit on). Nodes with an edge
+# into another region are entrances; entrance-to-entrance costs inside each
+# region are precomputed. A query searches the small abstract graph of
+# entrances first and then refines one region segment at a time, only when
+# the agent gets there. Because every door is its own region, opening or
+# closing a door only recomputes that door's region. Edge penalties are
+# baked into the precomputed costs, so regions are rebuilt when a penalty is
+# added and, via refresh_costs(), once decay has moved one noticeably.
+
+
+def _edge_key(a, b):
+    return (a, b) if a <= b else (b, a)
+
+
+class HierarchicalPath:
+    def __init__(self, planner, abstract, ids=None):
+        self.planner = planner
+        self.abstract = abstract  # [start, entrance, ..., goal]
+        # ids given means the path is already fully refined
+        self.ids = list(ids) if ids is not None else [abstract[0]]
+        self.next_leg = len(abstract) - 1 if ids is not None else 0
+
+    @property
+    def complete(self):
+        return self.next_leg >= len(self.abstract) - 1
+
+    def refine_next(self):
+        # Expand the next abstract leg into waypoint ids; returns the new ids
+        # or None if the leg could not be refined (graph changed under us)
+        if self.complete:
+            return []
+        a = self.abstract[self.next_leg]
+        b = self.abstract[self.next_leg + 1]
+        self.next_leg += 1
+
+        if b in self.planner.graph.get(a, ()) and self.planner.region_of[a] != self.planner.region_of[b]:
+            leg = [a, b]
+        else:
+            leg = self.planner.local_path(a, b)
+            if leg is None:
+                return None
+        self.ids.extend(leg[1:])
+        return leg[1:]
+
+    def refine_all(self):
+        while not self.complete:
+            if self.refine_next() is None:
+                return None
+        return self.ids
+
+
+class HierarchicalPlanner:
+    def __init__(self, pf, region_size=8.0, chokepoints=(), blocked=(), edge_costs=None):
+        self.graph = pf.graph
+        self.store = pf.store
+        self.edge_costs = edge_costs
+        self.region_size = region_size
+        self.chokepoints = set(chokepoints)
+        self.blocked = set(blocked)
+
+        self.region_of = {}
+        self.regions = {}
+        self.entrances = {}   # region -> entrance ids
+        self.intra = {}       # region -> {entrance: [(entrance, cost), ...]}
+        self.inter = {}       # entrance -> [(entrance in another region, cost), ...]
+        self.penalties_used = {}  # region -> {(a, b): penalty baked into its costs}
+        self.region_builds = 0
+        self._building = None
+
+        self._partition()
+        for rid in self.regions:
+            self._build_region(rid)
+
+    # --- Partitioning -------------------------------------------------------
+
+    def _cell(self, wid):
+        p = self.store.position(wid)
+        return (math.floor(p['x'] / self.region_size), math.floor(p['y'] / self.region_size))
+
+    def _partition(self):
+        next_id = 0
+        for wid in self.graph:
+            if wid in self.region_of:
+                continue
+            if wid in self.chokepoints:
+                self.region_of[wid] = next_id
+                self.regions[next_id] = {wid}
+                next_id += 1
+                continue
+
+            # Flood fill inside the grid cell so every region is connected
+            cell = self._cell(wid)
+            members = {wid}
+            self.region_of[wid] = next_id
+            stack = [wid]
+            while stack:
+                cur = stack.pop()
+                for nid in self.graph[cur]:
+                    if nid in self.region_of or nid not in self.graph or nid in self.chokepoints:
+                        continue
+                    if self._cell(nid) != cell:
+                        continue
+                    self.region_of[nid] = next_id
+                    members.add(nid)
+                    stack.append(nid)
+            self.regions[next_id] = members
+            next_id += 1
+
+    def _build_region(self, rid):
+        self.region_builds += 1
+        members = self.regions[rid]
+        self._building = {}
+
+        entrances = set()
+        for wid in members:
+            for nid in self.graph[wid]:
+                if nid in self.region_of and self.region_of[nid] != rid:
+                    entrances.add(wid)
+                    break
+        self.entrances[rid] = entrances
+
+        for wid in entrances:
+            self.inter[wid] = [
+                (nid, self._edge_cost(wid, nid))
+                for nid in self.graph[wid]
+                if nid in self.region_of and self.region_of[nid] != rid
+            ]
+
+        costs = {}
+        for e in entrances:
+            if e in self.blocked:
+                costs[e] = []
+                continue
+            dist = self._dijkstra(e, rid)
+            costs[e] = [(o, dist[o]) for o in entrances if o != e and o in dist]
+        self.intra[rid] = costs
+        self.penalties_used[rid] = self._building
+        self._building = None
+
+    def _edge_cost(self, a, b):
+        cost = self.store.edge_length(a, b)
+        if self.edge_costs is not None:
+            penalty = self.edge_costs.penalty(a, b)
+            if penalty and self._building is not None:
+                self._building[_edge_key(a, b)] = penalty
+            cost += penalty
+        return cost
+
+    # --- Door / cost updates ------------------------------------------------
+
+    def set_blocked(self, blocked):
+        # Rebuild only the regions whose nodes changed state
+        blocked = set(blocked)
+        changed = blocked ^ self.blocked
+        self.blocked = blocked
+        affected = {self.region_of[wid] for wid in changed if wid in self.region_of}
+        for rid in affected:
+            self._build_region(rid)
+        return affected
+
+    def invalidate_edge(self, a, b):
+        # An edge penalty changed; refresh the precomputed costs around it
+        affected = {self.region_of[wid] for wid in (a, b) if wid in self.region_of}
+        for rid in affected:
+            self._build_region(rid)
+        return affected
+
+    def refresh_costs(self, tolerance=0.1):
+        # Rebuild the regions whose baked-in penalties have drifted more than
+        # tolerance from the cost map: decayed, newly added, or a new map
+        def current(key):
+            return self.edge_costs.penalty(*key) if self.edge_costs is not None else 0.0
+
+        affected = set()
+        for rid, used in self.penalties_used.items():
+            if any(abs(current(key) - value) > tolerance for key, value in used.items()):
+                affected.add(rid)
+        if self.edge_costs is not None:
+            for key in self.edge_costs.penalties:
+                for wid in key:
+                    rid = self.region_of.get(wid)
+                    if rid is not None and key not in self.penalties_used[rid] and current(key) > tolerance:
+                        affected.add(rid)
+        for rid in affected:
+            self._build_region(rid)
+        return affected
+
+    # --- Searches -----------------------------------------------------------
+
+    def _dijkstra(self, source, rid):
+        dist = {source: 0.0}
+        heap = [(0.0, source)]
+        while heap:
+            d, cur = heapq.heappop(heap)
+            if d > dist[cur]:
+                continue
+            for nid in self.graph[cur]:
+                if nid in self.blocked or self.region_of.get(nid) != rid:
+                    continue
+                nd = d + self._edge_cost(cur, nid)
+                if nd < dist.get(nid, float('inf')):
+                    dist[nid] = nd
+                    heapq.heappush(heap, (nd, nid))
+        return dist
+
+    def local_path(self, start, goal):
+        # A* restricted to the region both nodes belong to
+        rid = self.region_of[start]
+        if self.region_of[goal] != rid:
+            return None
+        goal_pos = self.store.position(goal)
+        g = {start: 0.0}
+        came_from = {}
+        heap = [(self._h(start, goal_pos), start)]
+        while heap:
+            _, cur = heapq.heappop(heap)
+            if cur == goal:
+                path = [cur]
+                while cur in came_from:
+                    cur = came_from[cur]
+                    path.append(cur)
+                return path[::-1]
+            for nid in self.graph[cur]:
+                if nid in self.blocked or self.region_of.get(nid) != rid:
+                    continue
+                ng = g[cur] + self._edge_cost(cur, nid)
+                if ng < g.get(nid, float('inf')):
+                    g[nid] = ng
+                    came_from[nid] = cur
+                    heapq.heappush(heap, (ng + self._h(nid, goal_pos), nid))
+        return None
+
+    def _h(self, wid, goal_pos):
+        p = self.store.position(wid)
+        dx = p['x'] - goal_pos['x']
+        dy = p['y'] - goal_pos['y']
+        return math.sqrt(dx * dx + dy * dy)
+
+    def plan(self, start, goal):
+        if start in self.blocked or goal in self.blocked:
+            return None
+        if start == goal:
+            return HierarchicalPath(self, [start])
+
+        start_rid = self.region_of[start]
+        goal_rid = self.region_of[goal]
+
+        # Same region: a local search is usually enough
+        if start_rid == goal_rid:
+            local = self.local_path(start, goal)
+            if local is not None:
+                return HierarchicalPath(self, [start, goal], ids=local)
+
+        # Temporary edges from start to its region's entrances and from the
+        # goal region's entrances to the goal
+        start_edges = self._dijkstra(start, start_rid)
+        goal_dist = self._dijkstra(goal, goal_rid)
+        goal_entries = {e: goal_dist[e] for e in self.entrances[goal_rid] if e in goal_dist}
+
+        goal_pos = self.store.position(goal)
+        g = {start: 0.0}
+        came_from = {}
+        heap = [(self._h(start, goal_pos), start)]
+        while heap:
+            _, cur = heapq.heappop(heap)
+            if cur == goal:
+                abstract = [cur]
+                while cur in came_from:
+                    cur = came_from[cur]
+                    abstract.append(cur)
+                return HierarchicalPath(self, abstract[::-1])
+
+            if cur == start:
+                edges = [(e, start_edges[e]) for e in self.entrances[start_rid] if e in start_edges and e != start]
+                if start in self.entrances[start_rid]:
+                    edges += self.inter.get(start, [])
+            else:
+                edges = self.intra[self.region_of[cur]].get(cur, []) + self.inter.get(cur, [])
+            if cur in goal_entries:
+                edges = edges + [(goal, goal_entries[cur])]
+
+            for nid, cost in edges:
+                if nid in self.blocked:
+                    continue
+                ng = g[cur] + cost
+                if ng < g.get(nid, float('inf')):
+                    g[nid] = ng
+                    came_from[nid] = cur
+                    heapq.heappush(heap, (ng + self._h(nid, goal_pos), nid))
+        return None
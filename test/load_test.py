@@ -0,0 +1,308 @@
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from datetime import datetime
+
+import requests
+
+import binary_protocol
+
+# Load generator for the OpenClaw API. Virtual clients replay the request
+# patterns of the scripts in this folder:
+#   agent    final_agent.py tick: task, position (about half the ticks, the
+#            motion estimator skips the rest), move; nearest/interact now and then
+#   monitor  test_progress.py style: status, task and position a few times a second
+#   planner  /api/path queries, plus the occasional full waypoint download
+# Each step of --clients runs for --duration seconds; per-route throughput,
+# latency percentiles and error codes go to a JSON file that --compare can
+# diff against an earlier run.
+#   python load_test.py --clients 1,4,16,32 --duration 20
+#   python load_test.py --clients 8 --mix agent=3,monitor=1 --rate 400
+#   python load_test.py --compare before.json after.json
+
+MIXES = ("agent", "monitor", "planner")
+PERCENTILES = (50, 90, 95, 99)
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.routes = {}
+
+    def add(self, route, latency, code):
+        with self.lock:
+            entry = self.routes.get(route)
+            if entry is None:
+                entry = self.routes[route] = {"latencies": [], "errors": {}}
+            entry["latencies"].append(latency)
+            if code is not None:
+                entry["errors"][code] = entry["errors"].get(code, 0) + 1
+
+
+class RateLimiter:
+    # Open-loop cap on the total request rate, shared by every client
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.lock = threading.Lock()
+        self.next_slot = time.perf_counter()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.perf_counter()
+            slot = max(self.next_slot, now)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class Client(threading.Thread):
+    def __init__(self, base_url, kind, recorder, limiter, stop, tick, timeout, binary, commands, seed):
+        super().__init__(daemon=True)
+        self.base_url = base_url
+        self.kind = kind
+        self.recorder = recorder
+        self.limiter = limiter
+        self.stop = stop
+        self.tick = tick
+        self.timeout = timeout
+        self.binary = binary
+        self.commands = commands
+        self.random = random.Random(seed)
+        self.session = requests.Session()
+        self.waypoint_ids = []
+
+    def request(self, endpoint, method="GET", body=None):
+        self.limiter.wait()
+        path = endpoint.split("?", 1)[0]
+        route = f"{method} {path}"
+        headers = {"Accept": f"{binary_protocol.ACCEPT}, application/json"} if self.binary and method == "GET" else None
+        code = None
+        data = None
+        start = time.perf_counter()
+        try:
+            if method == "POST":
+                resp = self.session.post(f"{self.base_url}{endpoint}", json=body, timeout=self.timeout)
+            else:
+                resp = self.session.get(f"{self.base_url}{endpoint}", headers=headers, timeout=self.timeout)
+            if resp.status_code != 200:
+                code = f"HTTP_{resp.status_code}"
+            else:
+                data = binary_protocol.decode(resp.content) if binary_protocol.is_binary(resp) else resp.json()
+                if not data.get("success"):
+                    error = data.get("error") or {}
+                    # The main thread timeout gets its own bucket; it is what this tool is hunting
+                    code = "REQUEST_TIMEOUT" if error.get("details") == "Request timeout" else error.get("code")
+        except requests.Timeout:
+            code = "CLIENT_TIMEOUT"
+        except requests.ConnectionError:
+            code = "CONNECTION_ERROR"
+        except (requests.RequestException, ValueError) as e:
+            code = type(e).__name__
+        self.recorder.add(route, time.perf_counter() - start, code)
+        return data if code is None else None
+
+    def run(self):
+        # Spread the clients' ticks out instead of firing in lockstep
+        time.sleep(self.random.uniform(0, self.tick))
+        while not self.stop.is_set():
+            start = time.perf_counter()
+            getattr(self, f"tick_{self.kind}")()
+            time.sleep(max(0.0, self.tick - (time.perf_counter() - start)))
+
+    def tick_agent(self):
+        self.request("/api/game/task")
+        if self.random.random() < 0.5:
+            self.request("/api/player/position")
+        if self.random.random() < 0.05:
+            x, y = self.random.uniform(-10, 10), self.random.uniform(-10, 10)
+            self.request(f"/api/waypoints/nearest?x={x:.2f}&y={y:.2f}")
+        if self.commands:
+            angle = self.random.uniform(0, 2 * math.pi)
+            self.request("/api/player/move", "POST", {"x": round(math.cos(angle), 3), "y": round(math.sin(angle), 3)})
+            if self.random.random() < 0.01:
+                self.request("/api/player/interact", "POST", {})
+
+    def tick_monitor(self):
+        self.request("/api/status")
+        self.request("/api/game/task")
+        self.request("/api/player/position")
+
+    def tick_planner(self):
+        if not self.waypoint_ids or self.random.random() < 0.02:
+            data = self.request("/api/waypoints/all")
+            if data:
+                waypoints = data["data"]["waypoints"]
+                if isinstance(waypoints, binary_protocol.WaypointArrays):
+                    self.waypoint_ids = waypoints.ids.tolist()
+                else:
+                    self.waypoint_ids = [wp["id"] for wp in waypoints]
+            return
+        self.request(f"/api/path?to={self.random.choice(self.waypoint_ids)}")
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in MIXES:
+            raise argparse.ArgumentTypeError(f"unknown client kind {name!r} (choose from {', '.join(MIXES)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def assign(mix, count):
+    # Deterministic split of count clients by weight, largest remainders first
+    total = sum(mix.values())
+    shares = {k: count * w / total for k, w in mix.items()}
+    kinds = {k: int(s) for k, s in shares.items()}
+    for k in sorted(shares, key=lambda k: shares[k] - kinds[k], reverse=True)[:count - sum(kinds.values())]:
+        kinds[k] += 1
+    return [k for k, n in kinds.items() for _ in range(n)]
+
+
+def percentile(ordered, p):
+    return ordered[min(len(ordered) - 1, int(p / 100.0 * len(ordered)))]
+
+
+def summarize(recorder, elapsed):
+    routes = {}
+    total = 0
+    failed = 0
+    for route, entry in sorted(recorder.routes.items()):
+        ordered = sorted(entry["latencies"])
+        count = len(ordered)
+        errors = sum(entry["errors"].values())
+        total += count
+        failed += errors
+        routes[route] = {
+            "count": count,
+            "rps": round(count / elapsed, 2),
+            "error_rate": round(errors / count, 4),
+            "errors": dict(sorted(entry["errors"].items())),
+            "mean_ms": round(sum(ordered) / count * 1000.0, 2),
+            "max_ms": round(ordered[-1] * 1000.0, 2),
+            **{f"p{p}_ms": round(percentile(ordered, p) * 1000.0, 2) for p in PERCENTILES},
+        }
+    return {"requests": total, "rps": round(total / elapsed, 2) if elapsed else 0.0,
+            "error_rate": round(failed / total, 4) if total else 0.0, "routes": routes}
+
+
+def server_health(base_url):
+    try:
+        return requests.get(f"{base_url}/api/health", timeout=2.0).json().get("data")
+    except (requests.RequestException, ValueError):
+        return None
+
+
+def run_step(args, clients):
+    recorder = Recorder()
+    limiter = RateLimiter(args.rate)
+    stop = threading.Event()
+    kinds = assign(args.mix, clients)
+    workers = [Client(args.base_url, kind, recorder, limiter, stop, args.tick if kind == "agent" else args.monitor_tick,
+                      args.timeout, args.binary, not args.reads_only, seed=args.seed * 1000 + i)
+               for i, kind in enumerate(kinds)]
+
+    before = server_health(args.base_url)
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    time.sleep(args.duration)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    step = {"clients": clients, "kinds": {k: kinds.count(k) for k in args.mix}, "seconds": round(elapsed, 2)}
+    step.update(summarize(recorder, elapsed))
+    step["health_before"] = before
+    step["health_after"] = server_health(args.base_url)
+    return step
+
+
+def print_step(step):
+    print(f"\n{step['clients']} clients {step['kinds']}: {step['requests']} requests, "
+          f"{step['rps']:.1f} req/s, errors {step['error_rate'] * 100:.2f}%")
+    print(f"  {'route':<28} {'req/s':>7} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7}  errors")
+    for route, r in step["routes"].items():
+        errors = ", ".join(f"{k}={v}" for k, v in r["errors"].items()) or "-"
+        print(f"  {route:<28} {r['rps']:>7.1f} {r['p50_ms']:>7.1f} {r['p95_ms']:>7.1f} "
+              f"{r['p99_ms']:>7.1f} {r['max_ms']:>7.1f}  {errors}")
+
+
+def compare(old_path, new_path):
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    old_steps = {s["clients"]: s for s in old["steps"]}
+    print(f"{old_path} -> {new_path}")
+    for step in new["steps"]:
+        before = old_steps.get(step["clients"])
+        if before is None:
+            continue
+        print(f"\n{step['clients']} clients: {before['rps']:.1f} -> {step['rps']:.1f} req/s, "
+              f"errors {before['error_rate'] * 100:.2f}% -> {step['error_rate'] * 100:.2f}%")
+        for route, r in step["routes"].items():
+            b = before["routes"].get(route)
+            if b is None:
+                continue
+            print(f"  {route:<28} p95 {b['p95_ms']:>7.1f} -> {r['p95_ms']:>7.1f} ms | "
+                  f"p99 {b['p99_ms']:>7.1f} -> {r['p99_ms']:>7.1f} ms | "
+                  f"errors {b['error_rate'] * 100:5.2f}% -> {r['error_rate'] * 100:5.2f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the OpenClaw API with realistic agent request mixes.")
+    parser.add_argument("--base-url", default="http://localhost:8091")
+    parser.add_argument("--clients", default="1,4,16", help="comma-separated client counts, one step each")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("agent=3,monitor=1"),
+                        help="client kinds and weights, e.g. agent=3,monitor=1,planner=1")
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per step")
+    parser.add_argument("--rate", type=float, default=0.0, help="cap on total requests per second (0 = none)")
+    parser.add_argument("--tick", type=float, default=0.1, help="agent tick interval (final_agent.py sleeps 0.1 s)")
+    parser.add_argument("--monitor-tick", type=float, default=0.5, help="monitor/planner tick interval")
+    parser.add_argument("--timeout", type=float, default=2.0, help="client-side request timeout")
+    parser.add_argument("--binary", action="store_true", help="ask for the binary encoding on GET routes")
+    parser.add_argument("--reads-only", action="store_true", help="don't send move/interact commands")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="results file (default load_test_<time>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two results files and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    if server_health(args.base_url) is None:
+        print(f"No server at {args.base_url}")
+        return
+
+    started = datetime.now()
+    steps = []
+    for clients in (int(c) for c in args.clients.split(",")):
+        step = run_step(args, clients)
+        print_step(step)
+        steps.append(step)
+
+    results = {
+        "base_url": args.base_url,
+        "started": started.isoformat(timespec="seconds"),
+        "config": {"mix": args.mix, "duration": args.duration, "rate": args.rate, "tick": args.tick,
+                   "monitor_tick": args.monitor_tick, "timeout": args.timeout, "binary": args.binary,
+                   "reads_only": args.reads_only, "seed": args.seed},
+        "steps": steps,
+    }
+    output = args.output or f"load_test_{started:%Y%m%d_%H%M%S}.json"
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nSaved {output}")
+
+
+if __name__ == "__main__":
+    main()
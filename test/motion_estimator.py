@@ -0,0 +1,158 @@
+from geometry import get_dist
+
+# Dead reckoning for the player: learns the effective speed from observed
+# position deltas under the last commanded move vector, predicts the
+# position between /api/player/position polls and tells the agent when a
+# real update is needed.
+
+
+class MotionEstimator:
+    def __init__(self, max_uncertainty=0.25, max_poll_interval=0.5,
+                 speed_smoothing=0.3, error_smoothing=0.3, initial_error_rate=0.5):
+        self.max_uncertainty = max_uncertainty
+        self.max_poll_interval = max_poll_interval
+        self.speed_smoothing = speed_smoothing
+        self.error_smoothing = error_smoothing
+
+        self.speed = None              # units per second at full stick
+        self.error_rate = initial_error_rate  # prediction drift, units per second
+
+        self.command_vec = (0.0, 0.0)
+        self.command_time = None
+
+        # Commanded displacement (sum of command * dt) since the last
+        # observation; the learned speed scales this onto the real delta
+        self.cmd_integral = [0.0, 0.0]
+
+        # Last real observation
+        self.obs_pos = None
+        self.obs_time = None
+
+        # Prediction anchor, moved forward whenever the command changes
+        self.anchor_pos = None
+        self.anchor_time = None
+        self.anchor_sigma = 0.0
+
+        # Accuracy / savings stats
+        self.polls = 0
+        self.skipped_polls = 0
+        self.scored = 0
+        self.error_sum = 0.0
+        self.error_max = 0.0
+
+    def reset(self):
+        # Keep the learned speed, drop everything tied to the old position
+        self.obs_pos = None
+        self.obs_time = None
+        self.anchor_pos = None
+        self.anchor_time = None
+        self.anchor_sigma = 0.0
+        self.command_vec = (0.0, 0.0)
+        self.command_time = None
+        self.cmd_integral = [0.0, 0.0]
+
+    def _velocity(self):
+        if self.speed is None:
+            return 0.0, 0.0
+        return self.speed * self.command_vec[0], self.speed * self.command_vec[1]
+
+    def predict(self, now):
+        if self.anchor_pos is None:
+            return None
+        dt = max(0.0, now - self.anchor_time)
+        vx, vy = self._velocity()
+        return {
+            'x': self.anchor_pos['x'] + vx * dt,
+            'y': self.anchor_pos['y'] + vy * dt,
+            'z': self.anchor_pos.get('z', 0.0),
+        }
+
+    def uncertainty(self, now):
+        if self.anchor_pos is None or self.speed is None:
+            return float('inf')
+        dt = max(0.0, now - self.anchor_time)
+        return self.anchor_sigma + self.error_rate * dt
+
+    def _integrate(self, now):
+        since = self.command_time
+        if self.obs_time is not None and (since is None or since < self.obs_time):
+            since = self.obs_time
+        if since is not None and now > since:
+            self.cmd_integral[0] += self.command_vec[0] * (now - since)
+            self.cmd_integral[1] += self.command_vec[1] * (now - since)
+
+    def command(self, x, y, now):
+        # Roll the prediction forward to the moment the command changes so the
+        # old vector is applied up to now and the new one after
+        self._integrate(now)
+        if self.anchor_pos is not None:
+            self.anchor_pos = self.predict(now)
+            self.anchor_sigma = self.uncertainty(now)
+            self.anchor_time = now
+        self.command_vec = (max(-1.0, min(1.0, x)), max(-1.0, min(1.0, y)))
+        self.command_time = now
+
+    def observe(self, pos, now):
+        self.polls += 1
+
+        if self.obs_pos is not None and now > self.obs_time:
+            dt = now - self.obs_time
+
+            predicted = self.predict(now)
+            if predicted is not None and self.speed is not None:
+                err = get_dist(predicted, pos)
+                self.scored += 1
+                self.error_sum += err
+                self.error_max = max(self.error_max, err)
+                self.error_rate += self.error_smoothing * (err / dt - self.error_rate)
+
+            # Fit speed so that speed * commanded displacement matches the
+            # observed delta (projected on the commanded direction)
+            self._integrate(now)
+            sx, sy = self.cmd_integral
+            s2 = sx * sx + sy * sy
+            if s2 > 1e-6:
+                along = ((pos['x'] - self.obs_pos['x']) * sx + (pos['y'] - self.obs_pos['y']) * sy) / s2
+                along = max(0.0, along)
+                if self.speed is None:
+                    self.speed = along
+                else:
+                    self.speed += self.speed_smoothing * (along - self.speed)
+
+        self.cmd_integral = [0.0, 0.0]
+        self.obs_pos = pos
+        self.obs_time = now
+        self.anchor_pos = pos
+        self.anchor_time = now
+        self.anchor_sigma = 0.0
+
+    def needs_update(self, now, checkpoints=()):
+        # checkpoints: (position, radius) pairs the agent reacts to, such as
+        # the next path node or the interaction range of a key/door. A poll is
+        # forced whenever we might already be inside one of them.
+        if self.obs_time is None or self.speed is None:
+            return True
+        if now - self.obs_time >= self.max_poll_interval:
+            return True
+        sigma = self.uncertainty(now)
+        if sigma > self.max_uncertainty:
+            return True
+        predicted = self.predict(now)
+        for point, radius in checkpoints:
+            if point is not None and get_dist(predicted, point) - sigma <= radius:
+                return True
+        return False
+
+    def skip(self):
+        self.skipped_polls += 1
+
+    def report(self):
+        total = self.polls + self.skipped_polls
+        return {
+            'polls': self.polls,
+            'skipped': self.skipped_polls,
+            'poll_ratio': self.polls / total if total else 1.0,
+            'mean_error': self.error_sum / self.scored if self.scored else 0.0,
+            'max_error': self.error_max,
+            'speed': self.speed,
+        }
@@ -0,0 +1,374 @@
+import argparse
+import heapq
+import json
+import math
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Local stand-in for the OpenClaw API, for running the agents and
+# load_test.py without Unity. One grid level: a wall down the middle with a
+# single gap, a door in the gap and a key on the near side. Requests are
+# served like the real server: every handler is queued for a simulated main
+# thread that drains the queue once per frame, and a request that waits
+# longer than 200 ms gets INTERNAL_ERROR "Request timeout".
+#   python standin_server.py --port 8091 --fps 60
+
+SPEED = 3.0
+INTERACT_RADIUS = 1.2
+MAIN_THREAD_TIMEOUT = 0.2
+
+
+class Level:
+    def __init__(self, width, height, door=True):
+        self.width = width
+        self.height = height
+        self.wall_x = width // 2
+        self.gap_y = height - 2
+        self.with_door = door
+        self.waypoints = {}
+        for y in range(height):
+            for x in range(width):
+                if x != self.wall_x or y == self.gap_y:
+                    self.waypoints[self.wid(x, y)] = (float(x), float(y))
+        self.chapter = 1
+        self.level = 1
+        self.reset()
+
+    def wid(self, x, y):
+        return y * self.width + x
+
+    def connections(self, i):
+        x, y = (int(c) for c in self.waypoints[i])
+        out = []
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            j = self.wid(x + dx, y + dy)
+            if 0 <= x + dx < self.width and 0 <= y + dy < self.height and j in self.waypoints:
+                out.append(j)
+        return out
+
+    def reset(self):
+        self.pos = [0.0, 0.0]
+        self.vel = [0.0, 0.0]
+        self.updated = time.time()
+        self.keys = [[2.0, self.height - 1.0]] if self.with_door else []
+        self.doors = [[float(self.wall_x), float(self.gap_y)]] if self.with_door else []
+        self.keys_obtained = 0
+        self.exit = [self.width - 1.0, 0.0]
+        self.completed_at = None
+
+    @property
+    def name(self):
+        return f"Level_{self.chapter}_{self.level}"
+
+    def door_waypoints(self):
+        return {self.wid(int(d[0]), int(d[1])) for d in self.doors}
+
+    def walkable(self, x, y):
+        cx, cy = round(x), round(y)
+        if not (0 <= cx < self.width and 0 <= cy < self.height):
+            return False
+        i = self.wid(cx, cy)
+        return i in self.waypoints and i not in self.door_waypoints()
+
+    def update(self):
+        # Integrate movement since the last frame, in small steps so walls hold
+        now = time.time()
+        dt = now - self.updated
+        self.updated = now
+        for _ in range(10):
+            nx = self.pos[0] + self.vel[0] * SPEED * dt / 10
+            ny = self.pos[1] + self.vel[1] * SPEED * dt / 10
+            if self.walkable(nx, self.pos[1]):
+                self.pos[0] = nx
+            if self.walkable(self.pos[0], ny):
+                self.pos[1] = ny
+        if self.completed_at is None and math.dist(self.exit, self.pos) < 0.5:
+            self.completed_at = now
+        if self.completed_at is not None and now - self.completed_at > 3.0:
+            self.level += 1
+            self.reset()
+
+    def interact(self):
+        for key in list(self.keys):
+            if math.dist(key, self.pos) < INTERACT_RADIUS:
+                self.keys.remove(key)
+                self.keys_obtained += 1
+        if self.keys_obtained > 0:
+            for door in list(self.doors):
+                if math.dist(door, self.pos) < INTERACT_RADIUS:
+                    self.doors.remove(door)
+                    self.keys_obtained -= 1
+
+    def waypoint(self, i, origin):
+        x, y = self.waypoints[i]
+        return {"id": i, "position": v3((x, y)), "connectedIds": self.connections(i),
+                "distance": math.dist((x, y), origin)}
+
+    def nearest(self, x, y, excluded=()):
+        candidates = [i for i in self.waypoints if i not in excluded] or list(self.waypoints)
+        return min(candidates, key=lambda i: math.dist(self.waypoints[i], (x, y)))
+
+    def path(self, start, goal):
+        # Same rules as /api/path: door waypoints only as endpoints
+        blocked = self.door_waypoints()
+        g = {start: 0.0}
+        came_from = {}
+        open_set = [(0.0, start)]
+        closed = set()
+        while open_set:
+            _, current = heapq.heappop(open_set)
+            if current in closed:
+                continue
+            if current == goal:
+                ids = [current]
+                while current in came_from:
+                    current = came_from[current]
+                    ids.append(current)
+                return ids[::-1], g[goal]
+            closed.add(current)
+            for n in self.connections(current):
+                if n in closed or (n in blocked and n != goal):
+                    continue
+                d = g[current] + math.dist(self.waypoints[current], self.waypoints[n])
+                if d < g.get(n, math.inf):
+                    g[n] = d
+                    came_from[n] = current
+                    heapq.heappush(open_set, (d + math.dist(self.waypoints[n], self.waypoints[goal]), n))
+        return [], -1.0
+
+
+def v3(p):
+    return {"x": p[0], "y": p[1], "z": 0.0}
+
+
+def ok(data):
+    return {"success": True, "data": data, "error": None, "timestamp": ""}
+
+
+def error(code, message, details=None):
+    return {"success": False, "data": None, "error": {"code": code, "message": message, "details": details},
+            "timestamp": ""}
+
+
+class MainThread(threading.Thread):
+    # Stand-in for Unity's main thread: runs queued handlers once per frame,
+    # commands before reads, like UnityMainThreadDispatcher
+    def __init__(self, level, fps, action_cost):
+        super().__init__(daemon=True)
+        self.level = level
+        self.frame = 1.0 / fps
+        self.action_cost = action_cost
+        self.queues = (queue.SimpleQueue(), queue.SimpleQueue())
+        self.lock = threading.Lock()
+        self.executed = 0
+        self.timeouts = 0
+        self.skipped = 0
+        self.started = time.time()
+
+    def run(self):
+        while True:
+            start = time.perf_counter()
+            self.level.update()
+            for q in self.queues:
+                while not q.empty():
+                    job = q.get()
+                    if not job.start():
+                        with self.lock:
+                            self.skipped += 1
+                        continue
+                    if self.action_cost:
+                        time.sleep(self.action_cost)
+                    job.run()
+                    with self.lock:
+                        self.executed += 1
+            time.sleep(max(0.0, self.frame - (time.perf_counter() - start)))
+
+    def execute(self, fn, command=False):
+        job = _Job(fn)
+        self.queues[0 if command else 1].put(job)
+        if not job.done.wait(MAIN_THREAD_TIMEOUT) and job.abandon():
+            with self.lock:
+                self.timeouts += 1
+            return error("INTERNAL_ERROR", "An internal server error occurred", "Request timeout")
+        job.done.wait()
+        return job.result
+
+    def metrics(self):
+        with self.lock:
+            return {"commandQueueDepth": self.queues[0].qsize(), "readQueueDepth": self.queues[1].qsize(),
+                    "executed": self.executed, "timeouts": self.timeouts, "skippedAfterTimeout": self.skipped}
+
+
+class _Job:
+    def __init__(self, fn):
+        self.fn = fn
+        self.done = threading.Event()
+        self.state = 0  # 0 queued, 1 started, 2 abandoned
+        self.lock = threading.Lock()
+        self.result = None
+
+    def start(self):
+        with self.lock:
+            if self.state:
+                return False
+            self.state = 1
+            return True
+
+    def abandon(self):
+        with self.lock:
+            if self.state:
+                return False
+            self.state = 2
+            return True
+
+    def run(self):
+        try:
+            self.result = self.fn()
+        except Exception as e:
+            self.result = error("INTERNAL_ERROR", "An internal server error occurred", str(e))
+        self.done.set()
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def reply(self, obj):
+        body = json.dumps(obj).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        main = self.server.main
+        level = main.level
+
+        if url.path == "/api/health":
+            return self.reply(ok({"status": "healthy", "serverVersion": "standin", "port": self.server.server_port,
+                                  "uptime": f"{time.time() - main.started:.0f}s", "dispatcher": main.metrics()}))
+
+        def status():
+            return ok({"isPlaying": True, "sceneName": "Gameplay", "playerExists": True, "gameTime": 0.0,
+                       "chapter1Progress": 3, "chapter2Progress": 1, "currentLevel": level.name})
+
+        def position():
+            return ok({"position": v3(level.pos), "faceDir": v3((1.0, 0.0))})
+
+        def task():
+            return ok({"taskDescription": "Find the exit", "targetPosition": v3(level.exit),
+                       "distanceToTarget": math.dist(level.exit, level.pos),
+                       "isCompleted": level.completed_at is not None,
+                       "keysPositions": [v3(k) for k in level.keys], "doorsPositions": [v3(d) for d in level.doors],
+                       "keysObtained": level.keys_obtained, "currentLevel": level.name})
+
+        def all_waypoints():
+            wps = [level.waypoint(i, level.pos) for i in level.waypoints]
+            return ok({"waypoints": wps, "totalCount": len(wps)})
+
+        def nearby():
+            wps = [level.waypoint(i, level.pos) for i in level.waypoints
+                   if math.dist(level.waypoints[i], level.pos) <= 1.5]
+            wps.sort(key=lambda w: w["distance"])
+            return ok({"waypoints": wps, "totalCount": len(wps)})
+
+        def nearest():
+            x, y = float(query.get("x", 0)), float(query.get("y", 0))
+            wp = level.waypoint(level.nearest(x, y), (x, y))
+            return ok({"waypoint": wp, "distance": wp["distance"]})
+
+        def path():
+            blocked = level.door_waypoints()
+
+            def resolve(prefix, default):
+                if prefix in query:
+                    return int(query[prefix])
+                if f"{prefix}X" in query:
+                    return level.nearest(float(query[f"{prefix}X"]), float(query[f"{prefix}Y"]), blocked)
+                return default
+
+            goal = resolve("to", None)
+            if goal is None:
+                return error("MISSING_PARAMETER", "Required parameter is missing", "to or toX/toY")
+            start = resolve("from", level.nearest(level.pos[0], level.pos[1], blocked))
+            if start not in level.waypoints or goal not in level.waypoints:
+                return error("INVALID_REQUEST", "Request body is invalid or malformed", "Unknown waypoint id")
+            ids, cost = level.path(start, goal)
+            return ok({"found": bool(ids), "startId": start, "goalId": goal, "waypointIds": ids,
+                       "positions": [v3(level.waypoints[i]) for i in ids], "cost": cost,
+                       "blockedIds": sorted(blocked), "cached": False})
+
+        routes = {"/api/status": status, "/api/player/position": position, "/api/game/task": task,
+                  "/api/waypoints/all": all_waypoints, "/api/waypoints/nearby": nearby,
+                  "/api/waypoints/nearest": nearest}
+        if url.path == "/api/path":
+            # Like the real route: graph snapshot on the main thread, search off it
+            return self.reply(path())
+        if url.path in routes:
+            return self.reply(main.execute(routes[url.path]))
+        self.reply(error("ROUTE_NOT_FOUND", f"No handler found for GET {url.path}"))
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+        level = self.server.main.level
+
+        def move():
+            level.vel = [max(-1.0, min(1.0, float(body.get("x", 0)))), max(-1.0, min(1.0, float(body.get("y", 0))))]
+            return ok({"executed": True, "message": "Move command executed"})
+
+        def interact():
+            level.interact()
+            return ok({"executed": True, "message": "Interaction triggered"})
+
+        def restart():
+            level.reset()
+            return ok({"executed": True, "message": "Level restarted"})
+
+        def load():
+            level.chapter, level.level = int(body.get("chapter", 1)), int(body.get("level", 1))
+            level.reset()
+            return ok({"executed": True, "message": f"Loading level {level.chapter}-{level.level}"})
+
+        routes = {"/api/player/move": move, "/api/player/interact": interact,
+                  "/api/player/restart": restart, "/api/player/level": load}
+        if url.path in routes:
+            return self.reply(self.server.main.execute(routes[url.path], command=True))
+        self.reply(error("ROUTE_NOT_FOUND", f"No handler found for POST {url.path}"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the OpenClaw API server.")
+    parser.add_argument("--port", type=int, default=8091)
+    parser.add_argument("--width", type=int, default=20)
+    parser.add_argument("--height", type=int, default=12)
+    parser.add_argument("--no-door", action="store_true", help="level without key and door")
+    parser.add_argument("--fps", type=float, default=60.0, help="simulated main thread frame rate")
+    parser.add_argument("--action-cost-ms", type=float, default=0.0,
+                        help="main thread time each request costs")
+    args = parser.parse_args()
+
+    level = Level(args.width, args.height, door=not args.no_door)
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), Handler)
+    server.daemon_threads = True
+    server.main = MainThread(level, args.fps, args.action_cost_ms / 1000.0)
+    server.main.start()
+    print(f"Stand-in server on http://127.0.0.1:{args.port} ({len(level.waypoints)} waypoints)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
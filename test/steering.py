@@ -0,0 +1,197 @@
+import math
+
+from geometry import get_dist
+
+# Pure-pursuit path follower. Instead of aiming at the next waypoint and
+# switching once within 0.8 of it (a stop-and-turn at every node), the
+# agent aims at a point a lookahead distance further along the path
+# polyline. The lookahead grows with the learned speed, is shortened at
+# corners so the chord doesn't cut through them by more than
+# corner_tolerance, and the commanded direction is blended with the last
+# one so turns are spread over a few ticks. After the last waypoint the
+# path continues to the goal itself (key, door, exit), so the agent runs
+# into the interaction radius instead of stopping at the last node.
+
+
+def _lerp(a, b, t):
+    return {'x': a['x'] + (b['x'] - a['x']) * t, 'y': a['y'] + (b['y'] - a['y']) * t}
+
+
+def _line_distance(p, a, b):
+    # Distance from p to segment a-b
+    dx = b['x'] - a['x']
+    dy = b['y'] - a['y']
+    length_sq = dx * dx + dy * dy
+    if length_sq == 0.0:
+        return get_dist(p, a)
+    t = ((p['x'] - a['x']) * dx + (p['y'] - a['y']) * dy) / length_sq
+    return get_dist(p, _lerp(a, b, max(0.0, min(1.0, t))))
+
+
+def _project(path, pos):
+    # Segment index and t of the closest point on the path polyline; the
+    # list counterpart of WaypointStore.project_on_path
+    best, best_d = (0, 0.0), float('inf')
+    for k in range(len(path) - 1):
+        a, b = path[k], path[k + 1]
+        dx = b['x'] - a['x']
+        dy = b['y'] - a['y']
+        length_sq = dx * dx + dy * dy
+        t = 0.0 if length_sq == 0.0 else max(0.0, min(1.0, ((pos['x'] - a['x']) * dx + (pos['y'] - a['y']) * dy) / length_sq))
+        d = get_dist(pos, _lerp(a, b, t))
+        if d < best_d:
+            best, best_d = (k, t), d
+    return best
+
+
+class PurePursuit:
+    def __init__(self, min_lookahead=0.6, max_lookahead=2.0, lookahead_time=0.35,
+                 corner_tolerance=0.3, blend=0.6, search_window=4, arrive_radius=0.5):
+        self.min_lookahead = min_lookahead
+        self.max_lookahead = max_lookahead
+        self.lookahead_time = lookahead_time    # seconds of travel to look ahead
+        self.corner_tolerance = corner_tolerance
+        self.blend = blend                      # weight of the new direction each tick
+        self.search_window = search_window      # segments searched for our progress
+        self.arrive_radius = arrive_radius      # how close counts as on the path's first point
+
+        self.path = []      # followed in place: extending the list extends the route
+        self.goal = None
+        self.index = 0      # next path point not yet passed; len(path) = on the way to goal
+        self.heading = None
+        self.lookahead = min_lookahead
+
+    def set_path(self, path, pos, goal=None, ids=None, store=None):
+        # ids/store: the path's waypoint ids and the WaypointStore holding
+        # them, so the resume search below runs as one batched projection
+        self.path = path
+        self.goal = goal
+        # Resume after the closest point on the polyline; before the first
+        # point we head for it unless we're already on it
+        self.index = 0
+        if len(path) > 1:
+            if ids is not None and store is not None:
+                k, t, _, _ = store.project_on_path(ids, pos)
+            else:
+                k, t = _project(path, pos)
+            if k > 0 or t > 0.0 or get_dist(pos, path[0]) < self.arrive_radius:
+                self.index = k + 1
+
+    def clear(self):
+        self.path = []
+        self.goal = None
+        self.index = 0
+
+    @property
+    def active(self):
+        return bool(self.path) and self.index < self._count()
+
+    def _count(self):
+        return len(self.path) + (1 if self.goal is not None else 0)
+
+    def _point(self, i):
+        return self.path[i] if i < len(self.path) else self.goal
+
+    def _advance(self, pos):
+        # Progress is the segment (index-1 -> index) closest to us, searched a
+        # few segments ahead so a path that doubles back isn't skipped
+        count = self._count()
+        approach = None
+        if self.index == 0:
+            # Not on the path yet: head for its first point, unless we're
+            # already nearer one of the segments after it
+            approach = get_dist(pos, self._point(0))
+            if approach < self.arrive_radius:
+                approach = None
+                self.index = 1
+                if self.index >= count:
+                    return 1.0
+            elif count == 1:
+                return 0.0
+        first = max(1, self.index)
+        best, best_d, best_t = first, float('inf'), 0.0
+        for i in range(first, min(count, first + self.search_window)):
+            a = self._point(i - 1)
+            b = self._point(i)
+            dx = b['x'] - a['x']
+            dy = b['y'] - a['y']
+            length_sq = dx * dx + dy * dy
+            t = 1.0 if length_sq == 0.0 else max(0.0, min(1.0, ((pos['x'] - a['x']) * dx + (pos['y'] - a['y']) * dy) / length_sq))
+            d = get_dist(pos, _lerp(a, b, t))
+            if d < best_d:
+                best, best_d, best_t = i, d, t
+        if approach is not None and approach <= best_d:
+            return 0.0
+        # The last point counts as passed only for waypoints; the goal is
+        # chased until the caller says we've arrived
+        if best_t >= 1.0 and (self.goal is None or best + 1 < count):
+            self.index = best + 1
+            return 0.0
+        self.index = best
+        return best_t
+
+    def _lookahead_point(self, pos, t):
+        # Walk self.lookahead along the polyline from our projection on it
+        count = self._count()
+        a = self._point(self.index - 1) if self.index > 0 else pos
+        b = self._point(self.index)
+        start = _lerp(a, b, t)
+        remaining = self.lookahead
+        corners = []
+        i = self.index
+        while True:
+            b = self._point(i)
+            seg = get_dist(start, b)
+            if seg >= remaining:
+                target = _lerp(start, b, remaining / seg)
+                break
+            remaining -= seg
+            if i + 1 >= count:
+                return b
+            corners.append(b)
+            start = b
+            i += 1
+
+        # Pull the point back along its segment until no corner we'd cut is
+        # more than corner_tolerance off the chord
+        if corners and any(_line_distance(c, pos, target) > self.corner_tolerance for c in corners):
+            lo, hi = 0.0, 1.0
+            for _ in range(8):
+                mid = (lo + hi) / 2
+                probe = _lerp(start, target, mid)
+                if any(_line_distance(c, pos, probe) > self.corner_tolerance for c in corners):
+                    hi = mid
+                else:
+                    lo = mid
+            target = _lerp(start, target, lo)
+        return target
+
+    def steer(self, pos, speed=None):
+        # Unit move direction for this tick, or None with nothing to follow
+        if not self.active:
+            return None
+        t = self._advance(pos)
+        if not self.active:
+            return None
+
+        travel = (speed or 0.0) * self.lookahead_time
+        self.lookahead = max(self.min_lookahead, min(self.max_lookahead, self.min_lookahead + travel))
+        target = self._lookahead_point(pos, t)
+
+        dx = target['x'] - pos['x']
+        dy = target['y'] - pos['y']
+        mag = math.sqrt(dx * dx + dy * dy)
+        if mag == 0.0:
+            return self.heading
+        desired = (dx / mag, dy / mag)
+
+        # Blend with the last heading; a near reversal is taken at once
+        # rather than steered through a slow arc
+        if self.heading is not None and desired[0] * self.heading[0] + desired[1] * self.heading[1] > -0.5:
+            hx = self.heading[0] + self.blend * (desired[0] - self.heading[0])
+            hy = self.heading[1] + self.blend * (desired[1] - self.heading[1])
+            mag = math.sqrt(hx * hx + hy * hy)
+            if mag > 1e-6:
+                desired = (hx / mag, hy / mag)
+        self.heading = desired
+        return desired
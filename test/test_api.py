@@ -1,19 +1,143 @@
-import requests
-import time
+import argparse
+import json
 import os
-import platform
+import select
+import shutil
+import socket
+import sys
 import threading
-import msvcrt
-import json
+import time
+
+import requests
+
+from agent_ctl import DEFAULT_SOCKET, send
+
+# Live terminal monitor with keyboard control. State comes from the agent
+# daemon's watch feed (agent_daemon.py), which already knows the task,
+# position and the agent's own timings, so watching adds no load on the
+# game server. Without a daemon it falls back to one poll of status, task
+# and position a second. Only the lines that changed are rewritten (ANSI
+# cursor moves, no clear-screen), and keys are read without blocking:
+# termios/select on Linux and macOS, msvcrt on Windows.
+#   python test_api.py
+#   python test_api.py --socket /tmp/agentpath-agent.sock
 
 BASE_URL = "http://localhost:8091"
 
+WATCH_INTERVAL = 0.25        # daemon feed rate
+FALLBACK_POLL_INTERVAL = 1.0
+DAEMON_RETRY_INTERVAL = 5.0  # while polling, look for a daemon this often
+FRAME_INTERVAL = 0.1         # longest wait for a key before checking for new state
+
+# key -> (endpoint, body) sent to the game server
+COMMANDS = {
+    'w': ("/api/player/move", {"x": 0, "y": 1}),
+    's': ("/api/player/move", {"x": 0, "y": -1}),
+    'a': ("/api/player/move", {"x": -1, "y": 0}),
+    'd': ("/api/player/move", {"x": 1, "y": 0}),
+    ' ': ("/api/player/move", {"x": 0, "y": 0}),
+    'e': ("/api/player/interact", {}),
+    'r': ("/api/player/restart", {}),
+    'm': ("/api/player/main", {}),
+    'l': ("/api/player/level", {"chapter": 1, "level": 1}),
+}
+# key -> command for the agent daemon
+DAEMON_COMMANDS = {
+    'p': {"cmd": "play"},
+    'x': {"cmd": "stop"},
+}
+
+
+class Screen:
+    # Keeps what is on the terminal and rewrites only the lines that differ
+    def __init__(self, out=sys.stdout):
+        self.out = out
+        self.lines = []
+        self.size = None
+
+    def open(self):
+        if os.name == "nt":
+            _enable_windows_ansi()
+        # Alternate screen, cursor hidden
+        self.out.write("\x1b[?1049h\x1b[?25l\x1b[2J")
+        self.out.flush()
+
+    def close(self):
+        self.out.write("\x1b[?25h\x1b[?1049l")
+        self.out.flush()
+
+    def draw(self, lines):
+        size = shutil.get_terminal_size()
+        parts = []
+        if size != self.size:
+            # Resized: everything may have wrapped differently
+            self.size = size
+            self.lines = []
+            parts.append("\x1b[2J")
+        lines = [line[:size.columns - 1] for line in lines[:size.lines]]
+        for row, line in enumerate(lines):
+            if row >= len(self.lines) or self.lines[row] != line:
+                parts.append(f"\x1b[{row + 1};1H{line}\x1b[K")
+        if len(lines) < len(self.lines):
+            parts.append(f"\x1b[{len(lines) + 1};1H\x1b[J")
+        self.lines = lines
+        if parts:
+            self.out.write("".join(parts))
+            self.out.flush()
+
+
+def _enable_windows_ansi():
+    # Windows 10+ consoles understand ANSI once virtual terminal processing is on
+    import ctypes
+    kernel32 = ctypes.windll.kernel32
+    handle = kernel32.GetStdHandle(-11)
+    mode = ctypes.c_uint32()
+    if kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+        kernel32.SetConsoleMode(handle, mode.value | 0x0004)
+
+
+class KeyReader:
+    # Single key presses without Enter; read() waits at most timeout seconds
+    def __enter__(self):
+        if os.name == "nt":
+            import msvcrt
+            self.msvcrt = msvcrt
+        else:
+            import termios
+            import tty
+            self.termios = termios
+            self.fd = sys.stdin.fileno()
+            self.saved = termios.tcgetattr(self.fd)
+            tty.setcbreak(self.fd)
+        return self
+
+    def __exit__(self, *exc):
+        if os.name != "nt":
+            self.termios.tcsetattr(self.fd, self.termios.TCSADRAIN, self.saved)
+
+    def read(self, timeout):
+        if os.name == "nt":
+            deadline = time.time() + timeout
+            while not self.msvcrt.kbhit():
+                if time.time() >= deadline:
+                    return None
+                time.sleep(0.02)
+            return self.msvcrt.getwch().lower()
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return None
+        return os.read(self.fd, 1).decode(errors="ignore").lower() or None
+
+
 class OpenClawTerminal:
-    def __init__(self):
+    def __init__(self, socket_path=DEFAULT_SOCKET):
+        self.socket_path = socket_path
         self.session = requests.Session()
-        self.game_data = {}
-        self.is_running = True
         self.lock = threading.Lock()
+        self.frame = {}          # latest state, see _from_daemon / _from_server
+        self.source = "connecting"
+        self.message = ""
+        self.is_running = True
 
     def invoke(self, endpoint, method="GET", body=None):
         try:
@@ -24,106 +148,183 @@ class OpenClawTerminal:
                 resp = self.session.get(url, timeout=0.8)
             if resp.status_code == 200:
                 return resp.json()
-        except:
+        except (requests.RequestException, ValueError):
             pass
         return None
 
-    def update_loop(self):
+    # --- State feed ---------------------------------------------------------
+
+    def _publish(self, frame, source):
+        with self.lock:
+            self.frame = frame
+            self.source = source
+
+    def feed_loop(self):
         while self.is_running:
-            status = self.invoke("/api/status")           
-            pos = self.invoke("/api/player/position")     
-            task = self.invoke("/api/game/task")          
-            nearby = self.invoke("/api/waypoints/nearby") 
-
-            with self.lock:
-                self.game_data['status'] = status
-                self.game_data['pos'] = pos
-                self.game_data['task'] = task
-                self.game_data['nearby'] = nearby
-            time.sleep(0.4)
-
-    def draw_ui(self):
-        os.system('cls' if platform.system() == 'Windows' else 'clear')
-        
+            if hasattr(socket, "AF_UNIX") and os.path.exists(self.socket_path):
+                self._watch_daemon()
+            self._poll_server(DAEMON_RETRY_INTERVAL)
+
+    def _watch_daemon(self):
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(self.socket_path)
+                sock.sendall((json.dumps({"cmd": "watch", "interval": WATCH_INTERVAL}) + "\n").encode())
+                for line in sock.makefile("r"):
+                    if not self.is_running:
+                        return
+                    self._publish(self._from_daemon(json.loads(line)), "daemon")
+        except (OSError, ValueError):
+            pass
+
+    def _poll_server(self, duration):
+        deadline = time.time() + duration
+        while self.is_running and time.time() < deadline:
+            started = time.time()
+            game = {}
+            for name, endpoint in (("status", "/api/status"), ("task", "/api/game/task"),
+                                   ("position", "/api/player/position")):
+                resp = self.invoke(endpoint)
+                game[name] = resp["data"] if resp and resp.get("success") else None
+            self._publish(self._from_server(game), "server poll" if game["status"] else "offline")
+            time.sleep(max(0.0, FALLBACK_POLL_INTERVAL - (time.time() - started)))
+
+    @staticmethod
+    def _from_server(game):
+        position = game.get("position") or {}
+        return {"status": game.get("status"), "task": game.get("task"), "position": position.get("position")}
+
+    @staticmethod
+    def _from_daemon(snapshot):
+        agent = snapshot.get("agent")
+        if agent:
+            frame = {"status": None, "task": agent.get("task"), "position": agent.get("position")}
+        else:
+            frame = OpenClawTerminal._from_server(snapshot.get("game") or {})
+        frame.update(daemon=snapshot.get("status"), agent=agent, last=snapshot.get("last"),
+                     http=snapshot.get("http"))
+        return frame
+
+    # --- Drawing ------------------------------------------------------------
+
+    def render(self):
         with self.lock:
-            task_resp = self.game_data.get('task')
-            is_done = False
-            key_count = 0
-            
-            if task_resp and task_resp.get("success"):
-                t_data = task_resp["data"]
-                is_done = t_data.get("is_completed", False)
-                key_count = t_data.get("key_count", 0) # 获取钥匙数量 
-
-            if is_done:
-                print("*" * 60)
-                print(" " * 18 + "!!! LEVEL COMPLETE !!!")
-                print("*" * 60)
+            frame = self.frame
+            source = self.source
+        task = frame.get("task") or {}
+        status = frame.get("status")
+        position = frame.get("position")
+        agent = frame.get("agent")
+        daemon = frame.get("daemon")
+
+        lines = []
+        if task.get("isCompleted"):
+            lines += ["*" * 60, " " * 18 + "!!! LEVEL COMPLETE !!!", "*" * 60]
+        else:
+            lines += ["=" * 60,
+                      f"  OPENCLAW MONITOR - {time.strftime('%H:%M:%S')} | KEYS: {task.get('keysObtained', 0)}"
+                      f" | FEED: {source}",
+                      "=" * 60]
+
+        if status:
+            lines.append(f"[LEVEL   ]: {status['currentLevel']} (Scene: {status['sceneName']})")
+            lines.append(f"[PROGRESS]: Ch1: {status['chapter1Progress']} | Ch2: {status['chapter2Progress']}")
+        elif agent:
+            lines.append(f"[LEVEL   ]: {agent.get('level')}")
+        if position:
+            lines.append(f"[PLAYER  ]: X: {position['x']:>6.2f} | Y: {position['y']:>6.2f}")
+        if task:
+            lines.append(f"[MISSION ]: {task.get('taskDescription', '')}")
+            keys = task.get("keysPositions") or []
+            doors = task.get("doorsPositions") or []
+            if keys:
+                key_list = ", ".join(f"(X:{k['x']:.1f}, Y:{k['y']:.1f})" for k in keys)
+                lines.append(f"[ACTIVE KEYS ]: {len(keys)} @ {key_list}")
+            if doors:
+                door_list = ", ".join(f"(X:{d['x']:.1f}, Y:{d['y']:.1f})" for d in doors)
+                lines.append(f"[ACTIVE DOORS]: {len(doors)} @ {door_list}")
+
+        if daemon is not None:
+            lines.append("-" * 60)
+            if agent:
+                current = daemon.get("current") or {}
+                rate = agent.get("tick_rate")
+                lines.append(f"[AGENT   ]: playing ({current.get('strategy')}) {agent.get('elapsed', 0):.1f}s | "
+                             f"target {agent.get('target')} at {agent.get('distance', 0):.2f} | "
+                             f"stuck {agent.get('stuck_events', 0)}")
+                lines.append(f"[TICKS   ]: {agent.get('ticks', 0)} @ {rate:.1f}/s" if rate else
+                             f"[TICKS   ]: {agent.get('ticks', 0)}")
+                last_ms = agent.get("plan_ms_last")
+                lines.append(f"[PLANNER ]: {agent.get('plans', 0)} plans, last "
+                             f"{last_ms if last_ms is not None else '-'} ms, total {agent.get('plan_ms_total', 0)} ms")
             else:
-                print("=" * 60)
-                print(f"  OPENCLAW MONITOR - {time.strftime('%H:%M:%S')} | KEYS: {key_count}") # UI 显示钥匙
-                print("=" * 60)
-
-            s_resp = self.game_data.get('status')
-            if s_resp and s_resp.get("success"):
-                s = s_resp["data"]
-                print(f"[LEVEL  ]: {s['currentLevel']} (Scene: {s['sceneName']})")
-                print(f"[PROGRESS]: Ch1: {s['chapter1Progress']} | Ch2: {s['chapter2Progress']}")
-
-            p_resp = self.game_data.get('pos')
-            if p_resp and p_resp.get("success"):
-                p = p_resp["data"]["position"]
-                print(f"[PLAYER ]: X: {p['x']:>6.2f} | Y: {p['y']:>6.2f}")
-
-            if task_resp and task_resp.get("success"):
-                t = task_resp["data"]
-                print(f"[MISSION]: {t['task_description']}") # 使用谷歌式命名 
-                
-                # 只显示处于激活状态的物件
-                keys = t.get("keys_positions", [])
-                doors = t.get("doors_positions", [])
-                
-                if keys:
-                    key_list = ", ".join([f"(X:{k['x']:.1f}, Y:{k['y']:.1f})" for k in keys])
-                    print(f"[ACTIVE KEYS ]: {len(keys)} @ {key_list}")
-                
-                if doors:
-                    door_list = ", ".join([f"(X:{d['x']:.1f}, Y:{d['y']:.1f})" for d in doors])
-                    print(f"[ACTIVE DOORS]: {len(doors)} @ {door_list}")
-
-        print("-" * 60)
-        print(" MOVEMENT: WASD | STOP: SPACE | INTERACT: E") # 提示交互键
-        print(" COMMANDS: R (Restart) | M (Main Menu) | L (Load 1-1) | Q (Quit)")
-        print("=" * 60)
+                last = frame.get("last")
+                summary = "none yet" if not last else (
+                    f"{last['levelName']} {'completed' if last['completed'] else last['reason']}"
+                    + (f" in {last['time_to_exit']:.1f}s" if last.get("time_to_exit") else ""))
+                lines.append(f"[AGENT   ]: idle ({daemon.get('strategy')}) | last play: {summary}")
+            http = frame.get("http") or {}
+            routes = http.get("routes") or {}
+            if routes:
+                lines.append(f"  {'route':<28} {'calls':>6} {'p50':>7} {'p99':>7}  errors"
+                             + ("  [breaker open]" if http.get("breaker_open") else ""))
+                for route, r in routes.items():
+                    # A route with no answered request yet has no percentiles
+                    p50 = r['p50_ms'] if r['p50_ms'] is not None else '-'
+                    p99 = r['p99_ms'] if r['p99_ms'] is not None else '-'
+                    lines.append(f"  {route:<28} {r['count']:>6} {p50:>7} {p99:>7}  {r['errors'] or '-'}")
+
+        lines.append("-" * 60)
+        lines.append(" MOVEMENT: WASD | STOP: SPACE | INTERACT: E")
+        lines.append(" COMMANDS: R (Restart) | M (Main Menu) | L (Load 1-1) | Q (Quit)")
+        if daemon is not None:
+            lines.append(" AGENT:    P (Play current level) | X (Stop)")
+        lines.append("=" * 60)
+        lines.append(self.message)
+        return lines
+
+    # --- Input --------------------------------------------------------------
+
+    def handle_key(self, key):
+        if key in COMMANDS:
+            endpoint, body = COMMANDS[key]
+            resp = self.invoke(endpoint, "POST", body)
+            self.message = f" {endpoint}: " + ("ok" if resp and resp.get("success") else "failed")
+        elif key in DAEMON_COMMANDS:
+            try:
+                reply = send(DAEMON_COMMANDS[key], self.socket_path, timeout=5.0)
+                self.message = f" agent {DAEMON_COMMANDS[key]['cmd']}: " + (
+                    "ok" if reply and reply.get("success") else (reply or {}).get("error", "failed"))
+            except OSError as e:
+                self.message = f" agent daemon not reachable: {e}"
 
     def run(self):
-        t = threading.Thread(target=self.update_loop)
+        t = threading.Thread(target=self.feed_loop)
         t.daemon = True
         t.start()
+        screen = Screen()
+        screen.open()
         try:
-            while self.is_running:
-                self.draw_ui()
-                if msvcrt.kbhit():
-                    key = msvcrt.getch().decode('utf-8').lower()
-                    # 基础移动
-                    if key == 'w': self.invoke("/api/player/move", "POST", {"x": 0, "y": 1})
-                    elif key == 's': self.invoke("/api/player/move", "POST", {"x": 0, "y": -1})
-                    elif key == 'a': self.invoke("/api/player/move", "POST", {"x": -1, "y": 0})
-                    elif key == 'd': self.invoke("/api/player/move", "POST", {"x": 1, "y": 0})
-                    elif key == ' ': self.invoke("/api/player/move", "POST", {"x": 0, "y": 0})
-                    
-                    # 交互指令
-                    elif key == 'e': self.invoke("/api/player/interact", "POST") 
-                    
-                    # 管理指令
-                    elif key == 'r': self.invoke("/api/player/restart", "POST")
-                    elif key == 'm': self.invoke("/api/player/main", "POST")
-                    elif key == 'l': self.invoke("/api/player/level", "POST", {"chapter": 1, "level": 1})
-                    
-                    elif key == 'q': break
-                time.sleep(0.1)
+            with KeyReader() as keys:
+                while self.is_running:
+                    key = keys.read(FRAME_INTERVAL)
+                    if key == 'q':
+                        break
+                    if key:
+                        self.handle_key(key)
+                    # Unchanged lines cost nothing: draw() only writes the diff
+                    screen.draw(self.render())
+        except KeyboardInterrupt:
+            pass
         finally:
             self.is_running = False
+            screen.close()
+
 
 if __name__ == "__main__":
-    OpenClawTerminal().run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Live monitor and keyboard control for the OpenClaw API.")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="agent daemon socket to take state from")
+    args = parser.parse_args()
+    BASE_URL = args.base_url
+    OpenClawTerminal(args.socket).run()
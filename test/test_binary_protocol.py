@@ -0,0 +1,113 @@
+import json
+import struct
+import unittest
+
+import binary_protocol
+from waypoint_stream import WaypointStreamDecoder
+
+# Unit tests for the binary decoder. Frames are built here the way
+# BinaryProtocol.cs writes them.
+#   python -m unittest test_binary_protocol
+
+WAYPOINTS = [
+    {'id': 4, 'position': {'x': 0.1, 'y': -2.5, 'z': 0.0}, 'connectedIds': [7], 'distance': 0.5},
+    {'id': 7, 'position': {'x': 1.3, 'y': 3.0000001, 'z': 0.25}, 'connectedIds': [4, 9], 'distance': 1.5},
+    {'id': 9, 'position': {'x': -7.75, 'y': 0.2, 'z': 0.0}, 'connectedIds': [7], 'distance': 2.25},
+]
+
+
+def _frame(kind, payload, version=binary_protocol.VERSION):
+    return struct.pack('<4sHHII', binary_protocol.MAGIC, version, kind, 0, len(payload)) + payload
+
+
+def _pad(payload):
+    # Align to 8 bytes from the start of the frame (the header is 16)
+    return payload + (struct.pack('<i', 0) if len(payload) % 8 else b'')
+
+
+def _string(value):
+    data = value.encode('utf-8')
+    return struct.pack('<I', len(data)) + data + b'\0' * ((4 - len(data) % 4) % 4)
+
+
+def _vec(p):
+    return struct.pack('<3d', p['x'], p['y'], p['z'])
+
+
+def _waypoints_block(waypoints, prefix=b''):
+    edges = [nid for wp in waypoints for nid in wp['connectedIds']]
+    payload = prefix + struct.pack('<ii', len(waypoints), len(edges))
+    payload += struct.pack(f'<{len(waypoints)}i', *(wp['id'] for wp in waypoints))
+    payload = _pad(payload)
+    payload += b''.join(_vec(wp['position']) for wp in waypoints)
+    payload += struct.pack(f'<{len(waypoints)}f', *(wp['distance'] for wp in waypoints))
+    offsets = [0]
+    for wp in waypoints:
+        offsets.append(offsets[-1] + len(wp['connectedIds']))
+    payload += struct.pack(f'<{len(offsets)}i', *offsets)
+    payload += struct.pack(f'<{len(edges)}i', *edges)
+    return payload
+
+
+class BinaryProtocolTest(unittest.TestCase):
+    def test_waypoints_match_json(self):
+        frame = _frame(binary_protocol.KIND_WAYPOINTS, _waypoints_block(WAYPOINTS))
+        decoded = binary_protocol.decode(frame)
+        self.assertTrue(decoded['success'])
+        arrays = decoded['data']['waypoints']
+        self.assertEqual(decoded['data']['totalCount'], 3)
+        self.assertEqual(arrays.records(), WAYPOINTS)
+
+    def test_compact_matches_streamed_json(self):
+        # The binary and JSON loaders must build identical stores
+        body = json.dumps({'success': True, 'data': {'waypoints': WAYPOINTS, 'totalCount': 3}}).encode()
+        decoder = WaypointStreamDecoder()
+        decoder.feed(body)
+        streamed = decoder.finish()
+        compact = binary_protocol.decode(
+            _frame(binary_protocol.KIND_WAYPOINTS, _waypoints_block(WAYPOINTS)))['data']['waypoints'].to_compact()
+        for name in ('ids', 'xs', 'ys', 'zs', 'offsets', 'neighbors'):
+            self.assertEqual(getattr(compact, name).tolist(), getattr(streamed, name).tolist(), name)
+
+    def test_nearest_waypoint(self):
+        payload = _waypoints_block(WAYPOINTS[1:2], prefix=struct.pack('<f', 0.75))
+        decoded = binary_protocol.decode(_frame(binary_protocol.KIND_NEAREST_WAYPOINT, payload))
+        self.assertEqual(decoded['data'], {'waypoint': WAYPOINTS[1], 'distance': 0.75})
+
+    def test_game_task_vectors_are_aligned(self):
+        keys = [{'x': 4.25, 'y': 5.0, 'z': 0.0}]
+        doors = [{'x': 6.0, 'y': -7.5, 'z': 0.0}, {'x': 1.0, 'y': 2.0, 'z': 0.0}]
+        payload = _vec({'x': 1.0, 'y': 2.0, 'z': 0.0}) + struct.pack('<fiiii', 3.5, 0, 1, len(keys), len(doors))
+        payload = _pad(payload)
+        self.assertEqual((16 + len(payload)) % 8, 0)
+        payload += b''.join(_vec(p) for p in keys + doors) + _string("Find the key") + _string("level_01_0001")
+
+        data = binary_protocol.decode(_frame(binary_protocol.KIND_GAME_TASK, payload))['data']
+        self.assertEqual(data['keysPositions'], keys)
+        self.assertEqual(data['doorsPositions'], doors)
+        self.assertEqual(data['taskDescription'], "Find the key")
+        self.assertEqual(data['currentLevel'], "level_01_0001")
+        self.assertEqual(data['keysObtained'], 1)
+        self.assertFalse(data['isCompleted'])
+
+    def test_error_frame(self):
+        payload = _string("PLAYER_NOT_FOUND") + _string("Player controller not found") + struct.pack('<I', 0xFFFFFFFF)
+        decoded = binary_protocol.decode(_frame(binary_protocol.KIND_ERROR, payload))
+        self.assertFalse(decoded['success'])
+        self.assertEqual(decoded['error'], {'code': "PLAYER_NOT_FOUND",
+                                            'message': "Player controller not found", 'details': None})
+
+    def test_rejects_bad_frames(self):
+        good = _frame(binary_protocol.KIND_WAYPOINTS, _waypoints_block(WAYPOINTS))
+        with self.assertRaises(ValueError):
+            binary_protocol.decode(good[:-4])
+        with self.assertRaises(ValueError):
+            binary_protocol.decode(b'JSON' + good[4:])
+        with self.assertRaises(ValueError):
+            binary_protocol.decode(_frame(binary_protocol.KIND_WAYPOINTS, _waypoints_block(WAYPOINTS), version=1))
+        with self.assertRaises(ValueError):
+            binary_protocol.decode(_frame(99, b''))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+from connectivity import ConnectivityIndex
+
+# Unit tests for component labels and door lookups.
+#   python -m unittest test_connectivity
+
+
+def _chain(n):
+    # 0 - 1 - ... - n-1, links listed one way only
+    return {i: [i + 1] if i + 1 < n else [] for i in range(n)}
+
+
+class ConnectivityIndexTest(unittest.TestCase):
+    def test_door_splits_and_joins(self):
+        index = ConnectivityIndex(_chain(7), blocked=[3])
+        self.assertEqual(len(index), 2)
+        self.assertTrue(index.reachable(0, 2))
+        self.assertFalse(index.reachable(0, 6))
+        self.assertEqual(index.doors_between(0, 6), [3])
+        self.assertEqual(index.doors_between(0, 2), [])
+
+        self.assertTrue(index.set_blocked([]))
+        self.assertEqual(len(index), 1)
+        self.assertTrue(index.reachable(0, 6))
+        self.assertEqual(index.component_size(0), 7)
+
+        self.assertFalse(index.set_blocked([]))
+        index.block(5)
+        self.assertFalse(index.reachable(0, 6))
+        self.assertEqual(index.component_size(0), 5)
+
+    def test_door_endpoint_belongs_to_both_sides(self):
+        index = ConnectivityIndex(_chain(5), blocked=[2])
+        self.assertTrue(index.reachable(0, 2))
+        self.assertTrue(index.reachable(4, 2))
+        self.assertEqual(index.component_size(2), 0)
+
+    def test_double_door_opens_together(self):
+        index = ConnectivityIndex(_chain(6), blocked=[2, 3])
+        self.assertEqual(index.doors_between(0, 5), [2, 3])
+
+    def test_fewest_doors_nearest_first(self):
+        # Two rooms in a row behind doors 2 and 5
+        index = ConnectivityIndex(_chain(8), blocked=[2, 5])
+        self.assertEqual(index.doors_between(0, 7), [2, 5])
+        self.assertEqual(index.doors_between(7, 0), [5, 2])
+
+    def test_unreachable_without_doors(self):
+        graph = {0: [1], 1: [], 2: [3], 3: []}
+        index = ConnectivityIndex(graph)
+        self.assertFalse(index.reachable(0, 3))
+        self.assertIsNone(index.doors_between(0, 3))
+        self.assertIsNone(index.doors_between(0, 99))
+
+
+if __name__ == "__main__":
+    unittest.main()
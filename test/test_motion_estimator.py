@@ -0,0 +1,101 @@
+import unittest
+
+from motion_estimator import MotionEstimator
+
+# Unit tests for dead reckoning. A simulated player moves along x at SPEED
+# under a full-stick command and is observed every DT seconds.
+#   python -m unittest test_motion_estimator
+
+SPEED = 2.0
+DT = 0.1
+
+
+def _p(x, y=0.0):
+    return {'x': x, 'y': y, 'z': 0.0}
+
+
+def _warmed_up(polls=6):
+    # Estimator that has watched the player run polls * DT seconds along x
+    est = MotionEstimator()
+    est.command(1.0, 0.0, 0.0)
+    for i in range(polls):
+        t = i * DT
+        est.observe(_p(SPEED * t), t)
+    return est, (polls - 1) * DT
+
+
+class MotionEstimatorTest(unittest.TestCase):
+    def test_polls_until_it_has_seen_the_player_move(self):
+        est = MotionEstimator()
+        self.assertTrue(est.needs_update(0.0))
+        est.command(1.0, 0.0, 0.0)
+        est.observe(_p(0.0), 0.0)
+        self.assertIsNone(est.speed)
+        self.assertTrue(est.needs_update(0.05))
+
+    def test_learns_speed_and_predicts_between_polls(self):
+        est, t = _warmed_up()
+        self.assertAlmostEqual(est.speed, SPEED)
+        predicted = est.predict(t + 0.05)
+        self.assertAlmostEqual(predicted['x'], SPEED * (t + 0.05))
+        self.assertAlmostEqual(predicted['y'], 0.0)
+        self.assertFalse(est.needs_update(t + 0.05))
+
+    def test_polls_again_after_max_poll_interval(self):
+        est, t = _warmed_up()
+        self.assertFalse(est.needs_update(t + est.max_poll_interval - 0.01))
+        self.assertTrue(est.needs_update(t + est.max_poll_interval))
+
+    def test_checkpoint_in_reach_forces_a_poll(self):
+        # Arrival: the next node is 0.35 ahead with a 0.2 radius. Half a tick
+        # later we can't be inside it yet; a whole tick later we might be.
+        est, t = _warmed_up()
+        node = (_p(SPEED * t + 0.35), 0.2)
+        self.assertFalse(est.needs_update(t + 0.05, [node]))
+        self.assertTrue(est.needs_update(t + DT, [node]))
+        self.assertFalse(est.needs_update(t + DT, [(None, 0.2)]))
+
+    def test_blocked_player_unlearns_speed(self):
+        # The player hits a wall at x = 1.0 while the command keeps pushing:
+        # the overshooting predictions are scored and the speed fit drops
+        est, t = _warmed_up()
+        wall = SPEED * t
+        for i in range(1, 11):
+            est.observe(_p(wall), t + i * DT)
+        now = t + 10 * DT
+        self.assertLess(est.speed, 0.1 * SPEED)
+        self.assertGreater(est.error_max, 0.1)
+        self.assertLess(abs(est.predict(now + 0.05)['x'] - wall), 0.01)
+
+    def test_stopped_player_predicts_in_place(self):
+        est, t = _warmed_up()
+        est.command(0.0, 0.0, t)
+        predicted = est.predict(t + 0.3)
+        self.assertAlmostEqual(predicted['x'], SPEED * t)
+
+    def test_command_change_continues_from_the_predicted_position(self):
+        est, t = _warmed_up()
+        est.command(0.0, 1.0, t + 0.1)
+        predicted = est.predict(t + 0.2)
+        self.assertAlmostEqual(predicted['x'], SPEED * (t + 0.1))
+        self.assertAlmostEqual(predicted['y'], SPEED * 0.1)
+
+    def test_reset_keeps_speed(self):
+        est, _ = _warmed_up()
+        est.reset()
+        self.assertAlmostEqual(est.speed, SPEED)
+        self.assertIsNone(est.predict(1.0))
+        self.assertTrue(est.needs_update(1.0))
+
+    def test_report_counts_polls_and_skips(self):
+        est, _ = _warmed_up(polls=4)
+        est.skip()
+        report = est.report()
+        self.assertEqual(report['polls'], 4)
+        self.assertEqual(report['skipped'], 1)
+        self.assertAlmostEqual(report['poll_ratio'], 0.8)
+        self.assertAlmostEqual(report['mean_error'], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+
+from steering import PurePursuit
+
+# Unit tests for the pure-pursuit follower; the player is simulated as moving
+# a fixed step along each commanded direction.
+#   python -m unittest test_steering
+
+
+def _p(x, y):
+    return {'x': x, 'y': y, 'z': 0.0}
+
+
+def _follow(follower, pos, step=0.1, ticks=200):
+    # Positions visited until the follower has nothing left to steer toward
+    trail = [pos]
+    for _ in range(ticks):
+        direction = follower.steer(pos, speed=step / 0.1)
+        if direction is None:
+            break
+        pos = _p(pos['x'] + direction[0] * step, pos['y'] + direction[1] * step)
+        trail.append(pos)
+    return trail
+
+
+class PurePursuitTest(unittest.TestCase):
+    def test_start_beside_first_point_resumes_on_first_segment(self):
+        path = [_p(0.0, 0.0), _p(0.0, 1.0), _p(0.0, 2.0)]
+        follower = PurePursuit()
+        follower.set_path(path, _p(-0.4, 0.3))
+        self.assertEqual(follower.index, 1)
+
+    def test_index_zero_beside_first_point_joins_the_path(self):
+        # Nearest to path[0] but not within arrive_radius of it, with index
+        # 0 as the old nearest-point resume left it: the follower used to
+        # bounce between y 0.5 and 0.8 forever
+        path = [_p(0.0, 0.0), _p(0.0, 1.0), _p(0.0, 2.0)]
+        follower = PurePursuit()
+        start = _p(-0.4, 0.3)
+        follower.set_path(path, start)
+        follower.index = 0
+
+        trail = _follow(follower, start)
+
+        self.assertFalse(follower.active)
+        self.assertLess(len(trail), 60)
+        self.assertGreater(trail[-1]['y'], 1.5)
+        # Never turns back down the path
+        for a, b in zip(trail, trail[1:]):
+            self.assertGreaterEqual(b['y'], a['y'] - 1e-9)
+
+    def test_resume_matches_store_projection(self):
+        # set_path with ids/store takes the batched projection; both agree
+        from waypoint_store import WaypointStore
+        waypoints = {10 + i: {'position': _p(x, y), 'connectedIds': []}
+                     for i, (x, y) in enumerate([(0, 0), (1, 0), (1, 1), (3, 1), (3, -2)])}
+        ids = list(waypoints)
+        path = [waypoints[wid]['position'] for wid in ids]
+        for use_numpy in (True, False):
+            store = WaypointStore(waypoints, use_numpy=use_numpy)
+            for pos in (_p(-1, -1), _p(0.5, 0.2), _p(1.2, 0.6), _p(2.0, 1.4), _p(4, -3), _p(0.1, 0.1)):
+                plain, batched = PurePursuit(), PurePursuit()
+                plain.set_path(path, pos)
+                batched.set_path(path, pos, ids=ids, store=store)
+                self.assertEqual(plain.index, batched.index)
+
+    def test_far_from_path_heads_for_first_point(self):
+        path = [_p(0.0, 0.0), _p(0.0, 1.0), _p(0.0, 2.0)]
+        follower = PurePursuit()
+        start = _p(-3.0, -3.0)
+        follower.set_path(path, start)
+
+        direction = follower.steer(start)
+        self.assertEqual(follower.index, 0)
+        self.assertGreater(direction[0], 0.0)
+        self.assertGreater(direction[1], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
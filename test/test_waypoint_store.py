@@ -0,0 +1,115 @@
+import random
+import unittest
+
+from geometry import get_dist
+from waypoint_store import WaypointStore, np
+from waypoint_stream import CompactWaypoints
+
+# The store must give the same answers, bit for bit, as the get_dist loops
+# over the waypoint dicts it replaced, whichever way it is built (dicts or
+# the streamed compact arrays) and with or without NumPy.
+#   python -m unittest test_waypoint_store
+
+
+def _level(seed=7, width=12, height=9):
+    # Jittered grid with 4-neighbour links, some dropped
+    rng = random.Random(seed)
+    waypoints = {}
+    for gy in range(height):
+        for gx in range(width):
+            wid = gy * width + gx
+            waypoints[wid] = {'id': wid, 'connectedIds': [],
+                              'position': {'x': gx + rng.uniform(-0.3, 0.3),
+                                           'y': gy * 0.7 + rng.uniform(-0.3, 0.3), 'z': 0.0}}
+    for gy in range(height):
+        for gx in range(width):
+            wid = gy * width + gx
+            for ox, oy in ((1, 0), (0, 1)):
+                if gx + ox < width and gy + oy < height and rng.random() > 0.15:
+                    other = (gy + oy) * width + gx + ox
+                    waypoints[wid]['connectedIds'].append(other)
+                    waypoints[other]['connectedIds'].append(wid)
+    return waypoints
+
+
+def _compact(waypoints):
+    compact = CompactWaypoints()
+    for wid, wp in waypoints.items():
+        p = wp['position']
+        compact.add(wid, p['x'], p['y'], p['z'], wp['connectedIds'])
+    return compact
+
+
+def _stores(waypoints):
+    stores = []
+    for use_numpy in [False] + ([True] if np is not None else []):
+        stores.append((f"dict numpy={use_numpy}", WaypointStore(waypoints, use_numpy=use_numpy)))
+        stores.append((f"compact numpy={use_numpy}",
+                       WaypointStore.from_compact(_compact(waypoints), use_numpy=use_numpy)))
+    return stores
+
+
+def _queries(seed=3, count=40):
+    rng = random.Random(seed)
+    return [{'x': rng.uniform(-1.0, 13.0), 'y': rng.uniform(-1.0, 7.0), 'z': 0.0} for _ in range(count)]
+
+
+def _closest(waypoints, pos, ids):
+    # The loop the store replaced; the first id wins ties
+    best, best_d = None, float('inf')
+    for wid in ids:
+        d = get_dist(waypoints[wid]['position'], pos)
+        if d < best_d:
+            best, best_d = wid, d
+    return best, best_d
+
+
+class WaypointStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.waypoints = _level()
+        self.stores = _stores(self.waypoints)
+
+    def test_nearest_matches_get_dist_loop(self):
+        queries = _queries()
+        expected = [_closest(self.waypoints, q, self.waypoints) for q in queries]
+        for name, store in self.stores:
+            self.assertEqual([store.nearest(q) for q in queries], expected, name)
+            self.assertEqual(store.nearest_many(queries), [wid for wid, _ in expected], name)
+
+    def test_distances_match_get_dist(self):
+        pos = _queries(count=1)[0]
+        expected = [get_dist(wp['position'], pos) for wp in self.waypoints.values()]
+        for name, store in self.stores:
+            self.assertEqual(store.distance_list(pos), expected, name)
+
+    def test_edge_lengths_are_precomputed_and_match(self):
+        for name, store in self.stores:
+            for wid, wp in self.waypoints.items():
+                for nid in wp['connectedIds']:
+                    self.assertIn((wid, nid), store.edge_lengths, name)
+                    self.assertEqual(store.edge_length(wid, nid),
+                                     get_dist(wp['position'], self.waypoints[nid]['position']), name)
+
+    def test_nearest_among_matches_loop(self):
+        candidates = [5, 17, 40, 41, 99, 12345]
+        present = [wid for wid in candidates if wid in self.waypoints]
+        for name, store in self.stores:
+            for pos in _queries(count=10):
+                self.assertEqual(store.nearest_among(pos, candidates),
+                                 _closest(self.waypoints, pos, present), name)
+
+    def test_path_queries_agree_across_stores(self):
+        path = [0, 1, 13, 25, 26, 27, 39, 51]
+        for pos in _queries(count=15):
+            wid, d = _closest(self.waypoints, pos, path)
+            projections = []
+            for name, store in self.stores:
+                self.assertEqual(store.closest_path_node(path, pos), (path.index(wid), d), name)
+                projections.append(store.project_on_path(path, pos))
+            for projection in projections[1:]:
+                self.assertEqual(projection[:2], projections[0][:2])
+                self.assertAlmostEqual(projection[3], projections[0][3], places=12)
+
+
+if __name__ == "__main__":
+    unittest.main()
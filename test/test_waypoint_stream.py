@@ -0,0 +1,62 @@
+import json
+import unittest
+
+from waypoint_stream import WaypointStreamDecoder
+
+# Unit tests for the streaming /api/waypoints/all decoder: any chunking of
+# the body must give the same arrays as json.loads.
+#   python -m unittest test_waypoint_stream
+
+WAYPOINTS = [
+    {'id': i, 'position': {'x': i * 0.5 - 3.25, 'y': -i * 1.125, 'z': 0.0},
+     'connectedIds': [j for j in (i - 1, i + 1) if 0 <= j < 30], 'distance': 0.0}
+    for i in range(30)
+]
+
+
+def _body(waypoints, indent=None):
+    return json.dumps({'success': True, 'data': {'waypoints': waypoints, 'totalCount': len(waypoints)},
+                       'error': None}, indent=indent).encode()
+
+
+def _decode(body, chunk_size):
+    decoder = WaypointStreamDecoder()
+    for start in range(0, len(body), chunk_size):
+        decoder.feed(body[start:start + chunk_size])
+    return decoder, decoder.finish()
+
+
+class WaypointStreamDecoderTest(unittest.TestCase):
+    def assertMatches(self, compact, waypoints):
+        self.assertEqual(list(compact.ids), [wp['id'] for wp in waypoints])
+        for wp in waypoints:
+            self.assertEqual(compact.records[wp['id']],
+                             {'id': wp['id'], 'position': wp['position'], 'connectedIds': wp['connectedIds']})
+        self.assertEqual(dict(compact.graph), {wp['id']: wp['connectedIds'] for wp in waypoints})
+
+    def test_any_chunking_gives_the_same_arrays(self):
+        body = _body(WAYPOINTS)
+        for chunk_size in (1, 7, 64, len(body)):
+            decoder, compact = _decode(body, chunk_size)
+            self.assertIsNotNone(compact, chunk_size)
+            self.assertMatches(compact, WAYPOINTS)
+            self.assertEqual(decoder.slow_records, 0)
+            self.assertEqual(decoder.bytes, len(body))
+
+    def test_other_field_order_takes_the_slow_path(self):
+        reordered = [{'connectedIds': wp['connectedIds'], 'position': wp['position'], 'id': wp['id']}
+                     for wp in WAYPOINTS[:5]]
+        decoder, compact = _decode(_body(reordered, indent=2), 13)
+        self.assertMatches(compact, WAYPOINTS[:5])
+        self.assertEqual(decoder.slow_records, 5)
+
+    def test_failure_and_truncated_bodies(self):
+        failure = json.dumps({'success': False, 'data': None,
+                              'error': {'code': "WAYPOINT_SYSTEM_NOT_FOUND"}}).encode()
+        self.assertIsNone(_decode(failure, 16)[1])
+        body = _body(WAYPOINTS)
+        self.assertIsNone(_decode(body[:len(body) // 2], 16)[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,227 @@
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Waypoint coordinates held in contiguous float arrays with batched geometry
+# queries. Uses NumPy when it is installed and falls back to plain Python
+# otherwise; both paths evaluate the same sqrt(dx*dx + dy*dy) in float64 and
+# break ties on the first node, so results are identical to get_dist() loops.
+# Squares are taken with a multiply rather than **2: pow() is not correctly
+# rounded on every libm, while multiplication matches NumPy bit for bit.
+
+NEAREST_MANY_CHUNK = 256
+
+
+def _hypot(dx, dy):
+    return math.sqrt(dx * dx + dy * dy)
+
+
+class WaypointStore:
+    def __init__(self, waypoints, use_numpy=True):
+        # waypoints: {id: {'position': {...}, 'connectedIds': [...]}, ...}
+        self.ids = list(waypoints.keys())
+        self.index = {wid: i for i, wid in enumerate(self.ids)}
+        xs = [float(wp['position']['x']) for wp in waypoints.values()]
+        ys = [float(wp['position']['y']) for wp in waypoints.values()]
+
+        self.use_numpy = use_numpy and np is not None
+        if self.use_numpy:
+            self.xs = np.array(xs, dtype=np.float64)
+            self.ys = np.array(ys, dtype=np.float64)
+        else:
+            self.xs = xs
+            self.ys = ys
+
+        self.edge_lengths = self._compute_edge_lengths(
+            (wid, wp['connectedIds']) for wid, wp in waypoints.items())
+
+    @classmethod
+    def from_compact(cls, compact, use_numpy=True):
+        # Wraps the arrays of waypoint_stream.CompactWaypoints without copying
+        # them; edge lengths are computed once over the CSR adjacency.
+        store = cls.__new__(cls)
+        store.ids = compact.ids
+        store.index = compact.index
+        store.use_numpy = use_numpy and np is not None
+        if store.use_numpy:
+            store.xs = np.frombuffer(compact.xs, dtype=np.float64)
+            store.ys = np.frombuffer(compact.ys, dtype=np.float64)
+        else:
+            store.xs = compact.xs
+            store.ys = compact.ys
+        store.edge_lengths = store._compute_edge_lengths(compact.graph.items())
+        return store
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _compute_edge_lengths(self, adjacency):
+        # adjacency: (id, connected ids) for every node
+        pairs = []
+        for wid, connected in adjacency:
+            for nid in connected:
+                if nid in self.index:
+                    pairs.append((wid, nid))
+        if not pairs:
+            return {}
+
+        if self.use_numpy:
+            src = np.fromiter((self.index[a] for a, _ in pairs), dtype=np.intp, count=len(pairs))
+            dst = np.fromiter((self.index[b] for _, b in pairs), dtype=np.intp, count=len(pairs))
+            dx = self.xs[src] - self.xs[dst]
+            dy = self.ys[src] - self.ys[dst]
+            lengths = np.sqrt(dx * dx + dy * dy)
+            return dict(zip(pairs, lengths.tolist()))
+
+        lengths = {}
+        for a, b in pairs:
+            i, j = self.index[a], self.index[b]
+            dx = self.xs[i] - self.xs[j]
+            dy = self.ys[i] - self.ys[j]
+            lengths[(a, b)] = math.sqrt(dx * dx + dy * dy)
+        return lengths
+
+    def position(self, wid):
+        i = self.index[wid]
+        return {'x': float(self.xs[i]), 'y': float(self.ys[i])}
+
+    def edge_length(self, a, b):
+        length = self.edge_lengths.get((a, b))
+        if length is None:
+            i, j = self.index[a], self.index[b]
+            dx = float(self.xs[i]) - float(self.xs[j])
+            dy = float(self.ys[i]) - float(self.ys[j])
+            length = math.sqrt(dx * dx + dy * dy)
+        return length
+
+    def distances_from(self, pos):
+        # Distance from pos to every node, in self.ids order
+        px, py = float(pos['x']), float(pos['y'])
+        if self.use_numpy:
+            dx = px - self.xs
+            dy = py - self.ys
+            return np.sqrt(dx * dx + dy * dy)
+        return [_hypot(px - x, py - y) for x, y in zip(self.xs, self.ys)]
+
+    def distance_list(self, pos):
+        # Same as distances_from but as a plain list for per-node lookups
+        dists = self.distances_from(pos)
+        return dists.tolist() if self.use_numpy else dists
+
+    def nearest(self, pos):
+        # Returns (id, distance) of the closest node, or (None, inf)
+        if not self.ids:
+            return None, float('inf')
+        dists = self.distances_from(pos)
+        if self.use_numpy:
+            i = int(np.argmin(dists))
+            return self.ids[i], float(dists[i])
+        best = 0
+        for i, d in enumerate(dists):
+            if d < dists[best]:
+                best = i
+        return self.ids[best], dists[best]
+
+    def nearest_many(self, points):
+        # Closest node id for each query point
+        if not points:
+            return []
+        if not self.use_numpy:
+            return [self.nearest(p)[0] for p in points]
+
+        qx = np.array([float(p['x']) for p in points], dtype=np.float64)
+        qy = np.array([float(p['y']) for p in points], dtype=np.float64)
+        result = []
+        # Chunk the (queries x nodes) matrix to bound memory on big levels
+        for start in range(0, len(points), NEAREST_MANY_CHUNK):
+            cx = qx[start:start + NEAREST_MANY_CHUNK, None]
+            cy = qy[start:start + NEAREST_MANY_CHUNK, None]
+            dx = cx - self.xs[None, :]
+            dy = cy - self.ys[None, :]
+            dists = np.sqrt(dx * dx + dy * dy)
+            result.extend(self.ids[i] for i in np.argmin(dists, axis=1).tolist())
+        return result
+
+    def nearest_among(self, pos, candidate_ids):
+        # Closest of the given nodes to pos, e.g. the neighbours of a door
+        candidates = [wid for wid in candidate_ids if wid in self.index]
+        if not candidates:
+            return None, float('inf')
+        px, py = float(pos['x']), float(pos['y'])
+        if self.use_numpy:
+            idx = np.fromiter((self.index[wid] for wid in candidates), dtype=np.intp, count=len(candidates))
+            dx = px - self.xs[idx]
+            dy = py - self.ys[idx]
+            dists = np.sqrt(dx * dx + dy * dy)
+            i = int(np.argmin(dists))
+            return candidates[i], float(dists[i])
+        best, best_d = None, float('inf')
+        for wid in candidates:
+            i = self.index[wid]
+            d = _hypot(px - self.xs[i], py - self.ys[i])
+            if d < best_d:
+                best, best_d = wid, d
+        return best, best_d
+
+    def closest_path_node(self, path_ids, pos):
+        # Index of the path node closest to pos, and its distance
+        if not path_ids:
+            return None, float('inf')
+        px, py = float(pos['x']), float(pos['y'])
+        if self.use_numpy:
+            idx = np.fromiter((self.index[wid] for wid in path_ids), dtype=np.intp, count=len(path_ids))
+            dx = px - self.xs[idx]
+            dy = py - self.ys[idx]
+            dists = np.sqrt(dx * dx + dy * dy)
+            i = int(np.argmin(dists))
+            return i, float(dists[i])
+        best, best_d = 0, float('inf')
+        for k, wid in enumerate(path_ids):
+            i = self.index[wid]
+            d = _hypot(px - self.xs[i], py - self.ys[i])
+            if d < best_d:
+                best, best_d = k, d
+        return best, best_d
+
+    def project_on_path(self, path_ids, pos):
+        # Closest point on the path polyline: (segment index, t in [0, 1],
+        # point, distance). A single-node path projects onto that node.
+        if not path_ids:
+            return None
+        px, py = float(pos['x']), float(pos['y'])
+        if len(path_ids) == 1:
+            p = self.position(path_ids[0])
+            return 0, 0.0, p, _hypot(px - p['x'], py - p['y'])
+
+        if self.use_numpy:
+            idx = np.fromiter((self.index[wid] for wid in path_ids), dtype=np.intp, count=len(path_ids))
+            ax, ay = self.xs[idx[:-1]], self.ys[idx[:-1]]
+            bx, by = self.xs[idx[1:]], self.ys[idx[1:]]
+            sx, sy = bx - ax, by - ay
+            seg2 = sx * sx + sy * sy
+            with np.errstate(divide='ignore', invalid='ignore'):
+                t = np.where(seg2 > 0, ((px - ax) * sx + (py - ay) * sy) / seg2, 0.0)
+            t = np.clip(t, 0.0, 1.0)
+            qx, qy = ax + t * sx, ay + t * sy
+            dx = px - qx
+            dy = py - qy
+            dists = np.sqrt(dx * dx + dy * dy)
+            k = int(np.argmin(dists))
+            return k, float(t[k]), {'x': float(qx[k]), 'y': float(qy[k])}, float(dists[k])
+
+        best = None
+        for k in range(len(path_ids) - 1):
+            i, j = self.index[path_ids[k]], self.index[path_ids[k + 1]]
+            ax, ay = self.xs[i], self.ys[i]
+            sx, sy = self.xs[j] - ax, self.ys[j] - ay
+            seg2 = sx * sx + sy * sy
+            t = ((px - ax) * sx + (py - ay) * sy) / seg2 if seg2 > 0 else 0.0
+            t = min(1.0, max(0.0, t))
+            qx, qy = ax + t * sx, ay + t * sy
+            d = _hypot(px - qx, py - qy)
+            if best is None or d < best[3]:
+                best = (k, t, {'x': qx, 'y': qy}, d)
+        return best
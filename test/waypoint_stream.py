@@ -0,0 +1,336 @@
+import argparse
+import json
+import re
+import subprocess
+import sys
+import time
+from array import array
+from collections.abc import Mapping
+
+import binary_protocol
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Streaming loader for /api/waypoints/all. The body is parsed chunk by chunk
+# as it arrives and every waypoint goes straight into flat arrays: ids,
+# x/y/z coordinates and a CSR adjacency (offsets into one neighbour-id
+# array). No per-waypoint dicts are built; the read-only `graph` and
+# `records` views give the agent its usual {id: [...]} / {id: {...}} access
+# and only materialize the entries that are actually looked up.
+#
+# Run as a script to compare it with the old resp.json() loader and the
+# binary encoding:
+#   python waypoint_stream.py --base-url http://localhost:8091
+
+CHUNK_SIZE = 64 * 1024
+
+_NUM = rb'(-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)'
+# WaypointData as the server writes it; anything else takes the slow path
+_RECORD = re.compile(
+    rb'\{\s*"id"\s*:\s*(-?\d+)\s*,'
+    rb'\s*"position"\s*:\s*\{\s*"x"\s*:\s*' + _NUM + rb'\s*,\s*"y"\s*:\s*' + _NUM +
+    rb'\s*,\s*"z"\s*:\s*' + _NUM + rb'\s*\}\s*,'
+    rb'\s*"connectedIds"\s*:\s*\[([-\d,\s]*)\]\s*'
+    rb'(?:,\s*"distance"\s*:\s*' + _NUM + rb'\s*)?\}'
+)
+_WAYPOINTS_KEY = re.compile(rb'"waypoints"\s*:\s*\[')
+_FAILURE = re.compile(rb'"success"\s*:\s*false')
+_WS = b' \t\r\n,'
+
+
+class CompactWaypoints:
+    def __init__(self):
+        self.ids = array('i')
+        self.xs = array('d')
+        self.ys = array('d')
+        self.zs = array('d')
+        self.offsets = array('i', [0])
+        self.neighbors = array('i')
+        self.index = {}
+        self.graph = _GraphView(self)
+        self.records = _RecordView(self)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, wid, x, y, z, connected):
+        self.index[wid] = len(self.ids)
+        self.ids.append(wid)
+        self.xs.append(x)
+        self.ys.append(y)
+        self.zs.append(z)
+        self.neighbors.extend(connected)
+        self.offsets.append(len(self.neighbors))
+
+    def connected(self, wid):
+        i = self.index[wid]
+        return self.neighbors[self.offsets[i]:self.offsets[i + 1]].tolist()
+
+    def position(self, wid):
+        i = self.index[wid]
+        return {'x': self.xs[i], 'y': self.ys[i], 'z': self.zs[i]}
+
+
+class _GraphView(Mapping):
+    # {id: [connected ids]} over the CSR arrays
+    def __init__(self, compact):
+        self._c = compact
+
+    def __getitem__(self, wid):
+        return self._c.connected(wid)
+
+    def __contains__(self, wid):
+        return wid in self._c.index
+
+    def __iter__(self):
+        return iter(self._c.ids)
+
+    def __len__(self):
+        return len(self._c.ids)
+
+
+class _RecordView(_GraphView):
+    # {id: {'id', 'position', 'connectedIds'}} like the JSON waypoints
+    def __getitem__(self, wid):
+        return {'id': wid, 'position': self._c.position(wid), 'connectedIds': self._c.connected(wid)}
+
+
+class WaypointStreamDecoder:
+    # Feed it the response body in chunks of any size, then call finish()
+    def __init__(self):
+        self.compact = CompactWaypoints()
+        self.buf = bytearray()
+        self.state = "prefix"   # prefix -> items -> done
+        self.failed = False
+        self.bytes = 0
+        self.slow_records = 0
+
+    def feed(self, chunk):
+        self.bytes += len(chunk)
+        if self.state == "done":
+            return
+        self.buf += chunk
+        pos = self._parse()
+        if pos:
+            del self.buf[:pos]
+
+    def _parse(self):
+        buf = self.buf
+        pos = 0
+        if self.state == "prefix":
+            m = _WAYPOINTS_KEY.search(buf)
+            if m is None:
+                if _FAILURE.search(buf):
+                    self.failed = True
+                    self.state = "done"
+                return 0
+            pos = m.end()
+            self.state = "items"
+
+        add = self.compact.add
+        n = len(buf)
+        while pos < n:
+            c = buf[pos]
+            if c in _WS:
+                pos += 1
+                continue
+            if c == 0x5D:  # ']'
+                self.state = "done"
+                return pos + 1
+            m = _RECORD.match(buf, pos)
+            if m is not None:
+                ids = m.group(5)
+                add(int(m.group(1)), float(m.group(2)), float(m.group(3)), float(m.group(4)),
+                    map(int, ids.split(b',')) if ids.strip() else ())
+                pos = m.end()
+                continue
+            end = self._parse_generic(pos)
+            if end is None:
+                break  # record not complete yet
+            pos = end
+        return pos
+
+    def _parse_generic(self, pos):
+        # Waypoint written in some other shape (field order, extra fields)
+        text = self.buf[pos:].decode('utf-8', errors='replace')
+        try:
+            wp, end = json.JSONDecoder().raw_decode(text)
+        except ValueError:
+            return None
+        p = wp['position']
+        self.compact.add(int(wp['id']), float(p['x']), float(p['y']), float(p.get('z', 0.0)),
+                         [int(i) for i in wp.get('connectedIds') or ()])
+        self.slow_records += 1
+        return pos + len(text[:end].encode('utf-8'))
+
+    def finish(self):
+        # The compact arrays, or None if the body had no waypoint list
+        if self.failed or self.state != "done":
+            return None
+        self.buf = bytearray()
+        return self.compact
+
+
+def stream_waypoints(session, base_url, timeout=5.0, binary=False):
+    # Returns (CompactWaypoints or None, body size in bytes). With binary=True
+    # the server may answer in the binary encoding, which is already columnar.
+    decoder = WaypointStreamDecoder()
+    headers = {"Accept": f"{binary_protocol.ACCEPT}, application/json"} if binary else None
+    try:
+        with session.get(f"{base_url}/api/waypoints/all", stream=True, timeout=timeout,
+                         headers=headers) as resp:
+            if resp.status_code != 200:
+                return None, 0
+            if binary_protocol.is_binary(resp):
+                body = resp.content
+                decoded = binary_protocol.decode(body)
+                if not decoded["success"]:
+                    return None, len(body)
+                return decoded["data"]["waypoints"].to_compact(), len(body)
+            for chunk in resp.iter_content(CHUNK_SIZE):
+                decoder.feed(chunk)
+    except Exception as e:
+        print(f"Waypoint stream failed: {e}")
+        return None, decoder.bytes
+    return decoder.finish(), decoder.bytes
+
+
+# --- Comparison with the old loader ------------------------------------------
+
+def _peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _load_json(final_agent, body=None):
+    # The loader Pathfinder used before: whole body through resp.json()
+    pf = final_agent.Pathfinder()
+    if body is None:
+        resp = final_agent.SESSION.get(f"{final_agent.BASE_URL}/api/waypoints/all", timeout=5.0)
+        body = resp.content
+        data = resp.json()
+    else:
+        data = json.loads(body)
+    for wp in data["data"]["waypoints"]:
+        pf.waypoints[wp['id']] = wp
+        pf.graph[wp['id']] = wp['connectedIds']
+    pf.store = final_agent.WaypointStore(pf.waypoints)
+    return pf, len(body)
+
+
+def _load_stream(final_agent, body=None):
+    pf = final_agent.Pathfinder()
+    if body is None:
+        compact, size = stream_waypoints(final_agent.SESSION, final_agent.BASE_URL)
+    else:
+        decoder = WaypointStreamDecoder()
+        for start in range(0, len(body), CHUNK_SIZE):
+            decoder.feed(body[start:start + CHUNK_SIZE])
+        compact, size = decoder.finish(), len(body)
+    pf.use_compact(compact)
+    return pf, size
+
+
+def _load_binary(final_agent, body=None):
+    # Server-side binary encoding (binary_protocol.py), when it is offered
+    pf = final_agent.Pathfinder()
+    if body is None:
+        compact, size = stream_waypoints(final_agent.SESSION, final_agent.BASE_URL, binary=True)
+    else:
+        compact, size = binary_protocol.decode(body)["data"]["waypoints"].to_compact(), len(body)
+    pf.use_compact(compact)
+    return pf, size
+
+
+LOADERS = {"json": _load_json, "stream": _load_stream, "binary": _load_binary}
+
+
+def measure(loader, repeat):
+    # Runs in a fresh process so peak RSS belongs to this loader alone.
+    # The first load goes over HTTP (wall time and peak RSS); decode
+    # throughput is then timed on an in-memory copy of the body so the
+    # server's own serialization time doesn't count.
+    import final_agent
+    load = LOADERS[loader]
+    final_agent.invoke("/api/health")
+    before = _peak_rss_kb()
+
+    start = time.perf_counter()
+    pf, size = load(final_agent)
+    wall = time.perf_counter() - start
+    after = _peak_rss_kb()
+    waypoints = len(pf.waypoints)
+    edges = sum(len(c) for c in pf.graph.values())
+    pf = None
+
+    headers = {"Accept": binary_protocol.ACCEPT} if loader == "binary" else None
+    resp = final_agent.SESSION.get(f"{final_agent.BASE_URL}/api/waypoints/all", timeout=5.0, headers=headers)
+    if loader == "binary" and not binary_protocol.is_binary(resp):
+        return None
+    body = resp.content
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load(final_agent, body)
+        times.append(time.perf_counter() - start)
+    best = min(times)
+
+    return {
+        "loader": loader,
+        "waypoints": waypoints,
+        "edges": edges,
+        "bytes": size,
+        "load_seconds": wall,
+        "decode_seconds": best,
+        "mb_per_second": size / best / 1e6 if best > 0 else None,
+        "waypoints_per_second": waypoints / best if best > 0 else None,
+        "peak_rss_kb": after,
+        "peak_rss_growth_kb": after - before if after is not None else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the waypoint loaders: resp.json(), streaming, binary.")
+    parser.add_argument("--base-url", default="http://localhost:8091")
+    parser.add_argument("--repeat", type=int, default=3, help="decode timing runs")
+    parser.add_argument("--measure", choices=tuple(LOADERS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        import final_agent
+        final_agent.BASE_URL = args.base_url
+        print(json.dumps(measure(args.measure, args.repeat)))
+        return
+
+    results = []
+    for loader in LOADERS:
+        out = subprocess.run([sys.executable, __file__, "--measure", loader, "--base-url", args.base_url,
+                              "--repeat", str(args.repeat)], capture_output=True, text=True)
+        lines = out.stdout.strip().splitlines()
+        if out.returncode != 0 or not lines:
+            print(f"{loader} loader failed:\n{out.stderr}")
+            return
+        result = json.loads(lines[-1])
+        if result is None:
+            print(f"{loader}: not offered by this server, skipped")
+            continue
+        results.append(result)
+
+    print("=" * 60)
+    print(f" {results[0]['waypoints']} waypoints, {results[0]['edges']} edges, "
+          f"{results[0]['bytes'] / 1e6:.1f} MB")
+    print("-" * 60)
+    for r in results:
+        growth = f"{r['peak_rss_growth_kb'] / 1024:.1f} MB" if r['peak_rss_growth_kb'] is not None else "n/a"
+        print(f" {r['loader']:<6} load {r['load_seconds'] * 1000:7.1f} ms | decode {r['decode_seconds'] * 1000:7.1f} ms "
+              f"({r['mb_per_second']:5.1f} MB/s, {r['waypoints_per_second'] / 1000:6.1f}k wp/s) | peak RSS +{growth}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()